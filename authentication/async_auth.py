@@ -0,0 +1,128 @@
+"""
+Аутентификация для async views (vacancies/async_views.py) по тем же DEFAULT_AUTHENTICATION_CLASSES, что и у DRF.
+Token и JWT проверяются без блокировки event loop, остальные классы вызываются в потоке через sync_to_async.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from authentication.cached_auth import CachedTokenAuthentication, cached_credentials, token_cache
+from authentication.jwt import StatelessJWTAuthentication, has_user_claims
+
+
+def get_authenticators():
+    return [auth_class() for auth_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+def authenticate_header(request):
+    """Заголовок WWW-Authenticate для ответа 401, как у APIView"""
+    authenticators = get_authenticators()
+    return authenticators[0].authenticate_header(request) if authenticators else None
+
+
+def token_key(authenticator, request):
+    """Токен из заголовка Authorization или None, если заголовок для другой схемы"""
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != authenticator.keyword.lower().encode():
+        return None
+
+    # Сообщения об ошибках те же, что у TokenAuthentication.authenticate
+    if len(auth) == 1:
+        raise AuthenticationFailed(_("Invalid token header. No credentials provided."))
+    if len(auth) > 2:
+        raise AuthenticationFailed(_("Invalid token header. Token string should not contain spaces."))
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        raise AuthenticationFailed(_("Invalid token header. Token string should not contain invalid characters."))
+
+
+async def token_authenticate(authenticator, request):
+    key = token_key(authenticator, request)
+    if key is None:
+        return None
+
+    model = authenticator.get_model()
+    try:
+        # Из default, как и в sync классах: реплика может не знать новый токен
+        token = await model.objects.using(DEFAULT_DB_ALIAS).select_related("user").aget(key=key)
+    except model.DoesNotExist:
+        raise AuthenticationFailed(_("Invalid token."))
+    if not token.user.is_active:
+        raise AuthenticationFailed(_("User inactive or deleted."))
+    return token.user, token
+
+
+async def cached_token_authenticate(authenticator, request):
+    key = token_key(authenticator, request)
+    if key is None:
+        return None
+    # Локальный уровень кэша - память процесса, его можно читать прямо в event loop
+    if token_cache.shared() is None:
+        cached = cached_credentials(key)
+        if cached is not None:
+            return cached
+    return await sync_to_async(authenticator.authenticate_credentials)(key)
+
+
+async def jwt_authenticate(authenticator, request):
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    # Подпись и срок действия проверяются без БД, пользователь читается в потоке
+    validated_token = authenticator.get_validated_token(raw_token)
+    return await sync_to_async(authenticator.get_user)(validated_token), validated_token
+
+
+async def stateless_jwt_authenticate(authenticator, request):
+    header = authenticator.get_header(request)
+    if header is None:
+        return None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    # Проверка отзыва читает кэш 'state' (файловый, Redis) - в потоке, а не в event loop
+    validated_token = await sync_to_async(authenticator.get_validated_token)(raw_token)
+    if has_user_claims(validated_token):
+        # Пользователь из claims, без БД
+        return authenticator.get_user(validated_token), validated_token
+    return await sync_to_async(authenticator.get_user)(validated_token), validated_token
+
+
+ASYNC_AUTHENTICATORS = {
+    TokenAuthentication: token_authenticate,
+    CachedTokenAuthentication: cached_token_authenticate,
+    JWTAuthentication: jwt_authenticate,
+    StatelessJWTAuthentication: stateless_jwt_authenticate,
+}
+
+
+async def aauthenticate(request):
+    """
+    Устанавливает request.user и request.auth для HttpRequest и возвращает пользователя
+    (AnonymousUser без учетных данных). При неверных данных - AuthenticationFailed, как в DRF.
+    """
+    user, auth = AnonymousUser(), None
+    for authenticator in get_authenticators():
+        handler = ASYNC_AUTHENTICATORS.get(type(authenticator))
+        if handler is not None:
+            result = await handler(authenticator, request)
+        else:
+            result = await sync_to_async(authenticator.authenticate)(Request(request))
+        if result is not None:
+            user, auth = result
+            break
+
+    request.user, request.auth = user, auth
+    return user
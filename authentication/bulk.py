@@ -0,0 +1,119 @@
+"""
+Массовое создание пользователей (команда import_users и POST /user/bulk_create/).
+Хэширование паролей (PBKDF2 с сотнями тысяч итераций) занимает почти все время, поэтому оно идет
+в пуле процессов, а пользователи пачки пишутся одним bulk_create. Сигналы post_save при этом
+не отправляются, счетчик пользователей обновляется здесь.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import transaction
+from rest_framework import serializers
+
+from authentication.models import User
+from vacancies.counters import adjust_user_count
+
+
+def user_import_settings():
+    return {
+        "BATCH_SIZE": 1000,
+        # Небольшой пул на каждый worker сервера, MAX_ITEMS - сколько он успеет захэшировать за время запроса
+        "WORKERS": 2,
+        "COMMAND_WORKERS": os.cpu_count(),
+        "MAX_ITEMS": 100,
+        **getattr(settings, "USER_IMPORT", {}),
+    }
+
+
+class UserImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["username", "password", "email", "first_name", "last_name", "role", "sex"]
+        # Уникальность username проверяется одним запросом на пачку (UserImporter.prepare)
+        extra_kwargs = {"username": {"validators": [UnicodeUsernameValidator()]}}
+
+
+def _encode(hasher, password):
+    return hasher.encode(password, hasher.salt())
+
+
+def hash_passwords(passwords, pool=None):
+    """Хэши паролей в том же порядке; с pool - в процессах пула, пустые пароли - непригодные для входа"""
+    hasher = get_hasher()
+    indexes = [index for index, password in enumerate(passwords) if password]
+    hashes = [make_password(None) if not password else None for password in passwords]
+    if pool is None:
+        encoded = [_encode(hasher, passwords[index]) for index in indexes]
+    else:
+        workers = getattr(pool, "_max_workers", 1)
+        chunksize = max(1, len(indexes) // (workers * 4))
+        encoded = pool.map(_encode, repeat(hasher), [passwords[index] for index in indexes], chunksize=chunksize)
+    for index, value in zip(indexes, encoded):
+        hashes[index] = value
+    return hashes
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """Пул процессов для POST /user/bulk_create/, создается при первом запросе; None при WORKERS <= 1"""
+    global _pool
+    workers = user_import_settings()["WORKERS"]
+    if not workers or workers <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+class UserImporter:
+    """
+    prepare() проверяет строки и занятые username одним запросом,
+    write() хэширует пароли в пуле и создает пользователей пачки одним bulk_create.
+    """
+
+    def __init__(self, pool=None, batch_size=None):
+        self.pool = pool
+        self.batch_size = batch_size or user_import_settings()["BATCH_SIZE"]
+
+    def prepare(self, rows):
+        """[(позиция, dict)] -> ([(позиция, проверенные данные)], [(позиция, ошибки)])"""
+        valid = []
+        errors = []
+        for position, row in rows:
+            serializer = UserImportSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((position, serializer.validated_data))
+            else:
+                errors.append((position, serializer.errors))
+
+        usernames = {data["username"] for _, data in valid}
+        taken = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+        prepared = []
+        for position, data in valid:
+            if data["username"] in taken:
+                errors.append((position, {"username": ["A user with that username already exists."]}))
+            else:
+                taken.add(data["username"])
+                prepared.append((position, data))
+        return prepared, sorted(errors, key=lambda error: error[0])
+
+    def write(self, items):
+        """Создает пользователей из prepare() одной транзакцией, возвращает их в том же порядке"""
+        if not items:
+            return []
+        hashes = hash_passwords([data.get("password") for _, data in items], self.pool)
+        users = [User(**{**data, "password": password}) for (_, data), password in zip(items, hashes)]
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(users, batch_size=self.batch_size)
+            adjust_user_count(len(users))
+        return users
@@ -0,0 +1,237 @@
+"""
+TokenAuthentication с кэшем token -> (user, token): LRU в памяти процесса с TTL и, если задан
+SHARED_CACHE_ALIAS, общий уровень в кэше Django. Запрос с известным токеном проходит без обращения к БД.
+Записи сбрасываются сигналами authentication/signals.py: удаление токена (Logout), деактивация
+пользователя и смена роли. С общим уровнем сброс виден другим процессам не позже CHECK_INTERVAL секунд,
+без него - локальные записи других процессов живут до TTL. Общий уровень должен быть виден всем
+процессам (не LocMemCache/DummyCache), в нем же копится статистика для команды auth_cache_stats.
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.authentication import TokenAuthentication
+
+from djangoProject.caches import shared_cache
+from djangoProject.db_router import use_replica
+
+GENERATION_KEY = "auth_token_cache:generation"
+STATS_KEY = "auth_token_cache:stats"
+STATS_FIELDS = ("local_hits", "shared_hits", "misses", "hit_seconds", "miss_seconds")
+
+
+def token_cache_settings():
+    return {
+        "ENABLED": True,
+        "MAX_SIZE": 10000,
+        "TTL": 60,
+        "SHARED_CACHE_ALIAS": None,
+        "SHARED_TTL": 300,
+        "CHECK_INTERVAL": 1,
+        "STATS_INTERVAL": 10,
+        **getattr(settings, "AUTH_TOKEN_CACHE", {}),
+    }
+
+
+def cache_key(key):
+    # Сам токен в ключах кэша не хранится
+    return "auth_token_cache:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+class LRUCache:
+    """Ограниченный словарь с вытеснением давно не использованных записей и временем жизни"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TokenCache:
+    def __init__(self):
+        options = token_cache_settings()
+        self.local = LRUCache(options["MAX_SIZE"], options["TTL"])
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked = 0.0
+        self._stats = dict.fromkeys(STATS_FIELDS, 0)
+        self._flushed = time.monotonic()
+
+    @staticmethod
+    def shared():
+        alias = token_cache_settings()["SHARED_CACHE_ALIAS"]
+        return shared_cache(alias, 'AUTH_TOKEN_CACHE["SHARED_CACHE_ALIAS"]') if alias else None
+
+    def check_generation(self):
+        """Очищает локальный уровень, если другой процесс что-то сбросил (раз в CHECK_INTERVAL секунд)"""
+        shared = self.shared()
+        now = time.monotonic()
+        if shared is None or now - self._checked < token_cache_settings()["CHECK_INTERVAL"]:
+            return
+        self._checked = now
+        generation = shared.get(GENERATION_KEY)
+        if generation != self._generation:
+            self._generation = generation
+            self.local.clear()
+
+    def get(self, key):
+        """(user, token) из кэша или None; каждый вызов возвращает свои копии объектов"""
+        self.check_generation()
+        digest = cache_key(key)
+        data = self.local.get(digest)
+        level = "local_hits"
+        if data is None and (shared := self.shared()) is not None:
+            data = shared.get(digest)
+            level = "shared_hits"
+            if data is not None:
+                self.local.set(digest, data)
+        if data is None:
+            return None, None
+        return pickle.loads(data), level
+
+    def set(self, key, user, token):
+        digest = cache_key(key)
+        data = pickle.dumps((user, token), pickle.HIGHEST_PROTOCOL)
+        self.local.set(digest, data)
+        shared = self.shared()
+        if shared is not None:
+            shared.set(digest, data, token_cache_settings()["SHARED_TTL"])
+
+    def invalidate(self, keys):
+        digests = [cache_key(key) for key in keys]
+        for digest in digests:
+            self.local.delete(digest)
+        shared = self.shared()
+        if shared is not None and digests:
+            shared.delete_many(digests)
+            try:
+                shared.incr(GENERATION_KEY)
+            except ValueError:
+                shared.add(GENERATION_KEY, 1, None)
+
+    def record(self, field, seconds):
+        """Счетчики копятся в процессе и раз в STATS_INTERVAL секунд добавляются в общий кэш"""
+        with self._lock:
+            self._stats[field] += 1
+            self._stats["hit_seconds" if field != "misses" else "miss_seconds"] += seconds
+            if time.monotonic() - self._flushed < token_cache_settings()["STATS_INTERVAL"]:
+                return
+        self.flush_stats()
+
+    def stats_cache(self):
+        """Статистика всех процессов собирается в общем уровне, без него - в кэше default"""
+        return self.shared() or cache
+
+    def flush_stats(self):
+        with self._lock:
+            pending, self._stats = self._stats, dict.fromkeys(STATS_FIELDS, 0)
+            self._flushed = time.monotonic()
+        # Гонка двух процессов может потерять одну порцию счетчиков - для статистики это допустимо
+        stats_cache = self.stats_cache()
+        stats = stats_cache.get(STATS_KEY) or dict.fromkeys(STATS_FIELDS, 0)
+        stats_cache.set(STATS_KEY, {field: stats.get(field, 0) + pending[field] for field in STATS_FIELDS}, None)
+
+
+def token_cache_stats():
+    """Доля попаданий и сэкономленное время: попадания x (средний промах - среднее попадание)"""
+    token_cache.flush_stats()
+    stats = token_cache.stats_cache().get(STATS_KEY) or dict.fromkeys(STATS_FIELDS, 0)
+    hits = stats["local_hits"] + stats["shared_hits"]
+    total = hits + stats["misses"]
+    avg_hit = stats["hit_seconds"] / hits if hits else 0.0
+    avg_miss = stats["miss_seconds"] / stats["misses"] if stats["misses"] else 0.0
+    return {
+        "local_hits": stats["local_hits"],
+        "shared_hits": stats["shared_hits"],
+        "misses": stats["misses"],
+        "hit_rate": hits / total if total else 0.0,
+        "avg_hit_ms": avg_hit * 1000,
+        "avg_miss_ms": avg_miss * 1000,
+        "saved_seconds": max(avg_miss - avg_hit, 0.0) * hits,
+    }
+
+
+def shared_stats_cache():
+    """Кэш статистики для команды auth_cache_stats: без общего уровня команда увидит только свой процесс"""
+    alias = token_cache_settings()["SHARED_CACHE_ALIAS"]
+    if not alias:
+        raise ImproperlyConfigured('AUTH_TOKEN_CACHE["SHARED_CACHE_ALIAS"] is not set')
+    return shared_cache(alias, 'AUTH_TOKEN_CACHE["SHARED_CACHE_ALIAS"]')
+
+
+def reset_token_cache_stats():
+    token_cache.flush_stats()
+    token_cache.stats_cache().delete(STATS_KEY)
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        if not token_cache_settings()["ENABLED"]:
+            return self.primary_credentials(key)
+
+        started = time.perf_counter()
+        cached, level = token_cache.get(key)
+        if cached is not None:
+            token_cache.record(level, time.perf_counter() - started)
+            return cached
+
+        user, token = self.primary_credentials(key)
+        token_cache.set(key, user, token)
+        token_cache.record("misses", time.perf_counter() - started)
+        return user, token
+
+    def primary_credentials(self, key):
+        # Токен, выданный только что, реплика может еще не знать
+        with use_replica(False):
+            return super().authenticate_credentials(key)
+
+
+def cached_credentials(key):
+    """(user, token) из кэша для async_auth без обращения к БД или None"""
+    if not token_cache_settings()["ENABLED"]:
+        return None
+    started = time.perf_counter()
+    cached, level = token_cache.get(key)
+    if cached is not None:
+        token_cache.record(level, time.perf_counter() - started)
+    return cached
+
@@ -0,0 +1,126 @@
+"""
+JWT без обращения к БД: access токен несет username, role, is_staff и is_superuser,
+StatelessJWTAuthentication строит из claims RoleTokenUser, и проверки вроде VacancyCreatePermission
+и IsAdminUser не читают строку User. Смена роли, username, прав администратора или деактивация записывает время отзыва токенов пользователя в кэш:
+access токены, выпущенные раньше, отклоняются, а /user/token/refresh/ выдает новый с claims из БД.
+Отметки отзыва хранятся в CACHE_ALIAS, общем для процессов и без вытеснения (durable_cache()): иначе отзыв
+не увидят другие процессы или его сотрет поток других записей, и токен проживет до конца ACCESS_TOKEN_LIFETIME.
+"""
+import time
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from authentication.models import User
+from djangoProject.caches import durable_cache
+from djangoProject.db_router import use_replica
+
+ROLE_CLAIM = "role"
+USERNAME_CLAIM = "username"
+# TokenUser берет is_staff и is_superuser из одноименных claims, без них считает их False
+ADMIN_CLAIMS = ("is_staff", "is_superuser")
+USER_CLAIMS = (ROLE_CLAIM, USERNAME_CLAIM) + ADMIN_CLAIMS
+# Время чтения claims из БД с долями секунды: iat целый и не отличает токены, выпущенные в секунду отзыва
+CLAIMS_TIME_CLAIM = "claims_iat"
+
+
+def jwt_revocation_settings():
+    return {
+        "ENABLED": True,
+        "CACHE_ALIAS": "state",
+        **getattr(settings, "JWT_REVOCATION", {}),
+    }
+
+
+def revocation_cache(options):
+    return durable_cache(options["CACHE_ALIAS"], 'JWT_REVOCATION["CACHE_ALIAS"]')
+
+
+def revoked_key(user_id):
+    return f"jwt_revoked:{user_id}"
+
+
+def revoke_user_tokens(user_id):
+    """Отклоняет access токены пользователя, выпущенные до этого момента"""
+    options = jwt_revocation_settings()
+    if not options["ENABLED"]:
+        return
+    # Отметка нужна, пока живут выпущенные access токены; refresh токены перечитывают пользователя из БД
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 1
+    revocation_cache(options).set(revoked_key(user_id), time.time(), timeout)
+
+
+def is_revoked(token):
+    options = jwt_revocation_settings()
+    if not options["ENABLED"]:
+        return False
+    revoked_at = revocation_cache(options).get(revoked_key(token.get(api_settings.USER_ID_CLAIM)))
+    return revoked_at is not None and token.get(CLAIMS_TIME_CLAIM, token.get("iat", 0)) < revoked_at
+
+
+def has_user_claims(token):
+    return all(claim in token for claim in USER_CLAIMS)
+
+
+def set_user_claims(token, user):
+    token[USERNAME_CLAIM] = user.username
+    token[ROLE_CLAIM] = user.role
+    for claim in ADMIN_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[CLAIMS_TIME_CLAIM] = time.time()
+    return token
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return set_user_claims(super().get_token(user), user)
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Как TokenRefreshSerializer, но claims нового access токена берутся из БД, а не копируются из refresh"""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        refresh = self.token_class(data.get("refresh", attrs["refresh"]))
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}
+        ).only("username", "role", "is_active", *ADMIN_CLAIMS).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        data["access"] = str(set_user_claims(refresh.access_token, user))
+        return data
+
+
+class RoleTokenUser(TokenUser):
+    """Пользователь из claims access токена, без строки в БД"""
+
+    @cached_property
+    def role(self):
+        return self.token.get(ROLE_CLAIM, User.UNKNOWN)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, которому не нужна БД для токенов с claims role и username"""
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
+
+    def get_user(self, validated_token):
+        if not has_user_claims(validated_token):
+            # Токены, выпущенные до появления claims (или без is_staff/is_superuser) - права по строке в БД
+            with use_replica(False):
+                return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -0,0 +1,26 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import BaseCommand, CommandError
+
+from authentication.cached_auth import shared_stats_cache, token_cache_stats, reset_token_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit rate and saved time of the token authentication cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing")
+
+    def handle(self, *args, **options):
+        try:
+            shared_stats_cache()
+        except ImproperlyConfigured as error:
+            raise CommandError(f"Token cache statistics of other processes are not visible: {error}")
+
+        stats = token_cache_stats()
+        self.stdout.write(
+            f"local_hits={stats['local_hits']} shared_hits={stats['shared_hits']} misses={stats['misses']} "
+            f"hit_rate={stats['hit_rate']:.2%} avg_hit={stats['avg_hit_ms']:.3f}ms "
+            f"avg_miss={stats['avg_miss_ms']:.3f}ms saved={stats['saved_seconds']:.3f}s"
+        )
+        if options["reset"]:
+            reset_token_cache_stats()
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.core.management import BaseCommand, CommandError
+
+from authentication.bulk import UserImporter, user_import_settings
+
+
+def read_rows(stream, file_format):
+    """(номер строки, dict) из CSV с заголовком или NDJSON"""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if file_format == "csv":
+        yield from csv.DictReader(text)
+        return
+    for line in text:
+        if line.strip():
+            yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = "Create users from a CSV (with a header) or NDJSON file, hashing passwords in a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file, '-' for stdin")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: by file extension, NDJSON for stdin")
+        parser.add_argument("--batch-size", type=int, help="Users per transaction")
+        parser.add_argument(
+            "--workers", type=int,
+            help="Hashing processes, 0 or 1 to hash in this process. Default: USER_IMPORT['COMMAND_WORKERS']",
+        )
+        parser.add_argument("--skip-invalid", action="store_true", help="Report invalid rows and go on")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or user_import_settings()["BATCH_SIZE"]
+        workers = user_import_settings()["COMMAND_WORKERS"] if options["workers"] is None else options["workers"]
+        if batch_size < 1 or workers < 0:
+            raise CommandError("--batch-size must be positive and --workers not negative")
+        path = options["path"]
+        file_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        importer = UserImporter(pool=pool, batch_size=batch_size)
+        created = skipped = 0
+        started = time.monotonic()
+
+        try:
+            rows = enumerate(read_rows(stream, file_format), start=1)
+            while batch := list(islice(rows, batch_size)):
+                items, errors = importer.prepare(batch)
+                for number, error in errors:
+                    if not options["skip_invalid"]:
+                        raise CommandError(
+                            f"Invalid row {number}: {error}. Rows before this batch are imported, "
+                            f"rerun with --skip-invalid to skip existing users"
+                        )
+                    self.stderr.write(f"Skipped row {number}: {error}")
+                skipped += len(errors)
+
+                created += len(importer.write(items))
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{created} users, {created / self.elapsed(started):.0f} users/s")
+        except (ValueError, csv.Error) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        elapsed = self.elapsed(started)
+        self.stdout.write(
+            f"Created {created} users ({skipped} skipped) in {elapsed:.1f}s, "
+            f"{created / elapsed:.0f} users/s, {max(workers, 1)} hashing process(es)"
+        )
+
+    @staticmethod
+    def elapsed(started):
+        return max(time.monotonic() - started, 1e-6)
@@ -15,3 +15,19 @@ class User(AbstractUser):
 
     role = models.CharField(max_length=8, choices=ROLE, default=UNKNOWN)
     sex = models.CharField(max_length=1, choices=SEX, default=MALE)
+    # Число вакансий пользователя, поддерживается vacancies/counters.py. Без CHECK >= 0:
+    # расхождение счетчика не должно приводить к IntegrityError при удалении вакансии
+    vacancy_count = models.IntegerField(default=0, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        # /vacancy/by_user/ читает страницу пользователей только из индекса (PostgreSQL INCLUDE)
+        indexes = [
+            models.Index(fields=["id"], include=["username", "vacancy_count"], name="user_vacancy_count_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # username входит в ответы вакансий: при его смене кэш ответов сбрасывается (vacancies/signals.py)
+        instance._loaded_username = instance.__dict__.get("username")
+        return instance
@@ -1,3 +1,4 @@
+from django.contrib.auth.hashers import make_password
 from rest_framework import serializers
 
 from authentication.models import User
@@ -8,11 +9,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
         model = User
         fields = '__all__'
 
-    #делаем хеширование пароля
+    #делаем хеширование пароля до создания: один INSERT вместо INSERT и UPDATE
     def create(self, validated_data):
-        user = super().create(validated_data)
-
-        user.set_password(user.password)
-        user.save()
-
-        return user
+        validated_data["password"] = make_password(validated_data["password"])
+        return super().create(validated_data)
@@ -0,0 +1,44 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from authentication.cached_auth import token_cache, TokenCache
+from authentication.jwt import revoke_user_tokens, ADMIN_CLAIMS
+from authentication.models import User
+
+
+# Кэш CachedTokenAuthentication: Logout (и любое удаление токена, в том числе вместе с пользователем)
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    token_cache.invalidate([instance.key])
+
+
+# Деактивация, смена роли и остальные изменения пользователя: в кэше хранится объект User целиком
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    token_cache.invalidate(Token.objects.filter(user_id=instance.pk).values_list("key", flat=True))
+
+
+CLAIM_FIELDS = {"username", "role", "is_active", *ADMIN_CLAIMS}
+
+
+# Claims access токенов (authentication/jwt.py) устарели: выпущенные токены отзываются
+@receiver(post_save, sender=User)
+def revoke_user_jwt(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if created or raw or (update_fields is not None and not CLAIM_FIELDS & set(update_fields)):
+        return
+    revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_jwt(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
+
+
+@receiver(setting_changed)
+def reconfigure_token_cache(setting, **kwargs):
+    if setting == "AUTH_TOKEN_CACHE":
+        TokenCache.__init__(token_cache)
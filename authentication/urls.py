@@ -2,10 +2,11 @@ from django.urls import path
 from rest_framework.authtoken import views
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from authentication.views import UserCreateView, Logout
+from authentication.views import UserCreateView, Logout, UserBulkCreateView
 
 urlpatterns = [
     path('create/', UserCreateView.as_view()),
+    path('bulk_create/', UserBulkCreateView.as_view()),
     path('login/', views.obtain_auth_token),
     path('logout/', Logout.as_view()),
     path('token/', TokenObtainPairView.as_view()),
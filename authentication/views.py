@@ -1,8 +1,15 @@
+import time
+
+from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.generics import CreateAPIView
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from authentication.bulk import UserImportSerializer, UserImporter, shared_pool, user_import_settings
+from authentication.jwt import revoke_user_tokens
 from authentication.models import User
 from authentication.serializers import UserCreateSerializer
 
@@ -13,6 +20,51 @@ class UserCreateView(CreateAPIView):
 
 
 class Logout(APIView):
+    permission_classes = [IsAuthenticated]
+
     def post(self, request):
-        request.user.auth_token.delete()
-        return Response(status=status.HTTP_200_OK)
\ No newline at end of file
+        # С JWT request.user - RoleTokenUser без auth_token: токен ищется по id, access токены отзываются
+        Token.objects.filter(user_id=request.user.id).delete()
+        revoke_user_tokens(request.user.id)
+        return Response(status=status.HTTP_200_OK)
+
+
+class UserBulkCreateView(APIView):
+    """
+    Создание списка пользователей eg.: POST /user/bulk_create/ [{"username": ..., "password": ...}, ...]
+    Пароли хэшируются в пуле процессов. Ошибочные элементы возвращаются в errors с их индексом, остальные создаются.
+    """
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        request=UserImportSerializer(many=True),
+        description="Create users in bulk (Создаем пользователей пачкой)",
+        summary="Bulk create users"
+    )
+    def post(self, request, *args, **kwargs):
+        max_items = user_import_settings()["MAX_ITEMS"]
+        if not isinstance(request.data, list):
+            return Response({"detail": "Expected a list of users."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > max_items:
+            return Response(
+                {"detail": f"No more than {max_items} users per request."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        started = time.monotonic()
+        importer = UserImporter(pool=shared_pool())
+        items, errors = importer.prepare(enumerate(request.data))
+        users = importer.write(items)
+        elapsed = max(time.monotonic() - started, 1e-6)
+
+        return Response(
+            {
+                "created": [
+                    {"index": index, "id": user.pk, "username": user.username}
+                    for (index, data), user in zip(items, users)
+                ],
+                "errors": [{"index": index, "errors": error} for index, error in errors],
+                "users_per_second": round(len(users) / elapsed, 1),
+            },
+            status=status.HTTP_201_CREATED if users or not errors else status.HTTP_400_BAD_REQUEST
+        )
+
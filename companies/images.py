@@ -0,0 +1,176 @@
+"""
+Загрузка логотипов компаний: файл пишется в storage по частям с ограничением размера,
+у изображения проверяется только заголовок (формат и размеры, без декодирования пикселей),
+а миниатюры фиксированного размера в WebP/JPEG создаются в ограниченном пуле потоков
+после ответа. Pillow отпускает GIL на декодировании и сжатии, поэтому потоков достаточно.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import connection
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from companies.models import Company
+from companies.storage import logo_storage
+
+logger = logging.getLogger(__name__)
+
+# Запас на заголовки multipart сверх размера файла при проверке Content-Length
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Формат варианта -> (формат Pillow, параметры сохранения)
+SAVE_OPTIONS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def logo_settings():
+    return {
+        "MAX_UPLOAD_SIZE": 5 * 1024 * 1024,
+        "MAX_PIXELS": 40_000_000,
+        "FORMATS": ["JPEG", "PNG", "WEBP", "GIF"],
+        "THUMBNAILS": {"small": [64, 64], "medium": [256, 256]},
+        "THUMBNAIL_FORMATS": ["webp", "jpeg"],
+        "WORKERS": 2,
+        **getattr(settings, "COMPANY_LOGO", {}),
+    }
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """
+    Первый обработчик загрузки: пропускает части файла дальше (в память или во временный файл),
+    пока их сумма не превысит max_size. Больший файл отбрасывается, exceeded = True.
+    """
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size if max_size is not None else logo_settings()["MAX_UPLOAD_SIZE"]
+        self.exceeded = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self.exceeded = True
+            raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def validate_logo(file):
+    """Проверяет формат и размеры по заголовку изображения, возвращает формат Pillow"""
+    options = logo_settings()
+    try:
+        with Image.open(file) as image:  # читается только заголовок
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise ValidationError("Upload a valid image.")
+    finally:
+        file.seek(0)
+
+    if image_format not in options["FORMATS"]:
+        raise ValidationError(f"Unsupported image format {image_format}.")
+    if width * height > options["MAX_PIXELS"]:
+        raise ValidationError(f"Image is too large: {width}x{height}.")
+    return image_format
+
+
+def thumbnail_name(name, size, extension):
+    """logos/ab/ab12...ef.png -> logos/ab/ab12...ef_64x64.webp: размер в имени, чтобы имя не меняло содержимое"""
+    stem = os.path.splitext(name)[0]
+    width, height = size
+    return f"{stem}_{width}x{height}.{extension}"
+
+
+def thumbnail_names(name):
+    options = logo_settings()
+    return {
+        variant: {extension: thumbnail_name(name, size, extension) for extension in options["THUMBNAIL_FORMATS"]}
+        for variant, size in options["THUMBNAILS"].items()
+    }
+
+
+def thumbnail_urls(name):
+    return {
+        variant: {extension: logo_storage.url(path) for extension, path in paths.items()}
+        for variant, paths in thumbnail_names(name).items()
+    }
+
+
+def render_thumbnail(image, size, extension):
+    """Вписывает изображение в size с полями: прозрачными для WebP, белыми для JPEG"""
+    pil_format, save_options = SAVE_OPTIONS[extension]
+    if pil_format == "JPEG":
+        canvas = Image.new("RGB", image.size, "white")
+        canvas.paste(image, mask=image.getchannel("A"))
+        thumbnail = ImageOps.pad(canvas, size, Image.Resampling.LANCZOS, color="white")
+    else:
+        thumbnail = ImageOps.pad(image, size, Image.Resampling.LANCZOS, color=(0, 0, 0, 0))
+    return thumbnail, pil_format, save_options
+
+
+def generate_thumbnails(name):
+    """Создает все варианты миниатюр для файла name в storage, возвращает {вариант: {формат: путь}}"""
+    options = logo_settings()
+    names = thumbnail_names(name)
+    largest = max((tuple(size) for size in options["THUMBNAILS"].values()), default=(0, 0))
+
+    with logo_storage.open(name, "rb") as file, Image.open(file) as image:
+        # JPEG декодируется сразу в уменьшенном масштабе, не крупнее самой большой миниатюры
+        image.draft("RGB", (largest[0] * 2, largest[1] * 2))
+        image = ImageOps.exif_transpose(image).convert("RGBA")
+
+    for variant, size in options["THUMBNAILS"].items():
+        for extension, path in names[variant].items():
+            thumbnail, pil_format, save_options = render_thumbnail(image, tuple(size), extension)
+            output = io.BytesIO()
+            thumbnail.save(output, pil_format, **save_options)
+            logo_storage.save_derived(path, ContentFile(output.getvalue()))
+    return names
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=logo_settings()["WORKERS"], thread_name_prefix="logo")
+        return _executor
+
+
+def _thumbnails_job(name):
+    try:
+        names = generate_thumbnails(name)
+        # Файл может быть у нескольких компаний, а у этой логотип могли заменить, пока создавались миниатюры
+        Company.objects.filter(logo=name).update(thumbnails=names)
+    except Exception:
+        logger.exception("Failed to generate thumbnails for %s", name)
+        raise
+    finally:
+        # У потоков пула нет цикла запроса, который закрыл бы соединение
+        connection.close()
+
+
+def submit_thumbnails(name):
+    """Ставит создание миниатюр в пул, возвращает Future"""
+    future = executor().submit(_thumbnails_job, name)
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+    return future
+
+
+def wait_for_thumbnails(timeout=None):
+    """Ждет все поставленные задачи (тесты, остановка процесса)"""
+    wait(list(_pending), timeout=timeout)
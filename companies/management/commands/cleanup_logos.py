@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+
+from companies.models import LogoFile
+from companies.references import delete_if_unused, find_orphans
+from companies.storage import logo_storage
+
+
+class Command(BaseCommand):
+    help = "Recount logo references and delete logo files no company uses"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-age", type=int, default=60,
+                            help="skip files modified less than this many minutes ago")
+        parser.add_argument("--dry-run", action="store_true", help="only list the files to delete, write nothing")
+
+    def handle(self, *args, min_age, dry_run, **options):
+        orphans = find_orphans(min_age=timedelta(minutes=min_age), dry_run=dry_run)
+        for name in orphans:
+            self.stdout.write(name)
+            if not dry_run:
+                logo_storage.delete(name)
+
+        if not dry_run:
+            for name in LogoFile.objects.filter(refs=0).values_list("name", flat=True):
+                delete_if_unused(name)
+        self.stdout.write(f"orphans={len(orphans)}" + (" (dry run)" if dry_run else ""))
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:35
+
+import companies.storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    LogoFile = apps.get_model('companies', 'LogoFile')
+    db_alias = schema_editor.connection.alias
+    refs = Company.objects.using(db_alias).exclude(logo='').values('logo').annotate(refs=Count('pk'))
+    LogoFile.objects.using(db_alias).bulk_create([LogoFile(name=row['logo'], refs=row['refs']) for row in refs])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_company_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogoFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('refs', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='company',
+            name='logo',
+            field=models.ImageField(storage=companies.storage.get_logo_storage, upload_to='logos/'),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
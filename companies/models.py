@@ -1,6 +1,20 @@
 from django.db import models
 
+from companies.storage import get_logo_storage
+
+
 class Company(models.Model):
     name = models.CharField(max_length=20)
-    logo = models.ImageField(upload_to='logos/')
+    # Файлы именуются по sha256 содержимого, одинаковые логотипы хранятся один раз (companies/storage.py)
+    logo = models.ImageField(upload_to='logos/', storage=get_logo_storage)
+    # Готовые миниатюры логотипа {вариант: {формат: путь в storage}}, заполняются в фоне (companies/images.py)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+
+
+class LogoFile(models.Model):
+    """Файл логотипа в storage и число компаний, которые на него ссылаются (companies/references.py)"""
+    name = models.CharField(max_length=100, unique=True)
+    refs = models.PositiveIntegerField(default=0)
 
+    def __str__(self):
+        return f"{self.name} ({self.refs})"
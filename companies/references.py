@@ -0,0 +1,111 @@
+"""
+Счетчики ссылок на файлы логотипов (LogoFile.refs). Сигналы companies/signals.py увеличивают счетчик
+нового логотипа компании и уменьшают у старого; файл без ссылок удаляется вместе с миниатюрами
+после коммита транзакции. Файлы, оставшиеся без учета (старые имена, сбои), удаляет cleanup_logos.
+"""
+import logging
+import posixpath
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from companies.images import thumbnail_names
+from companies.models import Company, LogoFile
+from companies.storage import logo_storage
+
+logger = logging.getLogger(__name__)
+
+
+def acquire(name):
+    """+1 ссылка на файл name"""
+    while True:
+        if LogoFile.objects.filter(name=name).update(refs=F("refs") + 1):
+            return
+        try:
+            with transaction.atomic():
+                LogoFile.objects.create(name=name, refs=1)
+            return
+        except IntegrityError:
+            # Строку создал параллельный запрос
+            continue
+
+
+def release(name):
+    """-1 ссылка на файл name, файл без ссылок удаляется после коммита"""
+    LogoFile.objects.filter(name=name, refs__gt=0).update(refs=F("refs") - 1)
+    transaction.on_commit(lambda: delete_if_unused(name))
+
+
+def delete_files(name):
+    for paths in thumbnail_names(name).values():
+        for path in paths.values():
+            logo_storage.delete(path)
+    logo_storage.delete(name)
+
+
+def delete_if_unused(name):
+    """
+    Удаляет файл и его миниатюры, если на него не осталось ссылок. Строка блокируется до удаления файлов:
+    acquire() того же файла ждет коммита, а загрузивший его заново запрос увидит, что файла нет
+    (CompanyImageView сохраняет его повторно).
+    """
+    with transaction.atomic():
+        if not list(LogoFile.objects.select_for_update().filter(name=name, refs=0).values_list("pk", flat=True)):
+            return False
+        delete_files(name)
+        LogoFile.objects.filter(name=name, refs=0).delete()
+    logger.info("Deleted unused logo %s", name)
+    return True
+
+
+def count_refs():
+    """{имя: число ссылок} по таблице компаний, без записи в LogoFile"""
+    return dict(
+        Company.objects.exclude(logo="").values("logo").annotate(refs=Count("pk")).values_list("logo", "refs")
+    )
+
+
+def recount():
+    """Пересчитывает LogoFile.refs по таблице компаний, возвращает {имя: число ссылок}"""
+    refs = count_refs()
+    with transaction.atomic():
+        for logo_file in LogoFile.objects.select_for_update():
+            actual = refs.get(logo_file.name, 0)
+            if logo_file.refs != actual:
+                LogoFile.objects.filter(pk=logo_file.pk).update(refs=actual)
+        existing = set(LogoFile.objects.values_list("name", flat=True))
+        LogoFile.objects.bulk_create(
+            [LogoFile(name=name, refs=count) for name, count in refs.items() if name not in existing],
+            ignore_conflicts=True,
+        )
+    return refs
+
+
+def walk(directory):
+    directories, files = logo_storage.listdir(directory)
+    for filename in files:
+        yield posixpath.join(directory, filename)
+    for subdirectory in directories:
+        yield from walk(posixpath.join(directory, subdirectory))
+
+
+def find_orphans(directory="logos", min_age=timedelta(hours=1), dry_run=False):
+    """
+    Файлы в directory, на которые не ссылается ни одна компания (кроме миниатюр используемых логотипов).
+    Файлы моложе min_age пропускаются: они могут принадлежать еще не закоммиченной загрузке.
+    Попутно пересчитывает LogoFile.refs, с dry_run только читает.
+    """
+    if not logo_storage.exists(directory):
+        return []
+    used = set()
+    for name in count_refs() if dry_run else recount():
+        used.add(name)
+        used.update(path for paths in thumbnail_names(name).values() for path in paths.values())
+
+    threshold = timezone.now() - min_age
+    return [
+        name for name in walk(directory)
+        if name not in used and logo_storage.get_modified_time(name) < threshold
+    ]
@@ -0,0 +1,33 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from companies.models import Company
+from companies.references import acquire, release
+
+
+# Счетчики ссылок на файлы логотипов (companies/references.py) при любой записи компаний
+@receiver(pre_save, sender=Company)
+def remember_previous_logo(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or instance._state.adding or (update_fields is not None and "logo" not in update_fields):
+        instance._previous_logo = None
+        return
+    instance._previous_logo = Company.objects.filter(pk=instance.pk).values_list("logo", flat=True).first()
+
+
+@receiver(post_save, sender=Company)
+def count_logo_references(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and "logo" not in update_fields):
+        return
+    previous = getattr(instance, "_previous_logo", None) or ""
+    if instance.logo.name == previous:
+        return
+    if instance.logo.name:
+        acquire(instance.logo.name)
+    if previous:
+        release(previous)
+
+
+@receiver(post_delete, sender=Company)
+def release_logo(sender, instance, **kwargs):
+    if instance.logo.name:
+        release(instance.logo.name)
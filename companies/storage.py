@@ -0,0 +1,59 @@
+"""
+Хранилище логотипов с адресацией по содержимому: имя файла - sha256 его байтов
+(logos/ab/ab12...ef.png). Одинаковые загрузки хранятся один раз, а файл по имени никогда не меняется,
+поэтому его можно кэшировать навсегда (Cache-Control: immutable, см. djangoProject/media.py).
+Сколько компаний ссылается на файл, считает companies.references.
+"""
+import hashlib
+import posixpath
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+# Имена файлов хранилища и их миниатюр (companies/images.py: <hash>_<w>x<h>.<ext>)
+CONTENT_ADDRESSED_NAME = re.compile(r"(^|/)[0-9a-f]{64}(_\d+x\d+)?\.\w+$")
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        """Сохраняет content под именем по хэшу в каталоге name, существующий файл не перезаписывается"""
+        digest = content_hash(content)
+        extension = posixpath.splitext(name)[1].lower()
+        name = posixpath.join(posixpath.dirname(name), digest[:2], digest + extension)
+        try:
+            return super().save(name, content, max_length)
+        except FileExistsError:
+            # Такой файл уже есть, в том числе записанный параллельным запросом
+            return name
+
+    def save_derived(self, name, content):
+        """Сохраняет файл, производный от файла хранилища (миниатюру), под именем name с заменой"""
+        self.delete(name)
+        try:
+            return super().save(name, content)
+        except FileExistsError:
+            # Тот же файл одновременно создал параллельный запрос
+            return name
+
+    def get_available_name(self, name, max_length=None):
+        # Вместо суффикса к занятому имени (acme_Xy12.png) - то же имя: содержимое совпадает
+        if self.exists(name):
+            raise FileExistsError(name)
+        return name
+
+
+logo_storage = ContentAddressedStorage()
+
+
+def get_logo_storage():
+    return logo_storage
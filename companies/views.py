@@ -1,25 +1,75 @@
+from django.core.exceptions import ValidationError
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import UpdateView
 
+from companies.images import LimitedUploadHandler, MULTIPART_OVERHEAD, logo_settings, submit_thumbnails, \
+    thumbnail_urls, validate_logo
 from companies.models import Company
+from companies.storage import logo_storage
 
 
 @method_decorator(csrf_exempt, name="dispatch")
 class CompanyImageView(UpdateView):
+    """
+    Загрузка логотипа: файл больше COMPANY_LOGO["MAX_UPLOAD_SIZE"] отклоняется, не дочитываясь до конца,
+    миниатюры создаются в фоне, в ответе сразу их адреса (файлы появляются после обработки).
+    """
     model = Company
     fields = ["name", "logo"]
 
     def post(self, request, *args, **kwargs):
+        max_size = logo_settings()["MAX_UPLOAD_SIZE"]
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            return JsonResponse({"logo": ["Invalid Content-Length header."]}, status=400)
+        if content_length > max_size + MULTIPART_OVERHEAD:
+            return self.too_large(max_size)
+
+        # Должен стоять до первого обращения к request.FILES
+        limiter = LimitedUploadHandler(request, max_size)
+        request.upload_handlers.insert(0, limiter)
+
         self.object = self.get_object()
+        logo = request.FILES.get("logo")
+        if limiter.exceeded:
+            return self.too_large(max_size)
+        if logo is None:
+            return JsonResponse({"logo": ["No file was submitted."]}, status=400)
+
+        try:
+            image_format = validate_logo(logo)
+        except ValidationError as error:
+            return JsonResponse({"logo": error.messages}, status=400)
 
-        self.object.logo = request.FILES["logo"]
-        self.object.save()
+        # storage пишет файл по частям (chunks), без чтения целиком в память, под именем по хэшу содержимого:
+        # расширение по формату, чтобы logo.jpg и logo.jpeg с одинаковыми байтами были одним файлом
+        self.object.logo.save(f"logo.{image_format.lower()}", logo, save=False)
+        name = self.object.logo.name
+        # Миниатюры этого файла уже есть, если его загружала другая компания
+        self.object.thumbnails = (
+            Company.objects.filter(logo=name).exclude(thumbnails={}).values_list("thumbnails", flat=True).first()
+            or {}
+        )
+        self.object.save(update_fields=["logo", "thumbnails"])
+        if not logo_storage.exists(name):
+            # Файл удалили как неиспользуемый между записью и учетом ссылки (companies/references.py)
+            logo_storage.save(name, logo)
+            self.object.thumbnails = {}
+        if not self.object.thumbnails:
+            submit_thumbnails(name)
 
         return JsonResponse({
             "id": self.object.id,
             "name": self.object.name,
-            "logo": self.object.logo.url if self.object.logo else None
+            "logo": self.object.logo.url if self.object.logo else None,
+            "thumbnails": thumbnail_urls(self.object.logo.name),
             })
 
+    @staticmethod
+    def too_large(max_size):
+        return JsonResponse({"logo": [f"File is larger than {max_size} bytes."]}, status=413)
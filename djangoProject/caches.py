@@ -0,0 +1,61 @@
+"""
+Кэши, общие для всех процессов (workers сервера и management команды). LocMemCache и DummyCache
+видны только своему процессу: окно чтения из default, сброс токенов и статистика, записанные в них,
+другие процессы не увидят. Настройки, которым нужен общий кэш, проверяются через shared_cache().
+
+Состояние, потеря которого меняет поведение (окно чтения из default, отзыв JWT), проверяется через
+durable_cache(): файловый кэш и кэш в БД при MAX_ENTRIES записей удаляют случайную часть ключей,
+поэтому для него нужен отдельный alias с большим MAX_ENTRIES или Redis/Memcached без вытеснения.
+Счетчикам, которые увеличивают несколько процессов (буфер лайков), нужен атомарный incr - atomic_cache().
+"""
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.cache.backends.redis import RedisCache
+from django.core.exceptions import ImproperlyConfigured
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+# Вытесняют часть ключей, когда их больше OPTIONS["MAX_ENTRIES"]
+CULLING_BACKENDS = (FileBasedCache, DatabaseCache)
+DURABLE_MIN_ENTRIES = 100000
+# incr - одна операция сервера; у LocMemCache - под блокировкой, но только в своем процессе
+ATOMIC_INCR_BACKENDS = (RedisCache, BaseMemcachedCache, LocMemCache)
+
+
+def is_process_local(alias):
+    return isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def shared_cache(alias, setting):
+    """caches[alias], если он общий для процессов, иначе ImproperlyConfigured с именем настройки"""
+    if is_process_local(alias):
+        raise ImproperlyConfigured(
+            f"{setting} = {alias!r}: {type(caches[alias]).__name__} is process-local, "
+            f"use a cache shared by all processes (Redis, Memcached, database or file-based)"
+        )
+    return caches[alias]
+
+
+def durable_cache(alias, setting):
+    """shared_cache(), который не вытесняет ключи при обычном объеме записей"""
+    cache = shared_cache(alias, setting)
+    if isinstance(cache, CULLING_BACKENDS) and cache._max_entries < DURABLE_MIN_ENTRIES:
+        raise ImproperlyConfigured(
+            f"{setting} = {alias!r}: {type(cache).__name__} culls keys past MAX_ENTRIES={cache._max_entries}, "
+            f"use a separate alias with MAX_ENTRIES >= {DURABLE_MIN_ENTRIES} or Redis/Memcached without eviction"
+        )
+    return cache
+
+
+def atomic_cache(alias, setting):
+    """caches[alias], если его incr атомарен, иначе ImproperlyConfigured с именем настройки"""
+    cache = caches[alias]
+    if not isinstance(cache, ATOMIC_INCR_BACKENDS):
+        raise ImproperlyConfigured(
+            f"{setting} = {alias!r}: {type(cache).__name__}.incr() is a read followed by a write, "
+            f"concurrent increments are lost; use Redis or Memcached"
+        )
+    return cache
@@ -0,0 +1,201 @@
+"""
+Чтение с реплик для выбранных view и "прилипание" к основной БД после записи (read-your-writes).
+ReplicaMiddleware решает для каждого запроса, можно ли читать с реплики: это GET/HEAD к view
+из DATABASE_REPLICAS["VIEWS"], и этот клиент ничего не записывал последние STICKY_SECONDS секунд.
+ReplicaRouter отправляет чтения таких запросов на случайную реплику из ALIASES, все остальное - в default.
+Аутентификация читает токен и пользователя из default (use_replica(False) в authentication/): токен,
+выданный только что, реплика может еще не знать. Остальные чтения User (eg. /vacancy/by_user/) идут на реплику.
+Окно после записи хранится в cookie и, для клиентов с заголовком Authorization, в кэше CACHE_ALIAS -
+он должен быть общим для процессов и не вытеснять ключи, иначе следующий запрос прочитает отстающую реплику.
+"""
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from djangoProject.caches import durable_cache
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+LAST_WRITE_KEY = "db_router:last_write"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_settings():
+    return {
+        "ALIASES": [],
+        "VIEWS": [],
+        "STICKY_SECONDS": 5,
+        "COOKIE_NAME": "db_primary_until",
+        "CACHE_ALIAS": "default",
+        **getattr(settings, "DATABASE_REPLICAS", {}),
+    }
+
+
+def replica_cache(options=None):
+    """Кэш окна после записи; с репликами - только общий и без вытеснения (иначе ImproperlyConfigured)"""
+    options = options or replica_settings()
+    if not options["ALIASES"]:
+        return caches[options["CACHE_ALIAS"]]
+    return durable_cache(options["CACHE_ALIAS"], 'DATABASE_REPLICAS["CACHE_ALIAS"]')
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Чтения внутри блока идут на реплики (если они настроены)"""
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def is_replica_read():
+    return _use_replica.get() and bool(replica_settings()["ALIASES"])
+
+
+def replica_may_be_stale():
+    """
+    Чтение идет с реплики, а запись была меньше STICKY_SECONDS назад: реплика могла ее еще не получить.
+    Такие ответы не стоит класть в общий кэш.
+    """
+    if not is_replica_read():
+        return False
+    last_write = replica_cache().get(LAST_WRITE_KEY)
+    return last_write is not None and time.time() - last_write < replica_settings()["STICKY_SECONDS"]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replica_settings()["ALIASES"]
+        if aliases and _use_replica.get():
+            return random.choice(aliases)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и default
+        return True
+
+
+def view_name(view_func, method):
+    """Имя view для DATABASE_REPLICAS["VIEWS"]: класс, класс.действие для ViewSet или имя функции"""
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return view_func.__name__
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        return f"{view_class.__name__}.{actions.get(method.lower())}"
+    return view_class.__name__
+
+
+def sticky_cache_key(request):
+    # Клиенты с токеном могут не хранить cookie, для них окно хранится в кэше по заголовку Authorization
+    authorization = request.headers.get("Authorization")
+    if not authorization:
+        return None
+    return "db_router:sticky:" + hashlib.md5(authorization.encode()).hexdigest()
+
+
+def has_sticky_cookie(request, options):
+    try:
+        return float(request.COOKIES.get(options["COOKIE_NAME"], 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def is_sticky(request, options):
+    if has_sticky_cookie(request, options):
+        return True
+    key = sticky_cache_key(request)
+    return key is not None and replica_cache(options).get(key) is not None
+
+
+async def ais_sticky(request, options):
+    if has_sticky_cookie(request, options):
+        return True
+    key = sticky_cache_key(request)
+    return key is not None and await replica_cache(options).aget(key) is not None
+
+
+def stick_to_primary(request, response, options):
+    now = time.time()
+    until = now + options["STICKY_SECONDS"]
+    response.set_cookie(options["COOKIE_NAME"], f"{until:.3f}", max_age=options["STICKY_SECONDS"], httponly=True)
+    cache = replica_cache(options)
+    key = sticky_cache_key(request)
+    if key is not None:
+        cache.set(key, 1, options["STICKY_SECONDS"])
+    cache.set(LAST_WRITE_KEY, now, options["STICKY_SECONDS"])
+
+
+def may_use_replica(request, view_func, options):
+    """Все условия чтения с реплики, кроме окна после записи"""
+    return (
+        bool(options["ALIASES"])
+        and request.method in ("GET", "HEAD")
+        and view_name(view_func, request.method) in options["VIEWS"]
+    )
+
+
+def wrote(request, response, options):
+    return options["ALIASES"] and request.method not in SAFE_METHODS and response.status_code < 400
+
+
+class ReplicaMiddleware:
+    """Работает и в sync, и в async цепочке: ContextVar виден в обоих режимах"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Django берет process_view после __init__ и вызывает корутину без перехода в поток
+            self.process_view = self.aprocess_view
+        # Локальный кэш с настроенными репликами - ошибка при запуске, а не отстающие чтения
+        replica_cache()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = _use_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+        options = replica_settings()
+        if wrote(request, response, options):
+            stick_to_primary(request, response, options)
+        return response
+
+    async def __acall__(self, request):
+        token = _use_replica.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+        options = replica_settings()
+        if wrote(request, response, options):
+            await sync_to_async(stick_to_primary)(request, response, options)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        options = replica_settings()
+        _use_replica.set(may_use_replica(request, view_func, options) and not is_sticky(request, options))
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        options = replica_settings()
+        _use_replica.set(may_use_replica(request, view_func, options) and not await ais_sticky(request, options))
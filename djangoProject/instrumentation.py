@@ -0,0 +1,331 @@
+"""
+Метрики каждого запроса: число SQL запросов и время в БД, время сериализации ответа (рендереры
+djangoProject/renderers.py), время view и всего запроса. Они отдаются в заголовке Server-Timing
+и пишутся строкой JSON в лог djangoProject.instrumentation: каждый запрос - INFO, запрос дольше
+SLOW_REQUEST_MS или с числом запросов больше MAX_QUERIES - WARNING вместе с самыми медленными SQL.
+Длительности по маршрутам копятся в процессе и раз в FLUSH_INTERVAL секунд добавляются в кэш
+CACHE_ALIAS (последние WINDOW на маршрут), p50/p95/p99 по ним показывает команда request_stats -
+для этого кэш должен быть общим для процессов.
+У потоковых ответов (StreamingHttpResponse) тело отдается после выхода из middleware: запросы и время
+отдачи тела попадают в лог и статистику по окончании потока, а в Server-Timing их еще нет.
+"""
+import hashlib
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from djangoProject.caches import shared_cache
+
+logger = logging.getLogger(__name__)
+
+ROUTES_KEY = "instrumentation:routes"
+SQL_PREVIEW = 500
+
+_metrics = ContextVar("request_metrics", default=None)
+
+
+def instrumentation_settings():
+    return {
+        "ENABLED": True,
+        "SERVER_TIMING": True,
+        "SLOW_REQUEST_MS": 500,
+        "MAX_QUERIES": 50,
+        "SLOWEST_SQL": 3,
+        "WINDOW": 1000,
+        "FLUSH_INTERVAL": 10,
+        "CACHE_ALIAS": "default",
+        **getattr(settings, "INSTRUMENTATION", {}),
+    }
+
+
+def stats_cache():
+    return caches[instrumentation_settings()["CACHE_ALIAS"]]
+
+
+def shared_stats_cache():
+    """Кэш статистики для команды request_stats: в локальном кэше процесса команда увидит пустую таблицу"""
+    return shared_cache(instrumentation_settings()["CACHE_ALIAS"], 'INSTRUMENTATION["CACHE_ALIAS"]')
+
+
+class RequestMetrics:
+    def __init__(self, slowest_sql):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.timings = defaultdict(float)
+        self.view_started = None
+        self.slowest_sql = slowest_sql
+        self._slowest = []  # куча (длительность, номер, sql) - самые медленные запросы
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper для всех соединений на время запроса"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_seconds += duration
+            if self.slowest_sql:
+                item = (duration, self.queries, sql)
+                if len(self._slowest) < self.slowest_sql:
+                    heapq.heappush(self._slowest, item)
+                elif duration > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, item)
+
+    def slowest(self):
+        return [
+            {"ms": round(duration * 1000, 2), "sql": sql[:SQL_PREVIEW]}
+            for duration, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+
+@contextmanager
+def timer(name):
+    """Добавляет длительность блока к метрике name текущего запроса (вне запроса ничего не делает)"""
+    metrics = _metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] += time.perf_counter() - started
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} /{match.route}" if match is not None else f"{request.method} <unresolved>"
+
+
+class RouteStats:
+    """Длительности запросов по маршрутам в памяти процесса, периодически переносятся в кэш"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(list)
+        self._flushed = time.monotonic()
+
+    def add(self, route, total_ms, queries):
+        with self._lock:
+            self._pending[route].append((round(total_ms, 3), queries))
+            if time.monotonic() - self._flushed < instrumentation_settings()["FLUSH_INTERVAL"]:
+                return
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(list)
+            self._flushed = time.monotonic()
+        if not pending:
+            return
+        window = instrumentation_settings()["WINDOW"]
+        cache = stats_cache()
+        # Гонка процессов может потерять порцию измерений - для статистики это допустимо
+        routes = set(cache.get(ROUTES_KEY) or ())
+        for route, samples in pending.items():
+            key = route_key(route)
+            cache.set(key, ((cache.get(key) or []) + samples)[-window:], None)
+            routes.add(route)
+        cache.set(ROUTES_KEY, sorted(routes), None)
+
+
+route_stats = RouteStats()
+
+
+def route_key(route):
+    # В маршруте пробелы и <>, недопустимые в ключах memcached
+    return "instrumentation:route:" + hashlib.md5(route.encode()).hexdigest()
+
+
+def percentile(sorted_values, percent):
+    """Значение по методу ближайшего ранга"""
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def request_stats(cache=None):
+    """{маршрут: {count, p50, p95, p99, max (мс), avg_queries}} по последним WINDOW запросам"""
+    route_stats.flush()
+    cache = cache or stats_cache()
+    stats = {}
+    for route in cache.get(ROUTES_KEY) or ():
+        samples = cache.get(route_key(route)) or []
+        if not samples:
+            continue
+        durations = sorted(duration for duration, _ in samples)
+        stats[route] = {
+            "count": len(samples),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+            "max": durations[-1],
+            "avg_queries": sum(queries for _, queries in samples) / len(samples),
+        }
+    return stats
+
+
+def reset_request_stats(cache=None):
+    route_stats.flush()
+    cache = cache or stats_cache()
+    cache.delete_many([route_key(route) for route in cache.get(ROUTES_KEY) or ()] + [ROUTES_KEY])
+
+
+def server_timing(metrics, view_seconds, total_seconds, streaming=False):
+    parts = [f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"']
+    parts += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in metrics.timings.items()]
+    parts += [f"view;dur={view_seconds * 1000:.1f}", f"total;dur={total_seconds * 1000:.1f}"]
+    if streaming:
+        parts.append('body;desc="streamed, not included"')
+    return ", ".join(parts)
+
+
+def dispatch(execute, sql, params, many, context):
+    """
+    Постоянный execute_wrapper всех соединений: запрос учитывается в RequestMetrics текущего запроса.
+    Метрики ищутся по ContextVar, который asgiref копирует в потоки sync_to_async, поэтому под ASGI
+    учитываются и запросы sync view и ORM, выполняемые не в потоке middleware.
+    """
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    # В начало списка: execute_wrapper() других при выходе снимает последний элемент
+    if dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, dispatch)
+
+
+# Модуль импортируется в VacanciesConfig.ready(), до первого соединения
+connection_created.connect(install)
+for _connection in connections.all(initialized_only=True):
+    install(_connection)
+
+
+class InstrumentationMiddleware:
+    """Первым в MIDDLEWARE, чтобы total включал остальные middleware. Работает в sync и async цепочке"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        options = instrumentation_settings()
+        if not options["ENABLED"]:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(options["SLOWEST_SQL"])
+        started = time.perf_counter()
+        token = _metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        return self.finish(request, response, metrics, started, options)
+
+    async def __acall__(self, request):
+        options = instrumentation_settings()
+        if not options["ENABLED"]:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics(options["SLOWEST_SQL"])
+        started = time.perf_counter()
+        token = _metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        return self.finish(request, response, metrics, started, options)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _metrics.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def finish(self, request, response, metrics, started, options):
+        finished = time.perf_counter()
+        view_seconds = finished - metrics.view_started if metrics.view_started is not None else 0.0
+        if options["SERVER_TIMING"]:
+            response["Server-Timing"] = server_timing(
+                metrics, view_seconds, finished - started, streaming=response.streaming
+            )
+
+        if not response.streaming:
+            self.report(request, response, metrics, view_seconds, finished - started, options)
+        elif response.is_async:
+            response.streaming_content = self.astream(
+                response.streaming_content, request, response, metrics, view_seconds, started, options
+            )
+        else:
+            response.streaming_content = self.stream(
+                response.streaming_content, request, response, metrics, view_seconds, started, options
+            )
+        return response
+
+    def stream(self, content, request, response, metrics, view_seconds, started, options):
+        """Тело потокового ответа: его запросы считаются, отчет пишется после последнего фрагмента"""
+        # Тело отдается после выхода из middleware, в контексте, где метрик запроса уже нет
+        _metrics.set(metrics)
+        try:
+            yield from content
+        finally:
+            _metrics.set(None)
+            self.report(request, response, metrics, view_seconds, time.perf_counter() - started, options)
+
+    async def astream(self, content, request, response, metrics, view_seconds, started, options):
+        _metrics.set(metrics)
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            _metrics.set(None)
+            self.report(request, response, metrics, view_seconds, time.perf_counter() - started, options)
+
+    @staticmethod
+    def report(request, response, metrics, view_seconds, total_seconds, options):
+        route = route_name(request)
+        total_ms = total_seconds * 1000
+        route_stats.add(route, total_ms, metrics.queries)
+
+        slow = total_ms > options["SLOW_REQUEST_MS"]
+        too_many_queries = metrics.queries > options["MAX_QUERIES"]
+        level = logging.WARNING if slow or too_many_queries else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+
+        record = {
+            "route": route,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": metrics.queries,
+            "db_ms": round(metrics.db_seconds * 1000, 2),
+            **{f"{name}_ms": round(seconds * 1000, 2) for name, seconds in metrics.timings.items()},
+            "view_ms": round(view_seconds * 1000, 2),
+            "total_ms": round(total_ms, 2),
+        }
+        if response.streaming:
+            record["streamed"] = True
+        if level == logging.WARNING:
+            record["flags"] = [flag for flag, on in (("slow", slow), ("too_many_queries", too_many_queries)) if on]
+            record["slowest_sql"] = metrics.slowest()
+        logger.log(level, json.dumps(record, ensure_ascii=False))
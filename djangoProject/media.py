@@ -0,0 +1,25 @@
+"""
+Раздача MEDIA_ROOT из Django (SERVE_MEDIA, по умолчанию при DEBUG). Файлы с именем по хэшу содержимого
+(companies/storage.py) не меняются, поэтому отдаются с Cache-Control: immutable на год, остальные -
+с коротким max-age. В production те же заголовки ставит веб-сервер, например в nginx:
+    location ~ "^/media/.*/[0-9a-f]{64}(_\\d+x\\d+)?\\.\\w+$" {
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+"""
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+
+from companies.storage import CONTENT_ADDRESSED_NAME
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MAX_AGE = 60 * 60
+
+
+def serve_media(request, path, document_root=None):
+    response = serve(request, path, document_root=document_root)
+    if response.status_code in (200, 304):
+        if CONTENT_ADDRESSED_NAME.search(path):
+            patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=MAX_AGE)
+    return response
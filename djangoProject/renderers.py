@@ -0,0 +1,72 @@
+"""
+Быстрые JSON renderer/parser для DRF на orjson и json_response() для обычных Django views.
+Типы, которые orjson не знает (Decimal, ленивые строки, QuerySet, ...), а также даты
+переводятся тем же DRF JSONEncoder.default, что и раньше, поэтому ответ остается прежним.
+Если orjson не установлен, используются стандартные JSONRenderer и JSONParser.
+"""
+from django.http import HttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+from djangoProject.instrumentation import timer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+_default = encoders.JSONEncoder().default
+
+# Даты и время отдаем в default, чтобы формат совпадал с DRF ("Z" вместо "+00:00")
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def dumps(data):
+    """JSON в bytes так же, как ORJSONRenderer (компактно, utf-8, \\u2028/\\u2029 экранированы)"""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    content = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    # Проверка без копирования дешевле, чем replace() по всему ответу
+    if b"\xe2\x80\xa8" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028")
+    if b"\xe2\x80\xa9" in content:
+        content = content.replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+def json_response(data, status=200):
+    """Замена JsonResponse для function views: тот же рендеринг, что у API"""
+    with timer("serialize"):
+        content = dumps(data)
+    return HttpResponse(content, status=status, content_type="application/json")
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        with timer("serialize"):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        # Отступы (?format=json; indent=4, Browsable API) и нестрогий режим оставляем стандартному рендереру
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or not self.compact or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return dumps(data)
+
+
+class ORJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        # orjson читает только utf-8
+        if orjson is None or encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
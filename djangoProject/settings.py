@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 import os
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,9 +50,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'djangoProject.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'djangoProject.db_router.ReplicaMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -91,8 +94,104 @@ DATABASES = {
         'PASSWORD': 'postgres',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Постоянные соединения с проверкой перед повторным использованием.
+        # Под ASGI соединения не переиспользуются между запросами, там нужен пулер (pgbouncer) и CONN_MAX_AGE = 0
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
+# Реплики для чтения добавляются в DATABASES и в DATABASE_REPLICAS["ALIASES"], eg.:
+# DATABASES['replica'] = {**DATABASES['default'], 'HOST': 'replica.local', 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ['djangoProject.db_router.ReplicaRouter']
+# Какие view читают с реплик (GET/HEAD) и сколько секунд после записи клиент читает из default.
+# Окно хранится в CACHE_ALIAS, с репликами он должен быть общим для процессов и без вытеснения
+DATABASE_REPLICAS = {
+    "ALIASES": [],
+    "VIEWS": [
+        "VacancyListView", "VacancyDetailView", "SkillsViewSet.list", "user_vacancies",
+        "vacancy_list", "vacancy_detail", "skill_list",
+    ],
+    "STICKY_SECONDS": 5,
+    "COOKIE_NAME": "db_primary_until",
+    "CACHE_ALIAS": "state",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Общий для всех процессов кэш (djangoProject/caches.py): ответы, токены, статистика - то, что можно вытеснить.
+    # В production - Redis или Memcached, eg.:
+    # {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379'}
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('SHARED_CACHE_LOCATION', BASE_DIR / 'var' / 'cache'),
+    },
+    # Общее состояние, которое нельзя вытеснять: окно чтения из default и отзыв JWT. Отдельно от 'shared',
+    # чтобы поток ответов не удалял его ключи; MAX_ENTRIES проверяет durable_cache()
+    'state': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('STATE_CACHE_LOCATION', BASE_DIR / 'var' / 'state'),
+        'OPTIONS': {'MAX_ENTRIES': 1000000},
+    },
+}
+
+# Кэш token -> пользователь для CachedTokenAuthentication (authentication/cached_auth.py): LRU на MAX_SIZE
+# записей с TTL в памяти процесса и, если задан SHARED_CACHE_ALIAS, общий уровень в кэше на SHARED_TTL
+AUTH_TOKEN_CACHE = {
+    "ENABLED": True,
+    "MAX_SIZE": 10000,
+    "TTL": 60,
+    # Общий для процессов уровень: сброс токенов и статистика видны всем workers
+    "SHARED_CACHE_ALIAS": "shared",
+    "SHARED_TTL": 300,
+}
+
+# Кэш ответов /vacancy/ и /vacancy/<pk>/, сбрасывается при любой записи вакансий. CACHE_ALIAS общий:
+# версию ответов, увеличенную записью в одном процессе, должны увидеть все остальные
+VACANCY_CACHE = {
+    "ENABLED": True,
+    "TIMEOUT": 300,
+    "CACHE_ALIAS": "shared",
+}
+
+# Списки вакансий и навыков сериализуются через values() без объектов моделей
+# (vacancies/fast_serializers.py), ответ совпадает с обычными сериализаторами
+FAST_READ_SERIALIZERS = True
+# Async реализации view чтения (vacancies/async_views.py) для запуска под ASGI, по маршрутам
+ASYNC_VIEWS = {
+    "vacancy_list": False,
+    "vacancy_detail": False,
+    "skill_list": False,
+}
+# Логотипы компаний: предельный размер загрузки, допустимые форматы, варианты миниатюр
+# и число потоков, в которых они создаются (companies/images.py)
+COMPANY_LOGO = {
+    "MAX_UPLOAD_SIZE": 5 * 1024 * 1024,
+    "MAX_PIXELS": 40_000_000,
+    "FORMATS": ["JPEG", "PNG", "WEBP", "GIF"],
+    "THUMBNAILS": {"small": [64, 64], "medium": [256, 256]},
+    "THUMBNAIL_FORMATS": ["webp", "jpeg"],
+    "WORKERS": 2,
+}
+# Выгрузка /vacancy/export/: сколько строк читается из курсора и сериализуется за раз
+VACANCY_EXPORT = {
+    "CHUNK_SIZE": 2000,
+}
+
+# Отложенная запись лайков: прирост копится в кэше CACHE_ALIAS (нужен общий кэш с атомарным incr и без
+# вытеснения - Redis или Memcached, файловый кэш не подходит) или, если алиас не задан, в памяти процесса
+# с фоновым flush раз в FLUSH_INTERVAL секунд. Для общего кэша в БД лайки переносит и команда flush_likes --loop
+LIKE_BUFFER = {
+    "ENABLED": False,
+    "CACHE_ALIAS": None,
+    "FLUSH_INTERVAL": 5,
+    "FLUSH_BATCH_SIZE": 500,
+}
 
 
 # Password validation
@@ -137,9 +236,43 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Раздавать MEDIA_ROOT из Django с Cache-Control (djangoProject/media.py), в production - веб-сервером
+SERVE_MEDIA = DEBUG
 #Пагинация (количество отображаемых страниц)
 TOTAL_ON_PAGE = 10
-
+# Словарь полнотекстового поиска вакансий (PostgreSQL)
+VACANCY_SEARCH_CONFIG = "simple"
+
+# Метрики запросов (djangoProject/instrumentation.py): заголовок Server-Timing, строка JSON в лог
+# djangoProject.instrumentation (WARNING, если запрос дольше SLOW_REQUEST_MS или SQL больше MAX_QUERIES,
+# с SLOWEST_SQL самыми медленными запросами) и p50/p95/p99 по маршрутам за последние WINDOW запросов
+# (команда request_stats, читает их из общего для процессов кэша CACHE_ALIAS)
+INSTRUMENTATION = {
+    "ENABLED": True,
+    "SERVER_TIMING": True,
+    "SLOW_REQUEST_MS": 500,
+    "MAX_QUERIES": 50,
+    "SLOWEST_SQL": 3,
+    "WINDOW": 1000,
+    "CACHE_ALIAS": "shared",
+}
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # INFO - строка на каждый запрос, WARNING - только медленные
+        'djangoProject.instrumentation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
 # LOGGING = {
 #     'version': 1,
 #     'disable_existing_loggers': False,
@@ -170,10 +303,60 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.cached_auth.CachedTokenAuthentication",
+        "authentication.jwt.StatelessJWTAuthentication",
+    ],
+    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson, если установлен, иначе стандартный json (djangoProject/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "djangoProject.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema"
+    "DEFAULT_PARSER_CLASSES": [
+        "djangoProject.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+# Массовое создание пользователей (authentication/bulk.py): пароли хэшируются в WORKERS процессах для
+# POST /user/bulk_create/ и в COMMAND_WORKERS для import_users (0 или 1 - в текущем). Пул HTTP держит процессы
+# в каждом worker сервера, поэтому он маленький. Хэш PBKDF2 стоит ~0.3 с, поэтому MAX_ITEMS для запроса
+# ограничен так, чтобы он укладывался в ~15 с таймаута прокси; большие списки - командой import_users.
+# Пользователи пишутся пачками по BATCH_SIZE
+USER_IMPORT = {
+    "BATCH_SIZE": 1000,
+    "WORKERS": 2,
+    "COMMAND_WORKERS": os.cpu_count(),
+    "MAX_ITEMS": 100,
+}
+# Access токен несет username и role, пользователь для проверок строится из claims без БД
+# (authentication/jwt.py). Короткий срок жизни ограничивает, сколько действуют устаревшие claims
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "authentication.jwt.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "authentication.jwt.RoleTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "authentication.jwt.RoleTokenUser",
+}
+# Отзыв access токенов при смене роли, username или деактивации: время отзыва хранится в кэше CACHE_ALIAS,
+# общем для процессов и без вытеснения (djangoProject/caches.py)
+JWT_REVOCATION = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "state",
+}
+# Подсчет общего количества для пагинации: exact, cached (на CACHE_TTL секунд) или
+# estimated (оценка планировщика PostgreSQL, если она больше ESTIMATE_THRESHOLD).
+# VIEWS задает стратегию для отдельных view: {"VacancyListView": "cached"}.
+# /vacancy/by_user/ стратегия не нужна: число пользователей берется из UserVacancyStats
+PAGINATION_COUNT = {
+    "STRATEGY": "exact",
+    "CACHE_TTL": 60,
+    "ESTIMATE_THRESHOLD": 10000,
+    "VIEWS": {},
+}
+# Счетчики /vacancy/by_user/ (vacancies/counters.py): на сколько строк разложена общая статистика
+VACANCY_COUNTERS = {
+    "SHARDS": 8,
 }
 SPECTACULAR_SETTINGS = {
     "TITLE": "Hunting API",
@@ -14,13 +14,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework import routers
 
-from vacancies import views
+from djangoProject.media import serve_media
+from vacancies import views, async_views
+from vacancies.async_views import use_async_view
 from vacancies.views import SkillsViewSet
 
 router = routers.SimpleRouter()
@@ -41,7 +42,13 @@ urlpatterns = [
 
 
 ]
-if settings.DEBUG:
-    static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if getattr(settings, 'SERVE_MEDIA', settings.DEBUG):
+    urlpatterns.append(
+        re_path(rf'^{settings.MEDIA_URL.strip("/")}/(?P<path>.*)$', serve_media, {'document_root': settings.MEDIA_ROOT})
+    )
+
+# GET /skill/ через async view (ASYNC_VIEWS), создание и остальные маршруты - SkillsViewSet
+if use_async_view('skill_list'):
+    urlpatterns.append(path('skill/', async_views.skill_list))
 
 urlpatterns += router.urls
\ No newline at end of file
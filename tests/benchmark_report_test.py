@@ -0,0 +1,42 @@
+from tests.benchmarks.report import compare, compare_scenario, main, save_results, load_results
+
+
+def result(p50=10.0, alloc=100.0, queries=4):
+    return {"p50_ms": p50, "p95_ms": p50 * 2, "alloc_peak_kb": alloc, "queries": queries}
+
+
+def test_compare_scenario_threshold():
+    assert compare_scenario("list", result(p50=11.9), result(), 0.2) == []
+    assert compare_scenario("list", result(p50=12.1), result(), 0.2) == ["list: p50_ms 12.10 > 10.00 (+20% allowed)"]
+    assert compare_scenario("list", result(alloc=130), result(), 0.2) == [
+        "list: alloc_peak_kb 130.00 > 100.00 (+20% allowed)"
+    ]
+
+
+def test_compare_scenario_queries_are_exact():
+    assert compare_scenario("list", result(queries=5), result(), 1.0) == ["list: queries 5 > 4"]
+    assert compare_scenario("list", result(queries=3), result(), 0.2) == []
+
+
+def test_compare_results():
+    baseline = {"dataset": {"size": 1000, "seed": 42}, "scenarios": {"list": result(), "detail": result()}}
+    current = {"dataset": {"size": 1000, "seed": 42}, "scenarios": {"list": result(queries=40), "create": result()}}
+
+    assert compare(current, baseline, 0.2) == ["list: queries 40 > 4"]
+    assert compare({**current, "dataset": {"size": 100, "seed": 42}}, baseline, 0.2) == [
+        "datasets differ: {'size': 100, 'seed': 42} != {'size': 1000, 'seed': 42}"
+    ]
+
+
+def test_cli(tmp_path, capsys):
+    class Dataset:
+        size = 1000
+        seed = 42
+
+    save_results(tmp_path / "baseline.json", Dataset, {"list": result()})
+    save_results(tmp_path / "current.json", Dataset, {"list": result(p50=20)})
+    assert load_results(tmp_path / "current.json")["scenarios"]["list"]["p50_ms"] == 20
+
+    assert main([str(tmp_path / "current.json"), str(tmp_path / "baseline.json")]) == 1
+    assert "1 regression(s)" in capsys.readouterr().out
+    assert main([str(tmp_path / "current.json"), str(tmp_path / "baseline.json"), "--threshold", "1.5"]) == 0
@@ -0,0 +1,156 @@
+"""
+Задержка, число SQL запросов и пик выделенной памяти для основных запросов API на синтетическом наборе
+(tests/benchmarks/datasets.py). Кэш ответов выключен, чтобы измерялась работа view и БД.
+    BENCHMARK=1 BENCHMARK_DATASET=100k pytest tests/benchmarks/api_benchmark_test.py -s
+Результат пишется в BENCHMARK_OUTPUT (по умолчанию benchmark-<набор>.json). С BENCHMARK_BASELINE=<json>
+сценарий падает, если p50 или память выросли больше чем на BENCHMARK_THRESHOLD (0.2) или стало больше SQL.
+1M вакансий имеет смысл только на PostgreSQL: на SQLite нет полнотекстового индекса.
+"""
+import os
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from authentication.models import User
+from tests.benchmarks.datasets import DATASET_SIZES, build_dataset, drop_dataset
+from tests.benchmarks.report import compare_scenario, load_results, save_results
+
+DATASET = os.environ.get("BENCHMARK_DATASET", "1k")
+SEED = int(os.environ.get("BENCHMARK_SEED", 42))
+REPEATS = int(os.environ.get("BENCHMARK_REPEATS", 30))
+OUTPUT = os.environ.get("BENCHMARK_OUTPUT", f"benchmark-{DATASET}.json")
+BASELINE = os.environ.get("BENCHMARK_BASELINE")
+THRESHOLD = float(os.environ.get("BENCHMARK_THRESHOLD", 0.2))
+
+results = {}
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        started = time.perf_counter()
+        data = build_dataset(DATASET_SIZES[DATASET], seed=SEED)
+        print(f"\ndataset {DATASET}: {data.size} vacancies in {time.perf_counter() - started:.1f}s")
+
+        hr = User.objects.create_user(username="bench-hr", password="123qwe", role=User.HR)
+        data.token = Token.objects.create(user=hr).key
+        yield data
+
+        if results:
+            save_results(OUTPUT, data, results)
+            print(f"\nresults: {OUTPUT}")
+        drop_dataset()
+
+
+def list_page(data, n):
+    return "get", f"/vacancy/?page={n % 10 + 1}", None
+
+
+def search(data, n):
+    return "get", f"/vacancy/?text={data.search_word()}&page={n % 5 + 1}", None
+
+
+def skill_filter(data, n):
+    mode = "all" if n % 2 else "any"
+    skills = "&".join(f"skill={name}" for name in data.popular_skills(2))
+    return "get", f"/vacancy/?{skills}&skill_mode={mode}", None
+
+
+def detail(data, n):
+    return "get", f"/vacancy/{data.popular_vacancy_id()}/", None
+
+
+def create(data, n):
+    skills = data.popular_skills(3)
+    return "post", "/vacancy/create/", {"slug": f"bench-new-{n}", "text": "new vacancy", "status": "draft", "skills": skills}
+
+
+def update(data, n):
+    body = {"slug": f"bench-updated-{n}", "text": f"updated {n}", "status": "open", "skills": ["python"]}
+    return "put", f"/vacancy/{data.popular_vacancy_id()}/update/", body
+
+
+def like(data, n):
+    return "put", "/vacancy/like/", [data.popular_vacancy_id() for _ in range(10)]
+
+
+def by_user(data, n):
+    return "get", f"/vacancy/by_user/?page={n % 10 + 1}", None
+
+
+SCENARIOS = {
+    "list": list_page,
+    "search": search,
+    "skill_filter": skill_filter,
+    "detail": detail,
+    "create": create,
+    "update": update,
+    "like": like,
+    "by_user": by_user,
+}
+
+
+def send(client, data, make_request, n):
+    method, path, body = make_request(data, n)
+    kwargs = {"content_type": "application/json"} if body is not None else {}
+    response = getattr(client, method)(path, body, HTTP_AUTHORIZATION="Token " + data.token, **kwargs)
+    assert response.status_code < 400, (path, response.status_code, response.content[:500])
+    return response
+
+
+def measure(client, data, make_request):
+    send(client, data, make_request, -1)  # прогрев: соединение, кэш токена, планы запросов
+
+    latencies = []
+    queries = []
+    for n in range(REPEATS):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            send(client, data, make_request, n)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+
+    # Отдельный запрос: tracemalloc замедляет выполнение и исказил бы задержку
+    tracemalloc.start()
+    try:
+        send(client, data, make_request, REPEATS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": REPEATS,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(quantiles[94], 3),
+        "p99_ms": round(quantiles[98], 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries": max(queries),
+        "alloc_peak_kb": round(peak / 1024, 1),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("scenario", SCENARIOS)
+def test_api_benchmark(dataset, scenario):
+    with override_settings(VACANCY_CACHE={"ENABLED": False}):
+        result = measure(Client(), dataset, SCENARIOS[scenario])
+    results[scenario] = result
+
+    print(
+        f"\n{scenario:>12}: p50 {result['p50_ms']:8.2f} ms, p95 {result['p95_ms']:8.2f} ms, "
+        f"p99 {result['p99_ms']:8.2f} ms, {result['queries']:3} queries, {result['alloc_peak_kb']:9.1f} KiB"
+    )
+
+    if BASELINE:
+        baseline = load_results(BASELINE)
+        assert baseline["dataset"] == {"size": dataset.size, "seed": dataset.seed}, "baseline is for another dataset"
+        if scenario in baseline["scenarios"]:
+            regressions = compare_scenario(scenario, result, baseline["scenarios"][scenario], THRESHOLD)
+            assert not regressions, "\n".join(regressions)
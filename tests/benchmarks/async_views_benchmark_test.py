@@ -0,0 +1,88 @@
+"""
+Задержка при CONCURRENCY одновременных клиентах: WSGI против ASGI с ASYNC_VIEWS.
+Серверы запускаются отдельно на одной и той же БД (PostgreSQL) с VACANCY_CACHE["ENABLED"] = False,
+чтобы сравнивались запросы к БД, а не кэш ответов, например:
+    gunicorn djangoProject.wsgi -w 4 --threads 8 -b :8001
+    uvicorn djangoProject.asgi:application --workers 4 --port 8002   (ASYNC_VIEWS включены)
+    BENCHMARK=1 BENCHMARK_WSGI_URL=http://127.0.0.1:8001 BENCHMARK_ASGI_URL=http://127.0.0.1:8002 \
+        BENCHMARK_TOKEN=<token> BENCHMARK_VACANCY_ID=1 pytest tests/benchmarks/async_views_benchmark_test.py -s
+"""
+import asyncio
+import os
+import statistics
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+SERVERS = {
+    "WSGI": os.environ.get("BENCHMARK_WSGI_URL"),
+    "ASGI": os.environ.get("BENCHMARK_ASGI_URL"),
+}
+CONCURRENCY = int(os.environ.get("BENCHMARK_CONCURRENCY", 200))
+REQUESTS_PER_CLIENT = int(os.environ.get("BENCHMARK_REQUESTS_PER_CLIENT", 10))
+TOKEN = os.environ.get("BENCHMARK_TOKEN")
+VACANCY_ID = os.environ.get("BENCHMARK_VACANCY_ID", "1")
+
+pytestmark = pytest.mark.skipif(
+    not all(SERVERS.values()), reason="set BENCHMARK_WSGI_URL and BENCHMARK_ASGI_URL"
+)
+
+
+async def fetch(host, port, path, headers):
+    """GET по HTTP/1.1 без сторонних клиентов, возвращает код ответа"""
+    reader, writer = await asyncio.open_connection(host, port)
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}", "Connection: close", "Accept: application/json"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+async def run_clients(base_url, path, headers):
+    url = urlsplit(base_url)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for _ in range(REQUESTS_PER_CLIENT):
+            started = time.perf_counter()
+            try:
+                status = await fetch(url.hostname, url.port or 80, path, headers)
+            except OSError:
+                status = None
+            latencies.append(time.perf_counter() - started)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(CONCURRENCY)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values, percent):
+    return statistics.quantiles(values, n=100)[percent - 1] * 1000
+
+
+def test_async_views_latency():
+    headers = {"Authorization": f"Token {TOKEN}"} if TOKEN else {}
+    endpoints = {
+        "vacancy list": ("/vacancy/", {}),
+        "vacancy search": ("/vacancy/?text=python&skill=django", {}),
+        "skill list": ("/skill/", {}),
+    }
+    if TOKEN:
+        endpoints["vacancy detail"] = (f"/vacancy/{VACANCY_ID}/", headers)
+
+    print(f"\n{CONCURRENCY} concurrent clients x {REQUESTS_PER_CLIENT} requests")
+    for title, (path, endpoint_headers) in endpoints.items():
+        for server, base_url in SERVERS.items():
+            latencies, errors, elapsed = asyncio.run(run_clients(base_url, path, endpoint_headers))
+            print(
+                f"{title:>15}, {server}: p50 {percentile(latencies, 50):7.1f} ms, "
+                f"p95 {percentile(latencies, 95):7.1f} ms, p99 {percentile(latencies, 99):7.1f} ms, "
+                f"{len(latencies) / elapsed:7.0f} req/s, errors {errors}"
+            )
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+# Бенчмарки долгие и создают большие наборы данных, запускаются только явно:
+# BENCHMARK=1 BENCHMARK_SIZE=100000 pytest tests/benchmarks -s
+BENCHMARK_ENABLED = bool(os.environ.get("BENCHMARK"))
+BENCHMARK_SIZE = int(os.environ.get("BENCHMARK_SIZE", 100_000))
+
+
+def pytest_collection_modifyitems(config, items):
+    if BENCHMARK_ENABLED:
+        return
+
+    skip = pytest.mark.skip(reason="set BENCHMARK=1 to run benchmarks")
+    benchmarks_dir = os.path.dirname(__file__)
+    for item in items:
+        if str(item.fspath).startswith(benchmarks_dir):
+            item.add_marker(skip)
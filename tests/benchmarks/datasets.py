@@ -0,0 +1,134 @@
+"""
+Воспроизводимые синтетические наборы вакансий для бенчмарков API.
+Объекты строятся фабриками из tests/factories.py (build, без сохранения) и пишутся bulk_create пачками.
+Популярность навыков, слов текста и пользователей распределена по Zipf: несколько навыков есть
+у большинства вакансий, длинный хвост - у единиц, как в реальных данных. Один seed - один и тот же набор.
+"""
+import random
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from rest_framework.authtoken.models import Token
+
+from authentication.models import User
+from tests.factories import UserFactory, VacancyFactory, SkillFactory
+from vacancies.cache import bump_version
+from vacancies.counters import recount_vacancies
+from vacancies.models import Vacancy, Skill
+from vacancies.search import update_search_vector
+
+DATASET_SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+
+# Самые популярные навыки идут первыми, остальные до SKILL_COUNT - хвост распределения
+POPULAR_SKILLS = [
+    "python", "sql", "git", "docker", "linux", "javascript", "django", "postgresql", "java", "react",
+    "typescript", "kubernetes", "aws", "go", "redis", "c#", "kotlin", "php", "rest", "celery",
+    "spring", "vue", "ansible", "terraform", "rabbitmq", "kafka", "c++", "swift", "rust", "scala",
+]
+SKILL_COUNT = 300
+WORDS = [
+    "developer", "senior", "junior", "middle", "backend", "frontend", "team", "remote", "office", "project",
+    "experience", "product", "company", "salary", "english", "stack", "service", "data", "cloud",
+    "lead", "api", "tests", "design", "support", "mobile", "web", "analytics", "platform", "startup", "fintech",
+] + [f"term{n}" for n in range(470)]
+STATUSES = ["open", "draft", "closed"]
+STATUS_WEIGHTS = [70, 20, 10]
+VACANCIES_PER_USER = 20
+
+
+def zipf_cum_weights(count, exponent=1.1):
+    return list(accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+class Dataset:
+    """Идентификаторы созданного набора и генератор запросов к нему (свой seed, тоже воспроизводимый)"""
+
+    def __init__(self, size, seed, user_ids, vacancy_ids, skill_names):
+        self.size = size
+        self.seed = seed
+        self.user_ids = user_ids
+        self.vacancy_ids = vacancy_ids
+        self.skill_names = skill_names  # по убыванию популярности
+        self.rng = random.Random(seed + 1)
+        self._vacancy_weights = zipf_cum_weights(len(vacancy_ids))
+
+    def popular_vacancy_id(self):
+        """id вакансии с Zipf-распределением обращений: чаще всего запрашиваются одни и те же"""
+        return self.rng.choices(self.vacancy_ids, cum_weights=self._vacancy_weights)[0]
+
+    def popular_skills(self, count):
+        return self.rng.sample(self.skill_names[:10], count)
+
+    def search_word(self):
+        return self.rng.choice(WORDS[:30])
+
+
+def build_dataset(size, seed=42, chunk_size=10_000):
+    """Создает size вакансий, size / VACANCIES_PER_USER пользователей и SKILL_COUNT навыков"""
+    rng = random.Random(seed)
+
+    # Один хэш на всех: PBKDF2 для каждого пользователя занял бы больше, чем весь набор
+    password = make_password(UserFactory.password)
+    users = User.objects.bulk_create(
+        [UserFactory.build(username=f"bench{n}", password=password) for n in range(max(1, size // VACANCIES_PER_USER))],
+        batch_size=chunk_size,
+    )
+
+    names = POPULAR_SKILLS + [f"skill{n}" for n in range(SKILL_COUNT - len(POPULAR_SKILLS))]
+    skills = Skill.objects.bulk_create([SkillFactory.build(name=name) for name in names])
+    skill_ids = [skill.pk for skill in skills]
+
+    skill_weights = zipf_cum_weights(len(skill_ids))
+    word_weights = zipf_cum_weights(len(WORDS))
+    user_weights = zipf_cum_weights(len(users), exponent=0.8)
+    through = Vacancy.skills.through
+    vacancy_ids = []
+
+    for start in range(0, size, chunk_size):
+        count = min(chunk_size, size - start)
+        authors = rng.choices(users, cum_weights=user_weights, k=count)
+        statuses = rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=count)
+        vacancies = Vacancy.objects.bulk_create([
+            VacancyFactory.build(
+                slug=f"vacancy-{start + n}",
+                text=" ".join(rng.choices(WORDS, cum_weights=word_weights, k=rng.randint(20, 60))),
+                status=statuses[n],
+                user=authors[n],
+                likes=int(rng.paretovariate(1.5)) - 1,
+            )
+            for n in range(count)
+        ])
+        vacancy_ids.extend(vacancy.pk for vacancy in vacancies)
+        through.objects.bulk_create([
+            through(vacancy_id=vacancy.pk, skill_id=skill_id)
+            for vacancy in vacancies
+            for skill_id in set(rng.choices(skill_ids, cum_weights=skill_weights, k=rng.randint(1, 6)))
+        ])
+
+    update_search_vector(Vacancy.objects.all())
+    recount_vacancies()
+    bump_version()
+    return Dataset(size, seed, [user.pk for user in users], vacancy_ids, names)
+
+
+def drop_dataset():
+    """
+    Очищает таблицы набора одним TRUNCATE/DELETE (delete() по миллиону вакансий шел бы через сигналы)
+    и сбрасывает последовательности id, на которые рассчитывают остальные тесты.
+    """
+    models = [Vacancy.skills.through, Vacancy, Skill, Token, User.groups.through, User.user_permissions.through, User]
+    statements = connection.ops.sql_flush(
+        no_style(),
+        [model._meta.db_table for model in models],
+        reset_sequences=True,
+        allow_cascade=connection.vendor == "postgresql",
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    recount_vacancies()
+    bump_version()
+
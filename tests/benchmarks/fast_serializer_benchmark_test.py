@@ -0,0 +1,53 @@
+import time
+
+import pytest
+from django.db.models import Prefetch
+
+from vacancies.fast_serializers import FastVacancyListSerializer, FastSkillSerializer
+from vacancies.models import Vacancy, Skill
+from vacancies.serializers import VacancyListSerializer, SkillSerializer
+
+ROWS = 1000
+REPEATS = 20
+
+
+def best_of(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+@pytest.mark.django_db
+def test_fast_serializer_benchmark(user):
+    skills = Skill.objects.bulk_create([Skill(name=f"skill{i}") for i in range(20)])
+    vacancies = Vacancy.objects.bulk_create(
+        [Vacancy(slug=f"v{i}", text="text " * 50, user=user) for i in range(ROWS)]
+    )
+    through = Vacancy.skills.through
+    through.objects.bulk_create(
+        [through(vacancy_id=v.pk, skill_id=skills[(v.pk + k) % 20].pk) for v in vacancies for k in range(5)]
+    )
+
+    vacancy_qs = Vacancy.objects.select_related("user").prefetch_related(
+        Prefetch("skills", queryset=Skill.objects.order_by("id"))
+    )
+    fast_vacancies = FastVacancyListSerializer()
+    fast_skills = FastSkillSerializer()
+
+    cases = {
+        "vacancy list, ModelSerializer": lambda: VacancyListSerializer(vacancy_qs.all(), many=True).data,
+        "vacancy list, values()": lambda: fast_vacancies.serialize(fast_vacancies.values(vacancy_qs.all())),
+        "skill list x50, ModelSerializer": lambda: [SkillSerializer(Skill.objects.all(), many=True).data
+                                                   for _ in range(50)],
+        "skill list x50, values()": lambda: [fast_skills.serialize(fast_skills.values(Skill.objects.all()))
+                                            for _ in range(50)],
+    }
+
+    assert cases["vacancy list, values()"]() == cases["vacancy list, ModelSerializer"]()
+
+    print(f"\nserializers, {ROWS} vacancies (SQL included), best of {REPEATS}")
+    for title, func in cases.items():
+        print(f"{title:>32}: {best_of(func):8.1f} ms")
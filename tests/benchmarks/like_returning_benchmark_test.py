@@ -0,0 +1,50 @@
+import json
+import time
+
+import pytest
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from vacancies.likes import like_vacancies
+from vacancies.models import Vacancy, Skill
+from vacancies.serializers import VacancyDetailSerializer
+
+REQUESTS = 2000
+IDS_PER_REQUEST = 5
+
+
+def legacy_like(ids):
+    """Прежний путь: UPDATE, повторная выборка вакансий и полная сериализация с навыками"""
+    Vacancy.objects.filter(pk__in=ids).update(likes=F("likes") + 1)
+    return json.dumps(VacancyDetailSerializer(
+        Vacancy.objects.filter(pk__in=ids).prefetch_related("skills"), many=True
+    ).data, default=str)
+
+
+def returning_like(ids):
+    return json.dumps([{"id": pk, "likes": value} for pk, value in sorted(like_vacancies(ids).items())])
+
+
+def measure(like, ids):
+    with CaptureQueriesContext(connection) as queries:
+        like(ids)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        like(ids)
+    return REQUESTS / (time.perf_counter() - start), len(queries)
+
+
+@pytest.mark.django_db
+def test_like_returning_benchmark():
+    skills = Skill.objects.bulk_create([Skill(name=f"skill{i}") for i in range(5)])
+    vacancies = Vacancy.objects.bulk_create([Vacancy(slug=f"v{i}", text="text " * 100) for i in range(IDS_PER_REQUEST)])
+    for vacancy in vacancies:
+        vacancy.skills.add(*skills)
+    ids = [vacancy.pk for vacancy in vacancies]
+
+    print(f"\nlike, {REQUESTS} requests x {IDS_PER_REQUEST} ids")
+    for title, like in [("update + select + serialize", legacy_like), ("update returning", returning_like)]:
+        rate, queries = measure(like, ids)
+        print(f"{title:>28}: {rate:8.0f} req/s, {queries} queries")
@@ -0,0 +1,52 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+from django.db.models import F
+
+from vacancies import likes
+from vacancies.models import Vacancy
+
+THREADS = 16
+LIKES_PER_THREAD = 200
+HOT_VACANCIES = 3
+
+
+def run_concurrently(like):
+    def worker(ids):
+        try:
+            for _ in range(LIKES_PER_THREAD):
+                like(ids)
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        ids = list(Vacancy.objects.values_list("pk", flat=True))
+        list(executor.map(worker, [ids] * THREADS))
+    return THREADS * LIKES_PER_THREAD / (time.perf_counter() - start)
+
+
+def direct_like(ids):
+    Vacancy.objects.filter(pk__in=ids).update(likes=F("likes") + 1)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("alias", ["default", None], ids=["cache", "local"])
+def test_like_throughput_benchmark(settings, alias):
+    settings.LIKE_BUFFER = {**settings.LIKE_BUFFER, "ENABLED": True, "CACHE_ALIAS": alias, "FLUSH_INTERVAL": 0}
+    Vacancy.objects.bulk_create([Vacancy(slug=f"hot{i}", text="hot") for i in range(HOT_VACANCIES)])
+
+    direct = run_concurrently(direct_like)
+    Vacancy.objects.update(likes=0)
+    buffered = run_concurrently(likes.buffer_likes)
+
+    start = time.perf_counter()
+    likes.flush_likes()
+    flush_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\nlikes, {THREADS} threads x {LIKES_PER_THREAD} on {HOT_VACANCIES} rows ({alias or 'local'} store)")
+    print(f"  direct UPDATE: {direct:10.0f} likes/s")
+    print(f"  buffered:      {buffered:10.0f} likes/s, flush {flush_ms:.1f} ms")
+    assert set(Vacancy.objects.values_list("likes", flat=True)) == {THREADS * LIKES_PER_THREAD}
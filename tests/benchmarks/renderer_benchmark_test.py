@@ -0,0 +1,51 @@
+import time
+
+import pytest
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from djangoProject.renderers import ORJSONRenderer
+from vacancies.models import Vacancy, Skill
+from vacancies.serializers import VacancyListSerializer, VacancyDetailSerializer
+
+ROWS = 1000
+REPEATS = 20
+
+
+def best_of(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+@pytest.mark.django_db
+def test_renderer_benchmark(user):
+    skills = Skill.objects.bulk_create([Skill(name=f"skill{i}") for i in range(20)])
+    vacancies = Vacancy.objects.bulk_create(
+        [Vacancy(slug=f"v{i}", text="текст вакансии " * 30, user=user) for i in range(ROWS)]
+    )
+    through = Vacancy.skills.through
+    through.objects.bulk_create(
+        [through(vacancy_id=v.pk, skill_id=skills[(v.pk + k) % 20].pk) for v in vacancies for k in range(5)]
+    )
+
+    queryset = Vacancy.objects.select_related("user").prefetch_related(
+        Prefetch("skills", queryset=Skill.objects.order_by("id"))
+    )
+    pages = {
+        "list page": {"count": ROWS, "next": None, "previous": None,
+                      "results": VacancyListSerializer(queryset, many=True).data},
+        "detail pages": VacancyDetailSerializer(queryset, many=True).data,
+    }
+    renderers = {"JSONRenderer": JSONRenderer(), "ORJSONRenderer": ORJSONRenderer()}
+
+    print(f"\nrenderers, {ROWS} vacancies, best of {REPEATS}")
+    for title, data in pages.items():
+        assert renderers["ORJSONRenderer"].render(data) == renderers["JSONRenderer"].render(data)
+        for name, renderer in renderers.items():
+            elapsed = best_of(lambda: renderer.render(data))
+            size = len(renderer.render(data)) / 1024
+            print(f"{title:>12}, {name:>14}: {elapsed:8.2f} ms, {size / elapsed * 1000 / 1024:8.1f} MB/s")
@@ -0,0 +1,89 @@
+"""
+Результаты api_benchmark_test.py в JSON и сравнение с базовым прогоном:
+    python -m tests.benchmarks.report current.json baseline.json [--threshold 0.2]
+Регрессия - рост p50 или пика памяти больше чем на threshold, или больше SQL запросов на запрос
+(N+1 виден сразу, независимо от шума времени).
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+import django
+from django.db import connection
+
+# Метрики времени и памяти сравниваются с допуском, число запросов - точно
+RELATIVE_METRICS = ("p50_ms", "alloc_peak_kb")
+EXACT_METRICS = ("queries",)
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+    }
+
+
+def save_results(path, dataset, scenarios):
+    with open(path, "w") as file:
+        json.dump({
+            "dataset": {"size": dataset.size, "seed": dataset.seed},
+            "environment": environment(),
+            "scenarios": scenarios,
+        }, file, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_scenario(name, current, baseline, threshold):
+    regressions = []
+    for metric in RELATIVE_METRICS:
+        if baseline.get(metric) and current[metric] > baseline[metric] * (1 + threshold):
+            regressions.append(
+                f"{name}: {metric} {current[metric]:.2f} > {baseline[metric]:.2f} (+{threshold:.0%} allowed)"
+            )
+    for metric in EXACT_METRICS:
+        if metric in baseline and current[metric] > baseline[metric]:
+            regressions.append(f"{name}: {metric} {current[metric]} > {baseline[metric]}")
+    return regressions
+
+
+def compare(current, baseline, threshold):
+    """Список регрессий current относительно baseline (сравниваются сценарии, которые есть в обоих)"""
+    if current["dataset"] != baseline["dataset"]:
+        return [f"datasets differ: {current['dataset']} != {baseline['dataset']}"]
+    regressions = []
+    for name, result in current["scenarios"].items():
+        if name in baseline["scenarios"]:
+            regressions += compare_scenario(name, result, baseline["scenarios"][name], threshold)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("current")
+    parser.add_argument("baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    regressions = compare(load_results(args.current), load_results(args.baseline), args.threshold)
+    for regression in regressions:
+        print(regression)
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import random
+import time
+
+import pytest
+from django.db.models import Q
+
+from tests.benchmarks.conftest import BENCHMARK_SIZE
+from vacancies.filters import filter_by_skills, SKILL_MODE_ALL, SKILL_MODE_ANY
+from vacancies.models import Vacancy, Skill
+
+SKILLS_TOTAL = 300
+REPEATS = 5
+
+
+def create_dataset(size):
+    """size вакансий, у каждой 5-10 навыков, популярные навыки встречаются чаще"""
+    rnd = random.Random(42)
+    skills = Skill.objects.bulk_create([Skill(name=f"skill{i}") for i in range(SKILLS_TOTAL)])
+    weights = [1 / (i + 1) for i in range(SKILLS_TOTAL)]
+
+    through = Vacancy.skills.through
+    for start in range(0, size, 10_000):
+        batch = Vacancy.objects.bulk_create(
+            [Vacancy(slug=f"v{i}", text=f"vacancy {i}") for i in range(start, min(start + 10_000, size))]
+        )
+        links = []
+        for vacancy in batch:
+            chosen = {skill.pk for skill in rnd.choices(skills, weights, k=rnd.randint(5, 10))}
+            links.extend(through(vacancy_id=vacancy.pk, skill_id=skill_id) for skill_id in chosen)
+        through.objects.bulk_create(links)
+
+
+def measure(queryset):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        ids = list(queryset.values_list("id", flat=True)[:10])
+        count = queryset.count()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, count, len(ids) == len(set(ids))
+
+
+@pytest.mark.django_db
+def test_skill_filter_benchmark():
+    create_dataset(BENCHMARK_SIZE)
+    names = ["skill0", "skill3", "skill10"]
+
+    legacy_q = Q()
+    for name in names:
+        legacy_q |= Q(skills__name__icontains=name)
+
+    cases = {
+        "legacy icontains OR": Vacancy.objects.filter(legacy_q),
+        "any (EXISTS)": filter_by_skills(Vacancy.objects.all(), names, SKILL_MODE_ANY),
+        "all (GROUP BY subquery)": filter_by_skills(Vacancy.objects.all(), names, SKILL_MODE_ALL),
+    }
+
+    print(f"\nskill filter, {BENCHMARK_SIZE} vacancies")
+    for title, queryset in cases.items():
+        ms, count, unique = measure(queryset.order_by("id"))
+        print(f"{title:>25}: {ms:8.1f} ms, count={count}, unique_page={unique}")
+        if title != "legacy icontains OR":
+            assert unique
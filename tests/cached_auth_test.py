@@ -0,0 +1,119 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory
+
+from authentication.async_auth import aauthenticate
+from authentication.cached_auth import LRUCache, STATS_KEY, token_cache, token_cache_stats, reset_token_cache_stats
+from authentication.models import User
+
+
+def get_detail(client, vacancy, token):
+    return client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + token)
+
+
+@pytest.mark.django_db
+def test_cached_token_skips_lookup(client, vacancy, hr_token, django_assert_num_queries, settings):
+    settings.VACANCY_CACHE = {"ENABLED": False}
+    reset_token_cache_stats()
+    assert get_detail(client, vacancy, hr_token).status_code == 200
+
+    # Выборка вакансии и ее навыков, без токена и пользователя
+    with django_assert_num_queries(3):
+        response = get_detail(client, vacancy, hr_token)
+
+    assert response.status_code == 200
+    stats = token_cache_stats()
+    assert (stats["local_hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["avg_miss_ms"] > stats["avg_hit_ms"]
+
+
+@pytest.mark.django_db
+def test_logout_invalidates_cached_token(client, vacancy, hr_token):
+    assert get_detail(client, vacancy, hr_token).status_code == 200
+
+    response = client.post("/user/logout/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.status_code == 200
+    assert get_detail(client, vacancy, hr_token).status_code == 401
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("field, value, status", [("is_active", False, 401), ("role", User.EMPLOYEE, 403)])
+def test_user_change_invalidates_cached_token(client, vacancy, hr_token, field, value, status):
+    assert get_detail(client, vacancy, hr_token).status_code == 200
+    user = User.objects.get(username="hr")
+    setattr(user, field, value)
+    user.save()
+
+    # Создавать вакансии может только HR
+    response = client.post(
+        "/vacancy/create/", {"slug": "new", "text": "new", "status": "draft"},
+        content_type="application/json", HTTP_AUTHORIZATION="Token " + hr_token,
+    )
+
+    assert response.status_code == status
+
+
+@pytest.mark.django_db
+def test_async_authentication_uses_cache(client, vacancy, hr_token, django_assert_num_queries):
+    get_detail(client, vacancy, hr_token)
+    request = RequestFactory().get("/vacancy/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    with django_assert_num_queries(0):
+        user = async_to_sync(aauthenticate)(request)
+
+    assert user.username == "hr"
+    assert request.auth.key == hr_token
+
+
+@pytest.mark.django_db
+def test_shared_cache_tier(client, vacancy, hr_token, settings, django_assert_num_queries):
+    settings.AUTH_TOKEN_CACHE = {"SHARED_CACHE_ALIAS": "shared"}
+    get_detail(client, vacancy, hr_token)
+    token_cache.local.clear()  # другой процесс: локальный уровень пуст
+
+    request = RequestFactory().get("/vacancy/", HTTP_AUTHORIZATION="Token " + hr_token)
+    with django_assert_num_queries(0):
+        user = async_to_sync(aauthenticate)(request)
+    assert user.username == "hr"
+    assert token_cache_stats()["shared_hits"] == 1
+
+    client.post("/user/logout/", HTTP_AUTHORIZATION="Token " + hr_token)
+    assert get_detail(client, vacancy, hr_token).status_code == 401
+
+
+@pytest.mark.django_db
+def test_stats_kept_in_shared_tier(client, vacancy, hr_token, capsys):
+    reset_token_cache_stats()
+    get_detail(client, vacancy, hr_token)
+    token_cache.flush_stats()
+
+    assert caches["shared"].get(STATS_KEY)["misses"] == 1
+    call_command("auth_cache_stats")
+    assert "misses=1" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_process_local_shared_tier_rejected(client, vacancy, hr_token, settings):
+    settings.AUTH_TOKEN_CACHE = {"SHARED_CACHE_ALIAS": "default"}
+
+    with pytest.raises(ImproperlyConfigured):
+        get_detail(client, vacancy, hr_token)
+    with pytest.raises(CommandError, match="LocMemCache"):
+        call_command("auth_cache_stats")
+
+
+def test_lru_cache_evicts_and_expires(monkeypatch):
+    lru = LRUCache(max_size=2, ttl=10)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
+
+    monkeypatch.setattr("authentication.cached_auth.time.monotonic", lambda: float("inf"))
+    assert lru.get("a") is None
@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from companies.images import wait_for_thumbnails
+from companies.models import Company, LogoFile
+from companies.storage import logo_storage
+from djangoProject.media import serve_media
+from tests.companies.company_logo_test import image_file
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def upload(client, company, **kwargs):
+    response = client.post(f"/company/{company.pk}/image/", {"logo": image_file(**kwargs)})
+    assert response.status_code == 200
+    wait_for_thumbnails(timeout=10)
+    company.refresh_from_db()
+    return company.logo.name
+
+
+def stored_files(media_root):
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), media_root)
+        for directory, _, names in os.walk(media_root) for name in names
+    )
+
+
+def test_same_content_is_stored_once():
+    first = logo_storage.save("logos/a.PNG", SimpleUploadedFile("a.PNG", b"same bytes"))
+    second = logo_storage.save("logos/b.png", SimpleUploadedFile("b.png", b"same bytes"))
+    other = logo_storage.save("logos/c.png", SimpleUploadedFile("c.png", b"other bytes"))
+
+    assert first == second
+    assert first != other
+    assert len(os.path.basename(first)) == 64 + len(".png")
+    with logo_storage.open(first) as file:
+        assert file.read() == b"same bytes"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_companies_share_logo_file(client, company_factory, media_root):
+    first, second = company_factory.create_batch(2)
+
+    name = upload(client, first)
+    assert upload(client, second, name="copy.png") == name
+
+    assert LogoFile.objects.get(name=name).refs == 2
+    assert Company.objects.get(pk=second.pk).thumbnails == Company.objects.get(pk=first.pk).thumbnails
+    assert len(stored_files(media_root)) == 1 + 4  # логотип и 4 миниатюры
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replaced_logo_is_deleted_when_unused(client, company_factory, media_root):
+    first, second = company_factory.create_batch(2)
+    shared = upload(client, first)
+    upload(client, second)
+
+    upload(client, first, size=(300, 300))
+    assert LogoFile.objects.get(name=shared).refs == 1
+    assert logo_storage.exists(shared)
+
+    upload(client, second, size=(300, 300))
+    assert not LogoFile.objects.filter(name=shared).exists()
+    assert not logo_storage.exists(shared)
+    assert len(stored_files(media_root)) == 1 + 4
+
+    Company.objects.filter(pk__in=[first.pk, second.pk]).delete()  # QuerySet.delete тоже шлет post_delete
+    assert stored_files(media_root) == []
+    assert not LogoFile.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cleanup_logos(client, company, media_root):
+    name = upload(client, company)
+    logo_storage.save("logos/orphan.png", SimpleUploadedFile("orphan.png", b"orphan"))
+    (media_root / "logos/legacy.png").write_bytes(b"legacy")
+    recent = logo_storage.save("logos/recent.png", SimpleUploadedFile("recent.png", b"recent"))
+    old = time.time() - 2 * 60 * 60
+    for path in stored_files(media_root):
+        if recent not in path:
+            os.utime(media_root / path, (old, old))
+    LogoFile.objects.filter(name=name).update(refs=5)
+
+    call_command("cleanup_logos", "--dry-run")
+    assert (media_root / "logos/legacy.png").exists()
+    assert LogoFile.objects.get(name=name).refs == 5
+
+    call_command("cleanup_logos")
+
+    assert stored_files(media_root) == sorted([name, recent] + [
+        path for paths in company.thumbnails.values() for path in paths.values()
+    ])
+    assert LogoFile.objects.get(name=name).refs == 1
+
+
+@pytest.mark.parametrize("path, cache_control", [
+    ("logos/" + "a" * 64 + ".png", "public, max-age=31536000, immutable"),
+    ("logos/" + "a" * 64 + "_64x64.webp", "public, max-age=31536000, immutable"),
+    ("logos/acme.png", "public, max-age=3600"),
+])
+def test_serve_media_cache_control(media_root, path, cache_control):
+    (media_root / path).parent.mkdir(parents=True, exist_ok=True)
+    (media_root / path).write_bytes(b"image")
+
+    response = serve_media(RequestFactory().get(f"/media/{path}"), path, document_root=str(media_root))
+
+    assert response.status_code == 200
+    assert response["Cache-Control"] == cache_control
@@ -0,0 +1,100 @@
+import hashlib
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from companies.images import wait_for_thumbnails, generate_thumbnails
+
+
+def image_file(name="logo.png", size=(800, 400), image_format="PNG", mode="RGBA"):
+    content = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 255)[:len(mode)]).save(content, image_format)
+    return SimpleUploadedFile(name, content.getvalue())
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+def test_upload_logo_creates_thumbnails(client, company, media_root):
+    upload = image_file()
+    digest = hashlib.sha256(upload.read()).hexdigest()
+    upload.seek(0)
+    stem = f"logos/{digest[:2]}/{digest}"
+
+    response = client.post(f"/company/{company.pk}/image/", {"logo": upload})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["logo"] == f"/media/{stem}.png"
+    assert data["thumbnails"] == {
+        "small": {"webp": f"/media/{stem}_64x64.webp", "jpeg": f"/media/{stem}_64x64.jpeg"},
+        "medium": {"webp": f"/media/{stem}_256x256.webp", "jpeg": f"/media/{stem}_256x256.jpeg"},
+    }
+
+    wait_for_thumbnails(timeout=10)
+    company.refresh_from_db()
+    assert company.thumbnails["small"]["webp"] == f"{stem}_64x64.webp"
+    with Image.open(media_root / f"{stem}_256x256.jpeg") as thumbnail:
+        assert (thumbnail.format, thumbnail.size) == ("JPEG", (256, 256))
+    with Image.open(media_root / f"{stem}_64x64.webp") as thumbnail:
+        assert (thumbnail.format, thumbnail.size) == ("WEBP", (64, 64))
+
+
+@pytest.mark.django_db
+def test_upload_too_large(client, company, settings):
+    settings.COMPANY_LOGO = {"MAX_UPLOAD_SIZE": 1024}
+
+    response = client.post(f"/company/{company.pk}/image/", {"logo": image_file(size=(2000, 2000), mode="RGB",
+                                                                              image_format="BMP")})
+
+    assert response.status_code == 413
+    company.refresh_from_db()
+    assert not company.logo
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("upload, error", [
+    (SimpleUploadedFile("logo.png", b"not an image"), "Upload a valid image."),
+    (image_file("logo.bmp", image_format="BMP", mode="RGB"), "Unsupported image format BMP."),
+    (image_file(size=(5000, 5000), mode="L"), "Image is too large: 5000x5000."),
+])
+def test_upload_invalid_image(client, company, settings, upload, error):
+    settings.COMPANY_LOGO = {"MAX_PIXELS": 1_000_000}
+
+    response = client.post(f"/company/{company.pk}/image/", {"logo": upload})
+
+    assert response.status_code == 400
+    assert response.json() == {"logo": [error]}
+
+
+@pytest.mark.django_db
+def test_upload_without_file(client, company):
+    response = client.post(f"/company/{company.pk}/image/")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_upload_invalid_content_length(client, company, content_length):
+    response = client.post(f"/company/{company.pk}/image/", {"logo": image_file()}, CONTENT_LENGTH=content_length)
+
+    assert response.status_code == 400
+    assert "logo" in response.json()
+
+
+def test_generate_thumbnails_from_jpeg(settings, media_root):
+    (media_root / "logos").mkdir()
+    Image.new("RGB", (3000, 2000), "blue").save(media_root / "logos/photo.jpg", "JPEG")
+
+    names = generate_thumbnails("logos/photo.jpg")
+
+    assert names["small"]["jpeg"] == "logos/photo_64x64.jpeg"
+    with Image.open(media_root / names["medium"]["webp"]) as thumbnail:
+        assert thumbnail.size == (256, 256)
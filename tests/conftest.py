@@ -1,8 +1,10 @@
 from pytest_factoryboy import register
 
-from tests.factories import VacancyFactory, UserFactory
+from tests.factories import VacancyFactory, UserFactory, SkillFactory, CompanyFactory
 
 pytest_plugins = "tests.fixtures"
 
 register(VacancyFactory)
 register(UserFactory)
+register(SkillFactory)
+register(CompanyFactory)
@@ -0,0 +1,189 @@
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections
+from django.test import AsyncClient
+from rest_framework.authtoken.models import Token
+
+from authentication.models import User
+from djangoProject.db_router import ReplicaRouter, use_replica, view_name, replica_cache
+from tests.factories import VacancyFactory
+from vacancies import async_views, views
+from vacancies.models import Vacancy
+
+
+@pytest.fixture(scope="module")
+def replica_db(tmp_path_factory, django_db_setup, django_db_blocker):
+    """Вторая SQLite база в роли реплики: та же схема, свои данные"""
+    databases = {
+        "default": connections.settings["default"],
+        "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path_factory.mktemp("db") / "replica.sqlite3")},
+    }
+    connections.settings["replica"] = connections.configure_settings(databases)["replica"]
+    with django_db_blocker.unblock():
+        call_command("migrate", database="replica", verbosity=0)
+    yield "replica"
+
+    with django_db_blocker.unblock():
+        connections["replica"].close()
+    del connections.settings["replica"]
+    delattr(connections._connections, "replica")
+
+
+@pytest.fixture
+def replicas(settings, replica_db):
+    settings.DATABASE_REPLICAS = {
+        **settings.DATABASE_REPLICAS, "ALIASES": [replica_db], "STICKY_SECONDS": 5, "CACHE_ALIAS": "state",
+    }
+    settings.VACANCY_CACHE = {"ENABLED": False}
+
+
+@pytest.mark.parametrize("view, method, name", [
+    (views.VacancyListView.as_view(), "GET", "VacancyListView"),
+    (views.SkillsViewSet.as_view({"get": "list", "post": "create"}), "GET", "SkillsViewSet.list"),
+    (views.SkillsViewSet.as_view({"get": "retrieve"}), "GET", "SkillsViewSet.retrieve"),
+    (views.user_vacancies, "GET", "user_vacancies"),
+    (async_views.vacancy_list, "GET", "vacancy_list"),
+])
+def test_view_name(view, method, name):
+    assert view_name(view, method) == name
+
+
+def test_router(settings):
+    router = ReplicaRouter()
+    settings.DATABASE_REPLICAS = {"ALIASES": ["replica1", "replica2"]}
+
+    assert router.db_for_read(Vacancy) is None
+    with use_replica():
+        assert router.db_for_read(Vacancy) in ["replica1", "replica2"]
+        assert router.db_for_write(Vacancy) == "default"
+
+    settings.DATABASE_REPLICAS = {"ALIASES": []}
+    with use_replica():
+        assert router.db_for_read(Vacancy) is None
+
+
+def test_router_reads_users_from_replica_outside_auth(settings):
+    settings.DATABASE_REPLICAS = {"ALIASES": ["replica1"]}
+
+    router = ReplicaRouter()
+    with use_replica():
+        assert router.db_for_read(User) == "replica1"
+        with use_replica(False):
+            assert router.db_for_read(User) is None
+            assert router.db_for_read(Token) is None
+
+
+def test_replicas_require_shared_cache(settings):
+    settings.DATABASE_REPLICAS = {"ALIASES": ["replica1"], "CACHE_ALIAS": "default"}
+
+    with pytest.raises(ImproperlyConfigured, match="process-local"):
+        replica_cache()
+
+
+def test_replicas_require_cache_without_eviction(settings):
+    # В 'shared' поток ответов вытесняет ключи окна после записи
+    settings.DATABASE_REPLICAS = {"ALIASES": ["replica1"], "CACHE_ALIAS": "shared"}
+
+    with pytest.raises(ImproperlyConfigured, match="MAX_ENTRIES"):
+        replica_cache()
+
+
+def list_slugs(client, **headers):
+    response = client.get("/vacancy/", **headers)
+    assert response.status_code == 200
+    return [item["slug"] for item in response.data["results"]]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_list_reads_from_replica(client, replicas, hr_token):
+    client.cookies.clear()  # логин (POST) тоже включает окно чтения из default
+    VacancyFactory.create(slug="primary")
+    Vacancy.objects.using("replica").create(slug="replica", text="text")
+
+    assert list_slugs(client) == ["replica"]
+
+    # view не из DATABASE_REPLICAS читают из default
+    response = client.get("/vacancy/export/", HTTP_AUTHORIZATION="Token " + hr_token)
+    assert b'"slug":"primary"' in b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_auth_from_primary_by_user_from_replica(client, replicas, hr_token, settings):
+    settings.AUTH_TOKEN_CACHE = {**settings.AUTH_TOKEN_CACHE, "ENABLED": False}
+    client.cookies.clear()
+    vacancy = Vacancy.objects.using("replica").create(slug="replica", text="text")
+    User.objects.using("replica").create(username="replica_user")
+
+    # Токен и пользователь есть только в default
+    detail = client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)
+    by_user = client.get("/vacancy/by_user/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert detail.status_code == 200
+    assert [item["name"] for item in json.loads(by_user.content)["items"]] == ["replica_user"]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_sticks_to_primary_after_write(client, replicas):
+    VacancyFactory.create(slug="primary")
+    Vacancy.objects.using("replica").create(slug="replica", text="text")
+
+    response = client.put("/vacancy/like/", "[]", content_type="application/json")
+    assert response.status_code == 200
+    assert "db_primary_until" in response.cookies
+
+    assert list_slugs(client) == ["primary"]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_sticks_to_primary_by_token(client, replicas, hr_token):
+    VacancyFactory.create(slug="primary")
+    Vacancy.objects.using("replica").create(slug="replica", text="text")
+    auth = {"HTTP_AUTHORIZATION": "Token " + hr_token}
+
+    client.put("/vacancy/like/", "[]", content_type="application/json", **auth)
+    client.cookies.clear()
+
+    assert list_slugs(client, **auth) == ["primary"]
+    assert list_slugs(client) == ["replica"]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_sticky_window_expires(client, replicas, settings):
+    settings.DATABASE_REPLICAS = {**settings.DATABASE_REPLICAS, "STICKY_SECONDS": 0}
+    Vacancy.objects.using("replica").create(slug="replica", text="text")
+
+    client.put("/vacancy/like/", "[]", content_type="application/json")
+
+    assert list_slugs(client) == ["replica"]
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+def test_stale_replica_response_is_not_cached(client, replicas, settings):
+    settings.VACANCY_CACHE = {"ENABLED": True}
+    Vacancy.objects.using("replica").create(slug="replica", text="text")
+    other = type(client)()
+
+    other.put("/vacancy/like/", "[]", content_type="application/json")
+
+    assert client.get("/vacancy/")["X-Cache"] == "MISS"
+    assert client.get("/vacancy/")["X-Cache"] == "MISS"
+
+
+@pytest.mark.django_db(databases=["default", "replica"], transaction=True)
+def test_async_middleware_chain(replicas, settings, caplog):
+    settings.DEBUG = True  # сообщения об адаптации middleware пишутся только с DEBUG
+    VacancyFactory.create(slug="primary")
+    Vacancy.objects.using("replica").create(slug="replica", text="text")
+
+    with caplog.at_level(logging.DEBUG, logger="django.request"):
+        response = async_to_sync(AsyncClient().get)("/vacancy/")
+
+    assert response.status_code == 200
+    assert [item["slug"] for item in response.json()["results"]] == ["replica"]
+    # Под ASGI middleware не переводится в sync режим
+    assert "ReplicaMiddleware" not in caplog.text
@@ -1,17 +1,26 @@
 import factory.django
 
 from authentication.models import User
-from vacancies.models import Vacancy
+from companies.models import Company
+from vacancies.models import Vacancy, Skill
 
 
 class UserFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = User
 
-    username = factory.Faker("name")
+    # Faker("name") иногда повторяется, а username уникален
+    username = factory.Sequence(lambda n: f"user{n}")
     password = "123qwe"
 
 
+class SkillFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Skill
+
+    name = factory.Sequence(lambda n: f"skill{n}")
+
+
 class VacancyFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = Vacancy
@@ -19,3 +28,16 @@ class VacancyFactory(factory.django.DjangoModelFactory):
     slug = "test"
     text = "test text"
     user = factory.SubFactory(UserFactory)
+
+    @factory.post_generation
+    def skills(self, create, extracted, **kwargs):
+        # VacancyFactory(skills=[skill1, skill2])
+        if create and extracted:
+            self.skills.add(*extracted)
+
+
+class CompanyFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Company
+
+    name = factory.Sequence(lambda n: f"company{n}")
@@ -1,4 +1,15 @@
 import pytest
+from django.core.cache import cache, caches
+
+from authentication.cached_auth import token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():# Кэш общий для всех тестов, чистим его перед каждым
+    cache.clear()
+    caches["shared"].clear()
+    caches["state"].clear()
+    token_cache.local.clear()
 
 
 @pytest.fixture
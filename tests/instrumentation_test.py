@@ -0,0 +1,121 @@
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from djangoProject.instrumentation import percentile, request_stats, reset_request_stats
+
+
+@pytest.fixture(autouse=True)
+def instrumentation(settings):
+    settings.INSTRUMENTATION = {"FLUSH_INTERVAL": 0, "CACHE_ALIAS": "shared"}
+    reset_request_stats()
+
+
+def timings(response):
+    return {
+        part.split(";")[0]: part for part in (item.strip() for item in response["Server-Timing"].split(","))
+    }
+
+
+@pytest.mark.django_db
+def test_server_timing_header(client, vacancy, settings):
+    settings.VACANCY_CACHE = {"ENABLED": False}
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/vacancy/")
+
+    parts = timings(response)
+    assert set(parts) == {"db", "serialize", "view", "total"}
+    assert parts["db"].endswith(f'desc="{len(queries)} queries"')
+
+
+@pytest.mark.django_db
+def test_slow_request_logged_with_slowest_sql(client, vacancy, settings, caplog):
+    # У логгера propagate = False, caplog слушает корневой
+    logger = logging.getLogger("djangoProject.instrumentation")
+    logger.addHandler(caplog.handler)
+    settings.INSTRUMENTATION = {"MAX_QUERIES": 1, "SLOWEST_SQL": 2, "FLUSH_INTERVAL": 0, "CACHE_ALIAS": "shared"}
+    settings.VACANCY_CACHE = {"ENABLED": False}
+
+    with caplog.at_level(logging.INFO, logger="djangoProject.instrumentation"):
+        client.get("/vacancy/")
+        client.get("/hello/")
+
+    logger.removeHandler(caplog.handler)
+    flagged, regular = [json.loads(record.message) for record in caplog.records]
+    assert caplog.records[0].levelno == logging.WARNING
+    assert flagged["route"] == "GET /vacancy/"
+    assert flagged["flags"] == ["too_many_queries"]
+    assert len(flagged["slowest_sql"]) == 2 and "SELECT" in flagged["slowest_sql"][0]["sql"]
+    assert caplog.records[1].levelno == logging.INFO
+    assert regular["queries"] == 0 and "slowest_sql" not in regular
+
+
+@pytest.mark.django_db
+def test_route_percentiles(client, vacancy, capsys):
+    for _ in range(3):
+        client.get(f"/vacancy/{vacancy.pk}/")
+    client.get("/vacancy/")
+
+    stats = request_stats()
+    assert stats["GET /vacancy/<int:pk>/"]["count"] == 3
+    assert stats["GET /vacancy/"]["count"] == 1
+    assert stats["GET /vacancy/"]["p50"] <= stats["GET /vacancy/"]["p99"]
+
+    call_command("request_stats", "--reset")
+    assert "GET /vacancy/<int:pk>/" in capsys.readouterr().out
+    assert request_stats() == {}
+
+
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+    assert percentile([7], 99) == 7
+
+
+def test_request_stats_requires_shared_cache(settings):
+    settings.INSTRUMENTATION = {"CACHE_ALIAS": "default"}
+
+    with pytest.raises(CommandError, match="process-local"):
+        call_command("request_stats")
+
+
+@pytest.mark.django_db
+def test_streaming_response_queries_counted(client, vacancy, hr_token, caplog):
+    logger = logging.getLogger("djangoProject.instrumentation")
+    logger.addHandler(caplog.handler)
+
+    with caplog.at_level(logging.INFO, logger="djangoProject.instrumentation"):
+        response = client.get("/vacancy/export/", HTTP_AUTHORIZATION="Token " + hr_token)
+        # До отдачи тела отчета еще нет, в заголовке отмечено, что тело не учтено
+        assert not caplog.records
+        with CaptureQueriesContext(connection) as queries:
+            b"".join(response.streaming_content)
+
+    logger.removeHandler(caplog.handler)
+    record = json.loads(caplog.records[0].message)
+    assert 'body;desc="streamed, not included"' in response["Server-Timing"]
+    assert record["streamed"] is True
+    assert len(queries) > 0 and record["queries"] >= len(queries)
+    assert request_stats()["GET /vacancy/export/"]["count"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_middleware_chain(vacancy, settings, caplog):
+    settings.DEBUG = True  # сообщения об адаптации middleware пишутся только с DEBUG
+    settings.VACANCY_CACHE = {"ENABLED": False}
+
+    with caplog.at_level(logging.DEBUG, logger="django.request"):
+        response = async_to_sync(AsyncClient().get)("/vacancy/")
+
+    assert response.status_code == 200
+    # Запросы sync view выполняются в потоке sync_to_async и все равно учитываются
+    assert not timings(response)["db"].endswith('desc="0 queries"')
+    assert "InstrumentationMiddleware" not in caplog.text
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.async_auth import aauthenticate
+from authentication import jwt
+from authentication.jwt import RoleTokenUser
+from authentication.models import User
+from vacancies.cache import vacancy_cache
+
+VACANCY = {"slug": "new", "text": "new", "status": "draft"}
+
+
+@pytest.fixture
+def hr_jwt(client, django_user_model):
+    django_user_model.objects.create_user(username="hr", password="123qwe", role=User.HR)
+    response = client.post("/user/token/", {"username": "hr", "password": "123qwe"})
+    return response.data
+
+
+def create_vacancy(client, access):
+    return client.post(
+        "/vacancy/create/", VACANCY, content_type="application/json", HTTP_AUTHORIZATION="Bearer " + access,
+    )
+
+
+@pytest.mark.django_db
+def test_access_token_has_role_claims(hr_jwt):
+    token = AccessToken(hr_jwt["access"])
+
+    assert (token["username"], token["role"]) == ("hr", User.HR)
+
+
+@pytest.mark.django_db
+def test_permission_check_without_user_query(client, hr_jwt):
+    # Пользователь для VacancyCreatePermission строится из claims, запросы только для записи вакансии
+    with CaptureQueriesContext(connection) as queries:
+        response = create_vacancy(client, hr_jwt["access"])
+
+    assert response.status_code == 201
+    assert not [query for query in queries.captured_queries if "authentication_user" in query["sql"]]
+    assert isinstance(response.wsgi_request.user, RoleTokenUser)
+
+
+@pytest.mark.django_db
+def test_role_change_revokes_access_token(client, hr_jwt):
+    user = User.objects.get(username="hr")
+    user.role = User.EMPLOYEE
+    user.save()
+
+    assert create_vacancy(client, hr_jwt["access"]).status_code == 401
+
+    response = client.post("/user/token/refresh/", {"refresh": hr_jwt["refresh"]})
+    assert response.status_code == 200
+    assert AccessToken(response.data["access"])["role"] == User.EMPLOYEE
+    assert create_vacancy(client, response.data["access"]).status_code == 403
+
+
+@pytest.mark.django_db
+def test_revocation_survives_full_response_cache(client, hr_jwt):
+    user = User.objects.get(username="hr")
+    user.role = User.EMPLOYEE
+    user.save()
+
+    # Больше MAX_ENTRIES кэша 'shared': он удаляет часть ключей, отметки отзыва в 'state' остаются
+    cache = vacancy_cache()
+    for page in range(400):
+        cache.set(f"vacancy_cache:test:{page}", {"page": page}, 300)
+
+    assert create_vacancy(client, hr_jwt["access"]).status_code == 401
+
+
+@pytest.mark.django_db
+def test_revocation_rejects_culling_cache(client, hr_jwt, settings):
+    settings.JWT_REVOCATION = {**settings.JWT_REVOCATION, "CACHE_ALIAS": "shared"}
+
+    with pytest.raises(ImproperlyConfigured, match="MAX_ENTRIES"):
+        create_vacancy(client, hr_jwt["access"])
+
+
+@pytest.mark.django_db
+def test_refresh_rejected_for_inactive_user(client, hr_jwt):
+    User.objects.filter(username="hr").update(is_active=False)
+
+    response = client.post("/user/token/refresh/", {"refresh": hr_jwt["refresh"]})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_token_without_claims_loads_user(client, hr_jwt):
+    user = User.objects.get(username="hr")
+    access = str(AccessToken.for_user(user))
+
+    response = create_vacancy(client, access)
+
+    assert response.status_code == 201
+    assert isinstance(response.wsgi_request.user, User)
+
+
+@pytest.mark.django_db
+def test_async_authentication_from_claims(hr_jwt, django_assert_num_queries):
+    request = RequestFactory().get("/vacancy/", HTTP_AUTHORIZATION="Bearer " + hr_jwt["access"])
+
+    with django_assert_num_queries(0):
+        user = async_to_sync(aauthenticate)(request)
+
+    assert (user.username, user.role) == ("hr", User.HR)
+
+
+@pytest.mark.django_db
+def test_async_authentication_checks_revocation_off_event_loop(hr_jwt, monkeypatch):
+    calls = []
+
+    def is_revoked(token):
+        calls.append(asyncio._get_running_loop())
+        return False
+
+    monkeypatch.setattr(jwt, "is_revoked", is_revoked)
+    request = RequestFactory().get("/vacancy/", HTTP_AUTHORIZATION="Bearer " + hr_jwt["access"])
+
+    async_to_sync(aauthenticate)(request)
+
+    assert calls == [None]
+
+
+@pytest.mark.django_db
+def test_logout_with_jwt(client, hr_jwt):
+    Token.objects.create(user=User.objects.get(username="hr"))
+
+    response = client.post("/user/logout/", HTTP_AUTHORIZATION="Bearer " + hr_jwt["access"])
+
+    assert response.status_code == 200
+    assert not Token.objects.exists()
+    # Выпущенный access токен больше не принимается
+    assert create_vacancy(client, hr_jwt["access"]).status_code == 401
+
+
+@pytest.mark.django_db
+def test_admin_permissions_from_claims(client, django_user_model):
+    django_user_model.objects.create_user(username="admin", password="123qwe", is_staff=True)
+    access = client.post("/user/token/", {"username": "admin", "password": "123qwe"}).data["access"]
+
+    response = client.post(
+        "/user/bulk_create/", [{"username": "new", "password": "123qwe"}],
+        content_type="application/json", HTTP_AUTHORIZATION="Bearer " + access,
+    )
+
+    assert (AccessToken(access)["is_staff"], AccessToken(access)["is_superuser"]) == (True, False)
+    assert response.status_code == 201
+    assert isinstance(response.wsgi_request.user, RoleTokenUser)
@@ -0,0 +1,73 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from djangoProject.renderers import ORJSONRenderer, ORJSONParser, dumps
+
+pytest.importorskip("orjson")
+
+
+@pytest.mark.parametrize("data", [
+    {"id": 1, "text": "вакансия", "likes": 0, "skills": ["python", "django"]},
+    {"date": datetime.date(2022, 10, 1), "time": datetime.time(12, 30, 15, 500)},
+    {"created": datetime.datetime(2022, 10, 1, 12, 30, 15, 123456)},
+    {"created": datetime.datetime(2022, 10, 1, 12, 30, tzinfo=datetime.timezone.utc)},
+    {"created": timezone.make_aware(datetime.datetime(2022, 10, 1, 12, 30),
+                                    datetime.timezone(datetime.timedelta(hours=3)))},
+    {"duration": datetime.timedelta(days=1, seconds=5)},
+    {"salary": decimal.Decimal("1500.50"), "uuid": uuid.UUID("12345678123456781234567812345678")},
+    {"title": gettext_lazy("Vacancy")},
+    {"text": "строка с разделителями "},
+    ReturnDict({"id": 1, "nested": ReturnList([1, 2], serializer=None)}, serializer=None),
+    [{"id": 1}, {"id": 2, "user": None, "active": True, "ratio": 0.5}],
+    {1: "a", 2: "b"},
+    {},
+    [],
+])
+def test_renderer_output_matches_drf(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert dumps(data) == JSONRenderer().render(data)
+
+
+def test_renderer_none():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_renderer_indent_falls_back_to_drf():
+    data = {"id": 1, "skills": ["python"]}
+
+    assert ORJSONRenderer().render(data, "application/json; indent=4") == \
+           JSONRenderer().render(data, "application/json; indent=4")
+
+
+@pytest.mark.parametrize("body", [
+    b'{"slug": "python", "skills": ["python", "django"], "likes": 1}',
+    b'[1, 2, 3]',
+    '{"text": "вакансия"}'.encode(),
+])
+def test_parser_output_matches_drf(body):
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"likes": NaN}'])
+def test_parser_errors(body):
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db
+def test_function_view_renders_json(client):
+    response = client.put("/vacancy/like/", "[]", content_type="application/json")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert response.json() == {"items": [], "not_found": []}
@@ -0,0 +1,146 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+from authentication.bulk import hash_passwords, shared_pool
+from authentication.models import User
+from vacancies.models import UserVacancyStats
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher(settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@pytest.fixture
+def admin_client(client, django_user_model):
+    admin = django_user_model.objects.create_user(username="admin", password="123qwe", is_staff=True)
+    client.defaults["HTTP_AUTHORIZATION"] = "Token " + Token.objects.create(user=admin).key
+    return client
+
+
+@pytest.mark.django_db
+def test_create_user_single_insert(client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post("/user/create/", {"username": "new", "password": "secret123"})
+
+    assert response.status_code == 201
+    writes = [
+        query["sql"].split()[0] for query in queries.captured_queries
+        if '"authentication_user"' in query["sql"] and not query["sql"].startswith("SELECT")
+    ]
+    assert writes == ["INSERT"]
+    assert User.objects.get(username="new").check_password("secret123")
+
+
+@pytest.mark.django_db
+def test_create_user_ignores_vacancy_count(client):
+    response = client.post("/user/create/", {"username": "new", "password": "secret123", "vacancy_count": 100})
+
+    assert response.status_code == 201
+    assert User.objects.get(username="new").vacancy_count == 0
+    assert UserVacancyStats.current().vacancies == 0
+
+
+def test_hash_passwords_in_pool():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        hashes = hash_passwords(["a", None, "b"], pool)
+
+    assert hashes[0].startswith("md5$") and hashes[2].startswith("md5$")
+    assert hashes[1].startswith("!")
+    assert hash_passwords(["a"]) != hashes[:1]  # разная соль
+
+
+@pytest.mark.django_db
+def test_bulk_create_users(admin_client, settings, django_user_model):
+    settings.USER_IMPORT = {"WORKERS": 0}
+    django_user_model.objects.create_user(username="taken")
+
+    response = admin_client.post("/user/bulk_create/", [
+        {"username": "u1", "password": "p1", "role": "hr"},
+        {"username": "taken", "password": "p2"},
+        {"username": "u2", "password": "p3", "email": "u2@example.com"},
+        {"username": "u2", "password": "p4"},
+        {"username": "bad name!", "password": "p5"},
+    ], content_type="application/json")
+
+    assert response.status_code == 201
+    assert [item["username"] for item in response.data["created"]] == ["u1", "u2"]
+    assert [item["index"] for item in response.data["errors"]] == [1, 3, 4]
+    assert User.objects.get(username="u1").check_password("p1")
+    assert User.objects.get(username="u1").role == User.HR
+    assert UserVacancyStats.current().users == User.objects.count()
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_with_admin_jwt(client, django_user_model):
+    django_user_model.objects.create_user(username="admin", password="123qwe", is_staff=True)
+    access = client.post("/user/token/", {"username": "admin", "password": "123qwe"}).data["access"]
+
+    response = client.post(
+        "/user/bulk_create/", [{"username": "u1", "password": "p1"}],
+        content_type="application/json", HTTP_AUTHORIZATION="Bearer " + access,
+    )
+
+    assert response.status_code == 201
+    assert User.objects.get(username="u1").check_password("p1")
+
+
+def test_http_pool_is_bounded():
+    assert shared_pool()._max_workers == 2
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_max_items(admin_client, settings):
+    settings.USER_IMPORT = {"WORKERS": 0, "MAX_ITEMS": 1}
+
+    response = admin_client.post("/user/bulk_create/", [
+        {"username": "u1", "password": "p1"}, {"username": "u2", "password": "p2"},
+    ], content_type="application/json")
+
+    assert response.status_code == 400
+    assert not User.objects.filter(username__in=["u1", "u2"]).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_admin_only(client, hr_token):
+    response = client.post(
+        "/user/bulk_create/", [{"username": "u1", "password": "p1"}],
+        content_type="application/json", HTTP_AUTHORIZATION="Token " + hr_token,
+    )
+
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [0, 2])
+def test_import_users_command(tmp_path, capsys, workers):
+    path = tmp_path / "users.csv"
+    path.write_text("username,password,role\n" + "".join(f"user{n},pass{n},employee\n" for n in range(5)))
+
+    call_command("import_users", str(path), "--batch-size", "2", "--workers", str(workers))
+
+    assert "Created 5 users (0 skipped)" in capsys.readouterr().out
+    assert User.objects.get(username="user4").check_password("pass4")
+
+
+@pytest.mark.django_db
+def test_import_users_invalid_row(tmp_path, capsys):
+    path = tmp_path / "users.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in [
+        {"username": "user1", "password": "pass1"},
+        {"username": "user2"},
+        {"username": "user3", "password": "pass3"},
+    ]))
+
+    with pytest.raises(CommandError, match="Invalid row 2"):
+        call_command("import_users", str(path), "--workers", "0")
+
+    call_command("import_users", str(path), "--workers", "0", "--skip-invalid")
+    assert "Created 2 users (1 skipped)" in capsys.readouterr().out
+    assert set(User.objects.values_list("username", flat=True)) == {"user1", "user3"}
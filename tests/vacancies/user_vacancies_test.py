@@ -0,0 +1,103 @@
+import pytest
+from django.core.management import call_command
+
+from authentication.models import User
+from tests.factories import VacancyFactory, UserFactory
+from vacancies.models import Vacancy, UserVacancyStats
+
+
+def by_user(client, token):
+    response = client.get("/vacancy/by_user/", HTTP_AUTHORIZATION="Token " + token)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.django_db
+def test_user_vacancies_counters(client, hr_token):
+    first, second = UserFactory.create_batch(2)
+    VacancyFactory.create_batch(3, user=first)
+    VacancyFactory.create(user=second)
+
+    data = by_user(client, hr_token)
+
+    counts = {item["id"]: item["vacancies"] for item in data["items"]}
+    assert counts[first.pk] == 3
+    assert counts[second.pk] == 1
+    assert data["total"] == 3
+    assert data["count_strategy"] == "counter"
+    assert data["avg"] == pytest.approx(4 / 3)
+
+
+@pytest.mark.django_db
+def test_user_vacancies_counters_on_reassign_and_delete(user):
+    other = UserFactory.create()
+    vacancy = VacancyFactory.create(user=user)
+    VacancyFactory.create(user=user)
+
+    vacancy = Vacancy.objects.get(pk=vacancy.pk)
+    vacancy.user = other
+    vacancy.save()
+    Vacancy.objects.filter(user=user).delete()
+
+    assert User.objects.get(pk=user.pk).vacancy_count == 0
+    assert User.objects.get(pk=other.pk).vacancy_count == 1
+    assert UserVacancyStats.current().vacancies == 1
+
+
+@pytest.mark.django_db
+def test_user_vacancies_counters_on_bulk_create(client, hr_token, user):
+    client.post(
+        "/vacancy/bulk_create/",
+        [{"slug": f"v{i}", "text": "text", "user": user.pk} for i in range(5)],
+        content_type="application/json",
+        HTTP_AUTHORIZATION="Token " + hr_token
+    )
+
+    assert User.objects.get(pk=user.pk).vacancy_count == 5
+    assert UserVacancyStats.current().vacancies == 5
+
+
+@pytest.mark.django_db
+def test_user_vacancies_queries(client, hr_token, django_assert_num_queries):
+    VacancyFactory.create_batch(15)
+
+    # Токен, строка статистики, страница пользователей
+    with django_assert_num_queries(3):
+        by_user(client, hr_token)
+
+
+@pytest.mark.django_db
+def test_recount_vacancies_command(user):
+    VacancyFactory.create_batch(2, user=user)
+    User.objects.update(vacancy_count=100)
+    UserVacancyStats.objects.update(users=0, vacancies=0)
+
+    call_command("recount_vacancies")
+
+    assert User.objects.get(pk=user.pk).vacancy_count == 2
+    assert UserVacancyStats.current().users == User.objects.count()
+    assert UserVacancyStats.current().vacancies == 2
+
+
+@pytest.mark.django_db
+def test_vacancy_delete_with_drifted_counter(client, hr_token, user):
+    vacancy = VacancyFactory.create(user=user)
+    # update() минует Vacancy.save, счетчики не меняются
+    Vacancy.objects.filter(pk=vacancy.pk).update(user=UserFactory.create())
+
+    response = client.delete(f"/vacancy/{vacancy.pk}/delete/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.status_code == 204
+    assert User.objects.get(pk=user.pk).vacancy_count == 1
+
+
+@pytest.mark.django_db
+def test_user_vacancy_stats_shards(settings, user):
+    settings.VACANCY_COUNTERS = {"SHARDS": 4}
+    VacancyFactory.create_batch(10, user=user)
+    Vacancy.objects.filter(pk__in=Vacancy.objects.values("pk")[:3]).delete()
+
+    # Записи расходятся по строкам, итог - их сумма
+    assert UserVacancyStats.objects.exclude(vacancies=0).count() > 1
+    assert UserVacancyStats.current().vacancies == 7
+    assert UserVacancyStats.current().users == User.objects.count()
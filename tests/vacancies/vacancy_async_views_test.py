@@ -0,0 +1,172 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+
+from tests.factories import VacancyFactory, SkillFactory
+from vacancies import async_views, serializers
+from vacancies.async_views import route
+from vacancies.cache import VERSION_KEY, get_version, vacancy_cache
+
+
+def call_async(view, path, **kwargs):
+    request = RequestFactory().get(path, **{key: value for key, value in kwargs.items() if key.isupper()})
+    return async_to_sync(view)(request, **{key: value for key, value in kwargs.items() if not key.isupper()})
+
+
+@pytest.fixture
+def vacancies():
+    skills = [SkillFactory.create(name=name) for name in ["python", "django", "java"]]
+    VacancyFactory.create_batch(8, skills=skills[:2], text="python developer")
+    VacancyFactory.create_batch(5, skills=[skills[2]], text="java developer", user=None)
+    return skills
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", [
+    "/vacancy/",
+    "/vacancy/?page=2",
+    "/vacancy/?page=last",
+    "/vacancy/?text=python&ordering=rank",
+    "/vacancy/?skill=django&skill=python&skill_mode=all",
+])
+def test_async_vacancy_list_matches_sync(client, vacancies, path):
+    expected = client.get(path)
+    # Сбрасываем закэшированный ответ, но не версию: от нее зависит ETag
+    version = get_version()
+    vacancy_cache().clear()
+    vacancy_cache().set(VERSION_KEY, version, None)
+
+    response = call_async(async_views.vacancy_list, path)
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+    assert response["ETag"] == expected["ETag"]
+    assert response["X-Cache"] == "MISS"
+    assert call_async(async_views.vacancy_list, path)["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_async_vacancy_list_invalid_page(vacancies):
+    response = call_async(async_views.vacancy_list, "/vacancy/?page=100")
+
+    assert response.status_code == 404
+    assert json.loads(response.content) == {"detail": "Invalid page."}
+
+
+@pytest.mark.django_db
+def test_async_vacancy_list_not_modified(vacancies):
+    etag = call_async(async_views.vacancy_list, "/vacancy/")["ETag"]
+
+    response = call_async(async_views.vacancy_list, "/vacancy/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_async_vacancy_list_delegates_cursor_pagination(vacancies):
+    response = call_async(async_views.vacancy_list, "/vacancy/?pagination=cursor")
+    response.render()
+
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 10 and "count" not in response.data
+
+
+@pytest.mark.django_db
+def test_async_vacancy_detail(client, vacancies, hr_token):
+    vacancy = VacancyFactory.create(skills=vacancies)
+    path = f"/vacancy/{vacancy.pk}/"
+    expected = client.get(path, HTTP_AUTHORIZATION="Token " + hr_token)
+    vacancy_cache().clear()
+
+    response = call_async(async_views.vacancy_detail, path, pk=vacancy.pk, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+    assert response["ETag"] == expected["ETag"]
+    assert response["Last-Modified"] == expected["Last-Modified"]
+
+    response = call_async(async_views.vacancy_detail, path, pk=vacancy.pk,
+                          HTTP_AUTHORIZATION="Token " + hr_token, HTTP_IF_NONE_MATCH=expected["ETag"])
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_async_vacancy_detail_jwt(client, vacancies, django_user_model):
+    django_user_model.objects.create_user(username="jwt", password="123qwe")
+    access = client.post("/user/token/", {"username": "jwt", "password": "123qwe"}).data["access"]
+    vacancy = VacancyFactory.create()
+
+    response = call_async(async_views.vacancy_detail, "/", pk=vacancy.pk, HTTP_AUTHORIZATION="Bearer " + access)
+
+    assert response.status_code == 200
+    assert json.loads(response.content)["id"] == vacancy.pk
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("headers, detail", [
+    ({}, "Authentication credentials were not provided."),
+    ({"HTTP_AUTHORIZATION": "Token wrong"}, "Invalid token."),
+    ({"HTTP_AUTHORIZATION": "Token"}, "Invalid token header. No credentials provided."),
+])
+def test_async_vacancy_detail_auth_errors(client, vacancies, headers, detail):
+    vacancy = VacancyFactory.create()
+    expected = client.get(f"/vacancy/{vacancy.pk}/", **headers)
+
+    response = call_async(async_views.vacancy_detail, "/", pk=vacancy.pk, **headers)
+
+    assert response.status_code == expected.status_code == 401
+    assert json.loads(response.content) == expected.json() == {"detail": detail}
+    assert response["WWW-Authenticate"] == expected["WWW-Authenticate"]
+
+
+@pytest.mark.django_db
+def test_async_vacancy_detail_reads_like_buffer_off_event_loop(hr_token, monkeypatch):
+    calls = []
+
+    def pending_likes(ids):
+        calls.append(asyncio._get_running_loop())
+        return {}
+
+    monkeypatch.setattr(serializers, "pending_likes", pending_likes)
+    vacancy = VacancyFactory.create()
+
+    response = call_async(async_views.vacancy_detail, "/", pk=vacancy.pk, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.status_code == 200
+    assert calls == [None]
+
+
+@pytest.mark.django_db
+def test_async_vacancy_detail_not_found(hr_token):
+    response = call_async(async_views.vacancy_detail, "/", pk=100500, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["/skill/", "/skill/?page=2"])
+def test_async_skill_list_matches_sync(client, path):
+    SkillFactory.create_batch(15)
+    expected = client.get(path)
+
+    response = call_async(async_views.skill_list, path)
+
+    assert response.status_code == 200
+    assert response.content == expected.content
+
+
+@pytest.mark.django_db
+def test_async_vacancy_list_queries(vacancies, django_assert_num_queries):
+    # COUNT, страница, навыки страницы
+    with django_assert_num_queries(3):
+        call_async(async_views.vacancy_list, "/vacancy/")
+
+
+def test_route(settings):
+    settings.ASYNC_VIEWS = {"vacancy_list": True}
+
+    assert route("vacancy_list", "sync", "async") == "async"
+    assert route("vacancy_detail", "sync", "async") == "sync"
@@ -0,0 +1,72 @@
+import pytest
+
+from tests.factories import VacancyFactory, SkillFactory
+from vacancies.models import Vacancy, Skill
+
+
+def bulk_create(client, token, data):
+    return client.post(
+        "/vacancy/bulk_create/",
+        data,
+        content_type="application/json",
+        HTTP_AUTHORIZATION="Token " + token
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_create_vacancies(client, hr_token):
+    SkillFactory.create(name="Python")
+    data = [
+        {"slug": f"bulk-{i}", "text": f"vacancy {i}", "skills": ["python", "SQL", "Docker"]}
+        for i in range(50)
+    ]
+
+    response = bulk_create(client, hr_token, data)
+
+    assert response.status_code == 201
+    assert len(response.data["created"]) == 50
+    assert response.data["errors"] == []
+    assert Skill.objects.count() == 3
+    vacancy = Vacancy.objects.get(slug="bulk-7")
+    assert sorted(skill.name for skill in vacancy.skills.all()) == ["Docker", "Python", "SQL"]
+
+
+@pytest.mark.django_db
+def test_bulk_create_queries_do_not_grow(client, hr_token, django_assert_max_num_queries):
+    data = [{"slug": f"bulk-{i}", "text": "text", "skills": ["a", "b", f"c{i}"]} for i in range(200)]
+
+    # Токен, проверки slug и user, навыки (поиск, вставка, дочитывание), вакансии, связи
+    with django_assert_max_num_queries(12):
+        response = bulk_create(client, hr_token, data)
+
+    assert response.status_code == 201
+    assert Vacancy.objects.count() == 200
+
+
+@pytest.mark.django_db
+def test_bulk_create_reports_item_errors(client, hr_token):
+    VacancyFactory.create(slug="taken")
+    data = [
+        {"slug": "ok", "text": "text"},
+        {"slug": "taken", "text": "text"},
+        {"slug": "ok", "text": "duplicate in batch"},
+        {"text": "no slug"},
+        {"slug": "open", "text": "text", "status": "open"},
+        {"slug": "user", "text": "text", "user": 100500},
+    ]
+
+    response = bulk_create(client, hr_token, data)
+
+    assert response.status_code == 201
+    assert [item["index"] for item in response.data["created"]] == [0]
+    assert [item["index"] for item in response.data["errors"]] == [1, 2, 3, 4, 5]
+    assert "slug" in response.data["errors"][2]["errors"]
+
+
+@pytest.mark.django_db
+def test_bulk_create_requires_hr(client, user):
+    client.force_login(user)
+
+    response = client.post("/vacancy/bulk_create/", [], content_type="application/json")
+
+    assert response.status_code in (401, 403)
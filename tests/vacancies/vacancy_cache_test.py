@@ -0,0 +1,131 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.factories import VacancyFactory
+from vacancies.cache import cache_stats
+
+
+@pytest.mark.django_db
+def test_vacancy_list_cache_hit(client, django_assert_num_queries):
+    VacancyFactory.create_batch(3)
+    first = client.get("/vacancy/?skill=b&text=test&skill=a")
+
+    with django_assert_num_queries(0):
+        second = client.get("/vacancy/?text=test&skill=a&skill=b")
+
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert second.data == first.data
+    assert cache_stats()["hits"] == 1
+    assert cache_stats()["misses"] == 1
+
+
+@pytest.mark.django_db
+def test_vacancy_list_cache_invalidated_on_create(client, hr_token):
+    client.get("/vacancy/")
+
+    client.post(
+        "/vacancy/create/",
+        {"slug": "new", "text": "new", "status": "draft"},
+        content_type="application/json",
+        HTTP_AUTHORIZATION="Token " + hr_token
+    )
+    response = client.get("/vacancy/")
+
+    assert response["X-Cache"] == "MISS"
+    assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_cache_invalidated_on_update(client, vacancy, hr_token):
+    url = f"/vacancy/{vacancy.pk}/"
+    client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    client.put(
+        f"/vacancy/{vacancy.pk}/update/",
+        {"slug": "updated", "text": "updated", "status": "open"},
+        content_type="application/json"
+    )
+    response = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response["X-Cache"] == "MISS"
+    assert response.data["slug"] == "updated"
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_cache_invalidated_on_like(client, vacancy, hr_token):
+    url = f"/vacancy/{vacancy.pk}/"
+    client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+    response = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.data["likes"] == 1
+
+
+@pytest.mark.django_db
+def test_vacancy_list_cache_invalidated_on_delete_and_model_save(client, vacancy):
+    client.get("/vacancy/")
+    client.delete(f"/vacancy/{vacancy.pk}/delete/")
+    assert client.get("/vacancy/").data["count"] == 0
+
+    # Запись через модель (как из админки) тоже сбрасывает кэш
+    VacancyFactory.create()
+    assert client.get("/vacancy/").data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_cache_requires_auth(client, vacancy, hr_token):
+    client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    response = client.get(f"/vacancy/{vacancy.pk}/")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_vacancy_cache_invalidated_on_username_change(client, hr_token, django_user_model):
+    owner = django_user_model.objects.get(username="hr")
+    VacancyFactory.create(user=owner)
+    etag = client.get("/vacancy/")["ETag"]
+
+    owner.username = "renamed"
+    owner.save()
+    listed = client.get("/vacancy/")
+
+    assert listed["X-Cache"] == "MISS"
+    assert listed.data["results"][0]["username"] == "renamed"
+    assert listed["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_vacancy_cache_kept_on_other_user_changes(client, hr_token, django_user_model):
+    client.get("/vacancy/")
+
+    owner = django_user_model.objects.get(username="hr")
+    owner.first_name = "Anna"
+    owner.save()
+
+    assert client.get("/vacancy/")["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_vacancy_cache_stats_command_requires_shared_cache(settings, capsys):
+    call_command("vacancy_cache_stats")
+    assert "hits=0" in capsys.readouterr().out
+
+    settings.VACANCY_CACHE = {**settings.VACANCY_CACHE, "CACHE_ALIAS": "default"}
+    with pytest.raises(CommandError, match="LocMemCache"):
+        call_command("vacancy_cache_stats")
+
+
+@pytest.mark.django_db
+def test_vacancy_cache_version_bumped_again_on_commit(client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        VacancyFactory.create()
+        # Ответ, закэшированный до коммита под новой версией, после коммита не читается
+        assert client.get("/vacancy/")["X-Cache"] == "MISS"
+        assert client.get("/vacancy/")["X-Cache"] == "HIT"
+
+    assert callbacks
+    assert client.get("/vacancy/")["X-Cache"] == "MISS"
@@ -0,0 +1,76 @@
+import pytest
+
+from tests.factories import VacancyFactory, SkillFactory
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_etag_not_modified(client, vacancy, hr_token, django_assert_num_queries):
+    url = f"/vacancy/{vacancy.pk}/"
+    response = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)
+    etag = response["ETag"]
+
+    # Только одна колонка modified: токен уже в кэше аутентификации, вакансия не выбирается и не сериализуется
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert etag.startswith('"') and not etag.startswith('W/')
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_if_modified_since(client, vacancy, hr_token):
+    url = f"/vacancy/{vacancy.pk}/"
+    last_modified = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)["Last-Modified"]
+
+    response = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_etag_changes_on_write(client, vacancy, hr_token):
+    url = f"/vacancy/{vacancy.pk}/"
+    etag = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token)["ETag"]
+
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+    after_like = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token, HTTP_IF_NONE_MATCH=etag)
+
+    vacancy.skills.add(SkillFactory.create())
+    after_skill = client.get(url, HTTP_AUTHORIZATION="Token " + hr_token, HTTP_IF_NONE_MATCH=after_like["ETag"])
+
+    assert after_like.status_code == 200
+    assert after_skill.status_code == 200
+    assert after_skill.data["skills"]
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_conditional_requires_auth(client, vacancy, hr_token):
+    etag = client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)["ETag"]
+
+    response = client.get(f"/vacancy/{vacancy.pk}/", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_vacancy_list_etag(client):
+    VacancyFactory.create_batch(3)
+    etag = client.get("/vacancy/?text=test")["ETag"]
+
+    assert client.get("/vacancy/?text=test", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    VacancyFactory.create()
+    assert client.get("/vacancy/?text=test", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_vacancy_list_etag_without_queries(client, django_assert_num_queries):
+    VacancyFactory.create_batch(3)
+    etag = client.get("/vacancy/?skill=b&skill=a")["ETag"]
+
+    # ETag списка - версия кэша и строка запроса, 304 отдается без обращения к БД
+    with django_assert_num_queries(0):
+        response = client.get("/vacancy/?skill=a&skill=b", HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert client.get("/vacancy/?skill=a")["ETag"] != etag
@@ -0,0 +1,49 @@
+import pytest
+
+from tests.factories import VacancyFactory
+
+
+@pytest.fixture
+def count_strategy(settings):
+    def configure(views):
+        settings.PAGINATION_COUNT = {**settings.PAGINATION_COUNT, "VIEWS": views}
+
+    return configure
+
+
+@pytest.mark.django_db
+def test_vacancy_list_cached_count(client, count_strategy, django_assert_num_queries):
+    count_strategy({"VacancyListView": "cached"})
+    VacancyFactory.create_batch(3)
+    client.get("/vacancy/")
+    VacancyFactory.create()
+
+    # Повторный запрос без COUNT(*): выборка вакансий + навыки
+    with django_assert_num_queries(2):
+        response = client.get("/vacancy/")
+
+    assert response.data["count_strategy"] == "cached"
+    assert response.data["count"] == 3
+
+
+@pytest.mark.django_db
+def test_vacancy_list_cached_count_depends_on_filters(client, count_strategy):
+    count_strategy({"VacancyListView": "cached"})
+    VacancyFactory.create_batch(2)
+    VacancyFactory.create(text="python")
+
+    assert client.get("/vacancy/").data["count"] == 3
+    assert client.get("/vacancy/?text=python").data["count"] == 1
+    assert client.get("/vacancy/?text=python&page=1").data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_vacancy_list_estimated_count_falls_back_to_exact(client, count_strategy):
+    # На SQLite оценки планировщика нет, используется точный подсчет
+    count_strategy({"VacancyListView": "estimated"})
+    VacancyFactory.create_batch(3)
+
+    response = client.get("/vacancy/")
+
+    assert response.data["count_strategy"] == "exact"
+    assert response.data["count"] == 3
@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+
+import pytest
+
+from tests.factories import VacancyFactory, SkillFactory
+from vacancies.models import Vacancy
+
+
+def collect(client, url, link="next"):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "count" not in response.data
+        pages.append([item["id"] for item in response.data["results"]])
+        url = response.data[link]
+    return pages
+
+
+@pytest.fixture
+def vacancies():
+    created = VacancyFactory.create_batch(25)
+    # Несколько дат с одинаковыми значениями, порядок внутри даты задает id
+    for i, vacancy in enumerate(created):
+        Vacancy.objects.filter(pk=vacancy.pk).update(created=date.today() - timedelta(days=i % 3))
+    return Vacancy.objects.order_by("-created", "-id")
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_pages(client, vacancies):
+    pages = collect(client, "/vacancy/?pagination=cursor")
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == [vacancy.pk for vacancy in vacancies]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_previous(client, vacancies):
+    last_page_url = client.get(client.get("/vacancy/?pagination=cursor").data["next"]).data["next"]
+    last_page = client.get(last_page_url).data
+
+    pages = collect(client, last_page["previous"], link="previous")
+
+    assert sum(reversed(pages), []) == [vacancy.pk for vacancy in vacancies][:20]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_with_skill_filter(client, vacancies):
+    skill = SkillFactory.create(name="python")
+    expected = list(vacancies[::2])
+    for vacancy in expected:
+        vacancy.skills.add(skill)
+
+    pages = collect(client, "/vacancy/?pagination=cursor&skill=python")
+
+    assert sum(pages, []) == [vacancy.pk for vacancy in expected]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_queries(client, vacancies, django_assert_num_queries):
+    url = client.get("/vacancy/?pagination=cursor").data["next"]
+
+    # Без COUNT: выборка страницы + навыки
+    with django_assert_num_queries(2):
+        response = client.get(url)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_invalid_cursor(client):
+    response = client.get("/vacancy/?cursor=broken")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [
+    "/vacancy/?pagination=cursor&text=python&ordering=rank",
+    "/vacancy/?cursor=broken&ordering=rank",
+])
+def test_cursor_pagination_rejects_rank_ordering(client, url):
+    response = client.get(url)
+
+    assert response.status_code == 400
+    assert response.json() == {"ordering": ["Ordering by rank is not supported with cursor pagination."]}
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+
+import pytest
+
+from tests.factories import VacancyFactory, SkillFactory
+
+
+def export(client, token, url, **extra):
+    response = client.get(url, HTTP_AUTHORIZATION="Token " + token, **extra)
+    assert response.status_code == 200
+    assert response.streaming
+    return response, b"".join(response.streaming_content).decode()
+
+
+@pytest.fixture
+def vacancies():
+    python, django = SkillFactory.create(name="python"), SkillFactory.create(name="django")
+    return [
+        VacancyFactory.create(text="python developer", skills=[python, django]),
+        VacancyFactory.create(text="java developer", skills=[]),
+        VacancyFactory.create(text="python, \"senior\"", skills=[python], user=None),
+    ]
+
+
+@pytest.mark.django_db
+def test_export_ndjson(client, hr_token, vacancies):
+    response, content = export(client, hr_token, "/vacancy/export/")
+
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == 'attachment; filename="vacancies.ndjson"'
+
+    rows = [json.loads(line) for line in content.splitlines()]
+    assert [row["id"] for row in rows] == [vacancy.pk for vacancy in vacancies]
+    assert rows[0] == {
+        "id": vacancies[0].pk,
+        "text": "python developer",
+        "slug": vacancies[0].slug,
+        "status": "draft",
+        "created": vacancies[0].created.isoformat(),
+        "username": vacancies[0].user.username,
+        "skills": ["python", "django"],
+    }
+    assert rows[2]["username"] is None
+
+
+@pytest.mark.django_db
+def test_export_csv(client, hr_token, vacancies):
+    response, content = export(client, hr_token, "/vacancy/export/?format=csv")
+
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert [int(row["id"]) for row in rows] == [vacancy.pk for vacancy in vacancies]
+    assert rows[0]["skills"] == "python;django"
+    assert rows[1]["skills"] == ""
+    assert rows[2]["text"] == "python, \"senior\""
+    assert rows[2]["username"] == ""
+
+
+@pytest.mark.django_db
+def test_export_csv_by_accept_header(client, hr_token, vacancies):
+    response, content = export(client, hr_token, "/vacancy/export/", HTTP_ACCEPT="text/csv")
+
+    assert content.splitlines()[0] == "id,text,slug,status,created,username,skills"
+
+
+@pytest.mark.django_db
+def test_export_filters(client, hr_token, vacancies):
+    _, content = export(client, hr_token, "/vacancy/export/?text=python&skill=django")
+
+    assert [json.loads(line)["id"] for line in content.splitlines()] == [vacancies[0].pk]
+
+
+@pytest.mark.django_db
+def test_export_reads_in_chunks(client, hr_token, settings, django_assert_num_queries):
+    settings.VACANCY_EXPORT = {"CHUNK_SIZE": 2}
+    VacancyFactory.create_batch(5)
+
+    # токен + вакансии одним курсором + навыки для каждой из 3 пачек
+    with django_assert_num_queries(5):
+        _, content = export(client, hr_token, "/vacancy/export/")
+
+    assert len(content.splitlines()) == 5
+
+
+@pytest.mark.django_db
+def test_export_requires_auth(client):
+    response = client.get("/vacancy/export/?format=csv")
+
+    assert response.status_code == 401
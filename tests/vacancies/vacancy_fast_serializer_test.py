@@ -0,0 +1,46 @@
+import pytest
+from django.core.cache import cache
+
+from tests.factories import VacancyFactory, SkillFactory
+
+
+def get_json(client, url, settings, fast):
+    settings.FAST_READ_SERIALIZERS = fast
+    cache.clear()  # иначе второй запрос вернет закэшированный ответ
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.content
+
+
+@pytest.fixture
+def vacancies():
+    skills = SkillFactory.create_batch(4)
+    VacancyFactory.create_batch(5, skills=skills[:2])
+    VacancyFactory.create_batch(5, skills=[skills[3], skills[1]], user=None, text="без пользователя")
+    VacancyFactory.create_batch(2, skills=skills)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", [
+    "/vacancy/",
+    "/vacancy/?page=2",
+    "/vacancy/?text=test&ordering=rank",
+    "/vacancy/?pagination=cursor",
+    "/skill/",
+])
+def test_fast_serializer_output_is_identical(client, settings, vacancies, url):
+    slow = get_json(client, url, settings, fast=False)
+    fast = get_json(client, url, settings, fast=True)
+
+    assert fast == slow
+
+
+@pytest.mark.django_db
+def test_fast_serializer_queries(client, settings, vacancies, django_assert_num_queries):
+    settings.FAST_READ_SERIALIZERS = True
+
+    # COUNT, страница через values() с пользователем, навыки одним запросом
+    with django_assert_num_queries(3):
+        response = client.get("/vacancy/")
+
+    assert response.json()["results"][0]["skills"]
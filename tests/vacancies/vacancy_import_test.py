@@ -0,0 +1,120 @@
+import datetime
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command, CommandError
+
+from authentication.models import User
+from tests.factories import UserFactory, SkillFactory
+from vacancies.importer import _copy_value, read_batches
+from vacancies.models import Vacancy, Skill, UserVacancyStats
+
+
+def write_ndjson(path, rows):
+    path.write_text("".join((row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows))
+    return str(path)
+
+
+def import_vacancies(path, *args):
+    out = StringIO()
+    call_command("import_vacancies", path, *args, stdout=out, stderr=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_vacancies(tmp_path):
+    user = UserFactory.create(username="hr")
+    SkillFactory.create(name="Python")
+    path = write_ndjson(tmp_path / "dump.ndjson", [
+        {"slug": "python-dev", "text": "python developer", "status": "open", "created": "2022-10-01",
+         "username": "hr", "skills": ["python", "Django"]},
+        {"id": 100, "slug": "java-dev", "text": "java developer", "username": None, "skills": []},
+    ])
+
+    output = import_vacancies(path, "--batch-size", "1")
+
+    assert "Imported 2 vacancies (0 skipped)" in output
+    python, java = Vacancy.objects.order_by("id")
+    assert (python.slug, python.status, python.created, python.user_id) == \
+           ("python-dev", "open", datetime.date(2022, 10, 1), user.pk)
+    assert sorted(python.skills.values_list("name", flat=True)) == ["Django", "Python"]
+    assert (java.status, java.user_id, java.created) == ("draft", None, datetime.date.today())
+    assert Skill.objects.count() == 2
+
+    user.refresh_from_db()
+    assert user.vacancy_count == 1
+    assert UserVacancyStats.current().vacancies == 1
+
+
+@pytest.mark.django_db
+def test_import_queries_do_not_grow_with_rows(tmp_path, django_assert_num_queries):
+    UserFactory.create(username="hr")
+    SkillFactory.create(name="python")
+    rows = [{"slug": f"v{i}", "text": "text", "username": "hr", "skills": ["python"]} for i in range(50)]
+    path = write_ndjson(tmp_path / "dump.ndjson", rows)
+
+    # пользователь и навык + на пачку: savepoint, вакансии, связи, счетчики, статистика, release
+    with django_assert_num_queries(2 + 6 * 2):
+        import_vacancies(path, "--batch-size", "25")
+
+    assert Vacancy.objects.count() == 50
+
+
+@pytest.mark.django_db
+def test_import_invalid_row_and_resume(tmp_path):
+    path = write_ndjson(tmp_path / "dump.ndjson", [
+        {"slug": "first", "text": "text"},
+        {"slug": "second", "text": "text"},
+        "{not json",
+        {"slug": "third", "text": "text"},
+    ])
+
+    with pytest.raises(CommandError, match=r"resume with --offset (\d+)") as error:
+        import_vacancies(path, "--batch-size", "2")
+    assert list(Vacancy.objects.values_list("slug", flat=True)) == ["first", "second"]
+
+    offset = error.value.args[0].rsplit(" ", 1)[1]
+    lines = (tmp_path / "dump.ndjson").read_text().splitlines()
+    lines[2] = json.dumps({"slug": "fixed", "text": "text"})
+    write_ndjson(tmp_path / "dump.ndjson", lines)
+
+    import_vacancies(path, "--offset", offset)
+    assert list(Vacancy.objects.order_by("id").values_list("slug", flat=True)) == \
+           ["first", "second", "fixed", "third"]
+
+
+@pytest.mark.django_db
+def test_import_skip_invalid(tmp_path):
+    path = write_ndjson(tmp_path / "dump.ndjson", [
+        {"slug": "ok", "text": "text"},
+        {"slug": "no-text"},
+        {"slug": "bad-status", "text": "text", "status": "unknown"},
+        {"slug": "no-user", "text": "text", "username": "nobody"},
+        {"slug": "bad skills", "text": "text", "skills": "python"},
+    ])
+
+    output = import_vacancies(path, "--skip-invalid")
+
+    assert "Imported 1 vacancies (4 skipped)" in output
+    assert "Unknown user 'nobody'" in output
+    assert list(Vacancy.objects.values_list("slug", flat=True)) == ["ok"]
+    assert not User.objects.exists()
+
+
+def test_read_batches_offsets(tmp_path):
+    path = tmp_path / "dump.ndjson"
+    path.write_bytes(b'{"a": 1}\n\n{"b": "\xd0\xb2"}\n{"c": 3}\n')
+
+    with open(path, "rb") as stream:
+        batches = list(read_batches(stream, 2))
+    assert batches == [([(0, b'{"a": 1}\n'), (10, b'{"b": "\xd0\xb2"}\n')], 22), ([(22, b'{"c": 3}\n')], 31)]
+
+    with open(path, "rb") as stream:
+        assert list(read_batches(stream, 2, offset=22)) == [([(22, b'{"c": 3}\n')], 31)]
+
+
+def test_copy_value():
+    assert _copy_value(None) == "\\N"
+    assert _copy_value(datetime.date(2022, 10, 1)) == "2022-10-01"
+    assert _copy_value("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
@@ -0,0 +1,154 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+
+from tests.factories import VacancyFactory
+from vacancies import likes
+from vacancies.cache import get_vacancy_version, get_version
+from vacancies.models import Vacancy
+
+
+@pytest.fixture(params=["default", None], ids=["cache", "local"])
+def like_buffer(request, settings):
+    settings.LIKE_BUFFER = {**settings.LIKE_BUFFER, "ENABLED": True, "CACHE_ALIAS": request.param, "FLUSH_INTERVAL": 0}
+    likes.get_store().drain()
+    yield
+    likes.get_store().drain()
+
+
+@pytest.mark.django_db
+def test_buffered_likes_are_merged_on_read(client, like_buffer, hr_token):
+    vacancy = VacancyFactory.create(likes=5)
+
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+    response = client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+    detail = client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.json()["items"] == [{"id": vacancy.pk, "likes": 7}]
+    assert detail.data["likes"] == 7
+    assert Vacancy.objects.get(pk=vacancy.pk).likes == 5
+
+
+@pytest.mark.django_db
+def test_flush_likes_coalesces_into_batch_update(client, like_buffer, django_assert_num_queries):
+    first, second = VacancyFactory.create_batch(2)
+    for _ in range(3):
+        client.put("/vacancy/like/", [first.pk, second.pk], content_type="application/json")
+    client.put("/vacancy/like/", [first.pk], content_type="application/json")
+
+    with django_assert_num_queries(1):
+        assert likes.flush_likes() == 2
+
+    assert Vacancy.objects.get(pk=first.pk).likes == 4
+    assert Vacancy.objects.get(pk=second.pk).likes == 3
+    assert likes.pending_likes([first.pk, second.pk]) == {first.pk: 0, second.pk: 0}
+    assert likes.flush_likes() == 0
+
+
+@pytest.mark.django_db
+def test_flush_likes_command(client, like_buffer, capsys):
+    vacancy = VacancyFactory.create()
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+
+    call_command("flush_likes")
+
+    assert "1 vacancies" in capsys.readouterr().out
+    assert Vacancy.objects.get(pk=vacancy.pk).likes == 1
+
+
+@pytest.mark.django_db
+def test_flush_likes_restores_on_failure(client, like_buffer, monkeypatch):
+    vacancy = VacancyFactory.create()
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+
+    def broken_update(*args, **kwargs):
+        raise RuntimeError("db is down")
+
+    monkeypatch.setattr("django.db.models.query.QuerySet.update", broken_update)
+    with pytest.raises(RuntimeError):
+        likes.flush_likes()
+    monkeypatch.undo()
+
+    assert likes.pending_likes([vacancy.pk]) == {vacancy.pk: 1}
+    likes.flush_likes()
+    assert Vacancy.objects.get(pk=vacancy.pk).likes == 1
+
+
+@pytest.mark.django_db
+def test_no_last_modified_while_likes_pending(client, like_buffer, hr_token):
+    vacancy = VacancyFactory.create()
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+
+    pending = client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)
+    likes.flush_likes()
+    flushed = client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert "Last-Modified" not in pending
+    assert "ETag" in pending
+    assert "Last-Modified" in flushed
+    assert flushed.data["likes"] == 1
+
+
+@pytest.mark.django_db
+def test_likes_bump_only_liked_vacancy_version(client, like_buffer):
+    liked, other = VacancyFactory.create_batch(2)
+    version = get_version()
+    liked_version, other_version = get_vacancy_version(liked.pk), get_vacancy_version(other.pk)
+
+    client.put("/vacancy/like/", [liked.pk], content_type="application/json")
+    assert get_vacancy_version(liked.pk) != liked_version
+    liked_version = get_vacancy_version(liked.pk)
+    likes.flush_likes()
+
+    assert get_version() == version
+    assert get_vacancy_version(liked.pk) != liked_version
+    assert get_vacancy_version(other.pk) == other_version
+
+
+@pytest.mark.django_db
+def test_cache_store_drains_in_chunks(client, settings, monkeypatch):
+    settings.LIKE_BUFFER = {
+        **settings.LIKE_BUFFER, "ENABLED": True, "CACHE_ALIAS": "default", "FLUSH_INTERVAL": 0, "FLUSH_BATCH_SIZE": 2,
+    }
+    vacancies = VacancyFactory.create_batch(5)
+    client.put("/vacancy/like/", [vacancy.pk for vacancy in vacancies], content_type="application/json")
+
+    store = likes.get_store()
+    requested = []
+    get_many = store.cache.get_many
+    monkeypatch.setattr(store.cache, "get_many", lambda keys: requested.append(len(keys)) or get_many(keys))
+    monkeypatch.setattr(likes, "get_store", lambda: store)
+
+    assert likes.flush_likes() == 5
+    assert requested == [2, 2, 1]
+    assert [vacancy.likes for vacancy in Vacancy.objects.order_by("pk")] == [1] * 5
+
+
+@pytest.mark.django_db
+def test_local_store_flushed_at_exit(client, settings):
+    settings.LIKE_BUFFER = {**settings.LIKE_BUFFER, "ENABLED": True, "CACHE_ALIAS": None, "FLUSH_INTERVAL": 0}
+    vacancy = VacancyFactory.create()
+    client.put("/vacancy/like/", [vacancy.pk], content_type="application/json")
+
+    likes.flush_at_exit()
+
+    assert Vacancy.objects.get(pk=vacancy.pk).likes == 1
+    assert likes.pending_likes([vacancy.pk]) == {vacancy.pk: 0}
+
+
+def test_cache_store_requires_atomic_incr(settings):
+    # FileBasedCache.incr - чтение и запись, параллельные лайки терялись бы
+    settings.LIKE_BUFFER = {**settings.LIKE_BUFFER, "ENABLED": True, "CACHE_ALIAS": "shared"}
+
+    with pytest.raises(ImproperlyConfigured, match="incr"):
+        likes.get_store()
+
+
+@pytest.mark.django_db
+def test_vacancy_version_bumped_again_on_commit(client, django_capture_on_commit_callbacks):
+    vacancy = VacancyFactory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        likes.like_vacancies([vacancy.pk])
+        version = get_vacancy_version(vacancy.pk)
+
+    assert get_vacancy_version(vacancy.pk) != version
@@ -0,0 +1,32 @@
+import pytest
+
+from tests.factories import VacancyFactory
+
+
+@pytest.mark.django_db
+def test_like_returns_updated_counters(client):
+    first = VacancyFactory.create(likes=10)
+    second = VacancyFactory.create()
+
+    response = client.put("/vacancy/like/", [second.pk, first.pk, first.pk], content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [{"id": first.pk, "likes": 11}, {"id": second.pk, "likes": 1}],
+        "not_found": [],
+    }
+
+
+@pytest.mark.django_db
+def test_like_reports_unknown_ids(client, vacancy):
+    response = client.put("/vacancy/like/", [vacancy.pk, 100500], content_type="application/json")
+
+    assert response.json() == {"items": [{"id": vacancy.pk, "likes": 1}], "not_found": [100500]}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("data", [{"id": 1}, ["1"], [True], "1"])
+def test_like_rejects_invalid_payload(client, data):
+    response = client.put("/vacancy/like/", data, content_type="application/json")
+
+    assert response.status_code == 400
@@ -10,6 +10,7 @@ def test_vacancy_list(client):
 
     expected_response = {
         "count": 10,
+        "count_strategy": "exact",
         "next": None,
         "previous": None,
         "results": VacancyListSerializer(vacancies, many=True).data
@@ -0,0 +1,65 @@
+import pytest
+
+from tests.factories import VacancyFactory, SkillFactory
+
+# Число запросов не должно зависеть от количества вакансий на странице:
+# COUNT для пагинации + выборка вакансий с пользователями + выборка навыков
+LIST_QUERIES = 3
+# Токен с пользователем + ETag (modified) + вакансия + навыки
+DETAIL_QUERIES = 4
+# UPDATE ... RETURNING
+LIKE_QUERIES = 1
+
+
+@pytest.fixture
+def vacancies_with_skills():
+    def create(size):
+        skills = SkillFactory.create_batch(3)
+        return VacancyFactory.create_batch(size, skills=skills)
+
+    return create
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1, 10, 25])
+def test_vacancy_list_queries(client, django_assert_num_queries, vacancies_with_skills, size):
+    vacancies_with_skills(size)
+
+    with django_assert_num_queries(LIST_QUERIES):
+        response = client.get("/vacancy/")
+
+    assert response.status_code == 200
+    assert all(len(item["skills"]) == 3 for item in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_vacancy_list_filtered_queries(client, django_assert_num_queries, vacancies_with_skills):
+    vacancies_with_skills(15)
+
+    with django_assert_num_queries(LIST_QUERIES):
+        response = client.get("/vacancy/?text=test&page=2")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_vacancy_detail_queries(client, django_assert_num_queries, vacancies_with_skills, hr_token):
+    vacancy = vacancies_with_skills(1)[0]
+
+    with django_assert_num_queries(DETAIL_QUERIES):
+        response = client.get(f"/vacancy/{vacancy.pk}/", HTTP_AUTHORIZATION="Token " + hr_token)
+
+    assert response.status_code == 200
+    assert len(response.data["skills"]) == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1, 10])
+def test_vacancy_like_queries(client, django_assert_num_queries, vacancies_with_skills, size):
+    ids = [vacancy.pk for vacancy in vacancies_with_skills(size)]
+
+    with django_assert_num_queries(LIKE_QUERIES):
+        response = client.put("/vacancy/like/", ids, content_type="application/json")
+
+    assert response.status_code == 200
+    assert all(item["likes"] == 1 for item in response.json()["items"])
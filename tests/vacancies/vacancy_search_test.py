@@ -0,0 +1,54 @@
+import pytest
+from django.db.models import Value
+from django.db.models.functions import Upper
+
+from tests.factories import VacancyFactory
+from vacancies.models import Vacancy
+from vacancies.search import search_vacancies
+
+
+@pytest.mark.django_db
+def test_search_matches_all_words(client):
+    VacancyFactory.create(text="Python developer, remote")
+    VacancyFactory.create(text="Java developer")
+    VacancyFactory.create(text="python data engineer")
+
+    response = client.get("/vacancy/?text=python developer")
+
+    assert response.status_code == 200
+    assert [item["text"] for item in response.data["results"]] == ["Python developer, remote"]
+
+
+@pytest.mark.django_db
+def test_search_ordering_by_rank(client):
+    low = VacancyFactory.create(text="python")
+    high = VacancyFactory.create(text="python, python and more python")
+    middle = VacancyFactory.create(text="python or python")
+
+    response = client.get("/vacancy/?text=python&ordering=rank")
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data["results"]] == [high.pk, middle.pk, low.pk]
+
+
+@pytest.mark.django_db
+def test_search_annotates_rank():
+    VacancyFactory.create(text="Django django DJANGO")
+
+    vacancy = search_vacancies(Vacancy.objects.all(), "django").get()
+
+    assert vacancy.rank == 3
+
+
+@pytest.mark.django_db
+def test_search_vector_saved_in_same_statement(monkeypatch, django_assert_num_queries):
+    # На PostgreSQL здесь SearchVector, на SQLite подставляем простое выражение
+    monkeypatch.setattr("vacancies.search.search_vector_value", lambda text, using: Upper(Value(text)))
+    vacancy = VacancyFactory.create(text="python")
+
+    vacancy.text = "django"
+    with django_assert_num_queries(1):
+        vacancy.save(update_fields=["text"])
+
+    assert Vacancy.objects.filter(pk=vacancy.pk).values_list("search_vector", flat=True).get() == "DJANGO"
+    assert vacancy.search_vector == "DJANGO"
@@ -0,0 +1,49 @@
+import pytest
+from django.db import IntegrityError
+
+from tests.factories import VacancyFactory, SkillFactory
+
+
+@pytest.fixture
+def skills():
+    return {name: SkillFactory.create(name=name) for name in ["Python", "Django", "Java"]}
+
+
+@pytest.mark.django_db
+def test_skill_filter_any_has_no_duplicates(client, skills):
+    both = VacancyFactory.create(skills=[skills["Python"], skills["Django"]])
+    java = VacancyFactory.create(skills=[skills["Java"]])
+    VacancyFactory.create()
+
+    response = client.get("/vacancy/?skill=python&skill=DJANGO&skill=java")
+
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    assert sorted(item["id"] for item in response.data["results"]) == [both.pk, java.pk]
+
+
+@pytest.mark.django_db
+def test_skill_filter_all(client, skills):
+    both = VacancyFactory.create(skills=[skills["Python"], skills["Django"]])
+    VacancyFactory.create(skills=[skills["Python"], skills["Java"]])
+
+    response = client.get("/vacancy/?skill=python&skill=django&skill_mode=all")
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data["results"]] == [both.pk]
+
+
+@pytest.mark.django_db
+def test_skill_filter_is_exact_match(client, skills):
+    VacancyFactory.create(skills=[skills["Java"]])
+
+    response = client.get("/vacancy/?skill=jav")
+
+    assert response.status_code == 200
+    assert response.data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_skill_name_unique_case_insensitive(skills):
+    with pytest.raises(IntegrityError):
+        SkillFactory.create(name="PYTHON")
@@ -0,0 +1,116 @@
+from importlib import import_module
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from django.db import connection
+
+from tests.factories import SkillFactory, VacancyFactory
+from vacancies.models import Skill
+
+SKILLS = [f"skill{i}" for i in range(20)]
+
+
+@pytest.mark.django_db
+def test_create_vacancy_with_20_skills_queries(client, hr_token, django_assert_num_queries):
+    for name in SKILLS[:5]:  # часть навыков уже есть
+        SkillFactory.create(name=name)
+
+    # Токен, проверка slug, INSERT вакансии, навыки (поиск, вставка, дочитывание), связи, навыки для ответа
+    with django_assert_num_queries(8):
+        response = client.post(
+            "/vacancy/create/",
+            {"slug": "new", "text": "new", "status": "draft", "skills": SKILLS},
+            content_type="application/json",
+            HTTP_AUTHORIZATION="Token " + hr_token
+        )
+
+    assert response.status_code == 201
+    assert sorted(response.data["skills"]) == sorted(SKILLS)
+    assert Skill.objects.count() == 20
+
+
+@pytest.mark.django_db
+def test_update_vacancy_with_20_skills_queries(client, django_assert_num_queries):
+    old_skills = [SkillFactory.create(name=name) for name in SKILLS[:10]]  # их оставляем
+    removed = SkillFactory.create(name="removed")
+    vacancy = VacancyFactory.create(skills=old_skills + [removed])
+
+    # Вакансия, UPDATE, навыки (поиск, вставка, дочитывание), текущие связи, DELETE, INSERT, навыки для ответа
+    with django_assert_num_queries(9):
+        response = client.put(
+            f"/vacancy/{vacancy.pk}/update/",
+            {"slug": "test", "text": "test", "status": "draft", "skills": SKILLS},
+            content_type="application/json"
+        )
+
+    assert response.status_code == 200
+    assert sorted(response.data["skills"]) == sorted(SKILLS)
+
+
+@pytest.mark.django_db
+def test_update_vacancy_without_skills_keeps_them(client):
+    skill = SkillFactory.create()
+    vacancy = VacancyFactory.create(skills=[skill])
+
+    response = client.put(
+        f"/vacancy/{vacancy.pk}/update/",
+        {"slug": "test", "text": "updated", "status": "draft"},
+        content_type="application/json"
+    )
+
+    assert response.status_code == 200
+    assert response.data["skills"] == [skill.name]
+
+
+@pytest.mark.django_db
+def test_create_vacancy_reuses_skill_case_insensitive(client, hr_token):
+    SkillFactory.create(name="Python")
+
+    response = client.post(
+        "/vacancy/create/",
+        {"slug": "new", "text": "new", "status": "draft", "skills": ["python", " PYTHON "]},
+        content_type="application/json",
+        HTTP_AUTHORIZATION="Token " + hr_token
+    )
+
+    assert response.status_code == 201
+    assert response.data["skills"] == ["Python"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("skills", [[1], ["x" * 21], [["nested"]], "python"])
+def test_invalid_skill_names_rejected(client, hr_token, skills):
+    vacancy = VacancyFactory.create()
+
+    created = client.post(
+        "/vacancy/create/",
+        {"slug": "new", "text": "new", "status": "draft", "skills": skills},
+        content_type="application/json",
+        HTTP_AUTHORIZATION="Token " + hr_token
+    )
+    updated = client.put(
+        f"/vacancy/{vacancy.pk}/update/",
+        {"slug": "test", "text": "test", "status": "draft", "skills": skills},
+        content_type="application/json"
+    )
+
+    assert (created.status_code, updated.status_code) == (400, 400)
+    assert "skills" in created.data and "skills" in updated.data
+    assert not Skill.objects.exists()
+
+
+@pytest.mark.django_db
+def test_merge_duplicate_skills_migration_normalizes_whitespace():
+    merge_duplicate_skills = import_module("vacancies.migrations.0009_merge_duplicate_skills").merge_duplicate_skills
+    keeper = SkillFactory.create(name=" Machine  learning")
+    duplicate = SkillFactory.create(name="machine learning ")
+    vacancy = VacancyFactory.create(skills=[keeper, duplicate])
+    other = VacancyFactory.create(skills=[duplicate])
+
+    # Миграции нужен только schema_editor.connection
+    merge_duplicate_skills(apps, SimpleNamespace(connection=connection))
+
+    assert list(Skill.objects.values_list("name", flat=True)) == ["Machine learning"]
+    assert list(vacancy.skills.values_list("pk", flat=True)) == [keeper.pk]
+    assert list(other.skills.values_list("pk", flat=True)) == [keeper.pk]
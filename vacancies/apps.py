@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class VacanciesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vacancies'
+
+    def ready(self):
+        import vacancies.signals  # noqa: F401
+        # Обработчик connection_created должен быть подключен до первого соединения с БД
+        import djangoProject.instrumentation  # noqa: F401
@@ -0,0 +1,142 @@
+"""
+Async версии view чтения для запуска под ASGI (uvicorn djangoProject.asgi:application).
+Запросы идут через async ORM (acount, aget, async for), поток на запрос не занимается.
+JSON ответ совпадает с синхронными view: те же ETag/304, кэш ответов, пагинация и формат.
+Browsable API, ?format= и курсорную пагинацию обслуживают синхронные view, такие запросы
+передаются им. Какая реализация подключена к маршруту, задает ASYNC_VIEWS в settings.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponseNotAllowed
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+
+from authentication.async_auth import aauthenticate, authenticate_header
+from djangoProject.renderers import json_response
+from vacancies.cache import cache_settings, get_cached_response, set_cached_response
+from vacancies.conditional import acondition, adetail_validators, alist_validators
+from vacancies.fast_serializers import FastSkillSerializer, FastVacancyListSerializer
+from vacancies.filters import filter_vacancies
+from vacancies.models import Vacancy, Skill
+from vacancies.pagination import COUNT_EXACT, CountingPageNumberPagination
+from vacancies.serializers import VacancyDetailSerializer
+from vacancies.views import VacancyListView, VacancyDetailView, SkillsViewSet
+
+
+def use_async_view(name):
+    return getattr(settings, "ASYNC_VIEWS", {}).get(name, False)
+
+
+def route(name, sync_view, async_view):
+    """View для маршрута: async_view, если он включен в ASYNC_VIEWS[name], иначе sync_view"""
+    return async_view if use_async_view(name) else sync_view
+
+
+def exception_response(request, exc):
+    """Ответ на APIException в формате DRF exception_handler"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = json_response(data, status=exc.status_code)
+    if exc.status_code == 401:
+        header = authenticate_header(request)
+        if header:
+            response["WWW-Authenticate"] = header
+    return response
+
+
+def wants_sync_view(request):
+    # Форматы и Browsable API отдает DRF
+    return "format" in request.GET or "text/html" in request.headers.get("Accept", "")
+
+
+async def cached_json(prefix, request, view_kwargs, build):
+    """JSON ответ build() через общий с VacancyCacheMixin кэш ответов (те же ключи и X-Cache)"""
+    if not cache_settings()["ENABLED"]:
+        return json_response(await build())
+
+    key, data = await sync_to_async(get_cached_response)(prefix, request, view_kwargs)
+    if data is not None:
+        response = json_response(data)
+        response["X-Cache"] = "HIT"
+        return response
+
+    data = await build()
+    await sync_to_async(set_cached_response)(key, data)
+    response = json_response(data)
+    response["X-Cache"] = "MISS"
+    return response
+
+
+async def paginated(request, queryset, serializer, view_name, count_strategy=None, show_count_strategy=True):
+    pagination = CountingPageNumberPagination()
+    pagination.show_count_strategy = show_count_strategy
+    rows = await pagination.apaginate_queryset(serializer.values(queryset), request, view_name, count_strategy)
+    return pagination.get_paginated_data(await serializer.aserialize(rows))
+
+
+sync_vacancy_list = VacancyListView.as_view()
+sync_vacancy_detail = VacancyDetailView.as_view()
+sync_skills = SkillsViewSet.as_view({"get": "list", "post": "create"})
+
+
+async def vacancy_list(request):
+    # Search request eg.: /vacancy/?text=new&ordering=rank&skill=java&skill=python&skill_mode=all
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    if "cursor" in request.GET or request.GET.get("pagination") == "cursor" or wants_sync_view(request):
+        return await sync_to_async(sync_vacancy_list)(request)
+
+    try:
+        await aauthenticate(request)
+        queryset = filter_vacancies(Vacancy.objects.all(), request.GET)
+        return await acondition(request, await alist_validators(request), lambda: cached_json(
+            VacancyListView.__name__, request, {},
+            lambda: paginated(request, queryset, FastVacancyListSerializer(), VacancyListView.__name__),
+        ))
+    except APIException as exc:
+        return exception_response(request, exc)
+
+
+async def vacancy_detail(request, pk):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    if wants_sync_view(request):
+        return await sync_to_async(sync_vacancy_detail)(request, pk=pk)
+
+    async def build():
+        try:
+            vacancy = await Vacancy.objects.prefetch_related("skills").aget(pk=pk)
+        except Vacancy.DoesNotExist:
+            raise NotFound()
+        # to_representation добавляет pending_likes() из буфера лайков (кэш) - в потоке
+        return await sync_to_async(lambda: VacancyDetailSerializer(vacancy).data)()
+
+    try:
+        user = await aauthenticate(request)
+        if not user.is_authenticated:
+            raise NotAuthenticated()
+        return await acondition(
+            request, await adetail_validators(request, pk),
+            lambda: cached_json(VacancyDetailView.__name__, request, {"pk": pk}, build),
+        )
+    except APIException as exc:
+        return exception_response(request, exc)
+
+
+async def skill_list(request):
+    # Создание навыка (POST) остается у SkillsViewSet
+    if request.method not in ("GET", "HEAD") or wants_sync_view(request):
+        return await sync_to_async(sync_skills)(request)
+
+    try:
+        await aauthenticate(request)
+        # Список навыков в SkillsViewSet - обычный PageNumberPagination: точный COUNT, без count_strategy
+        data = await paginated(
+            request, Skill.objects.all(), FastSkillSerializer(), SkillsViewSet.__name__,
+            count_strategy=COUNT_EXACT, show_count_strategy=False,
+        )
+        return json_response(data)
+    except APIException as exc:
+        return exception_response(request, exc)
+
+
+# CSRF проверяют сами DRF view (SessionAuthentication), как у APIView.as_view()
+vacancy_list.csrf_exempt = vacancy_detail.csrf_exempt = skill_list.csrf_exempt = True
@@ -0,0 +1,40 @@
+from collections import Counter
+
+from django.db import transaction
+
+from vacancies.cache import bump_version
+from vacancies.counters import adjust_vacancy_counts
+from vacancies.models import Vacancy
+from vacancies.search import update_search_vector
+from vacancies.skills import resolve_skills, normalize_skill_name
+
+
+def create_vacancies(items, batch_size=1000):
+    """
+    Создает вакансии из списка проверенных данных (поля модели + skills - список имен)
+    одной транзакцией: навыки, вакансии и связи через bulk_create.
+    Сигналы post_save при этом не отправляются, поэтому кэш сбрасывается здесь.
+    """
+    if not items:
+        return []
+
+    with transaction.atomic():
+        skills = resolve_skills(name for item in items for name in item.get("skills", []))
+
+        vacancies = Vacancy.objects.bulk_create(
+            [Vacancy(**{key: value for key, value in item.items() if key != "skills"}) for item in items],
+            batch_size=batch_size,
+        )
+
+        through = Vacancy.skills.through
+        links = []
+        for vacancy, item in zip(vacancies, items):
+            skill_ids = {skills[normalize_skill_name(name)].pk for name in item.get("skills", []) if name.strip()}
+            links.extend(through(vacancy_id=vacancy.pk, skill_id=skill_id) for skill_id in skill_ids)
+        through.objects.bulk_create(links, batch_size=batch_size)
+
+        update_search_vector(Vacancy.objects.filter(pk__in=[vacancy.pk for vacancy in vacancies]))
+        adjust_vacancy_counts(Counter(vacancy.user_id for vacancy in vacancies))
+
+    bump_version()
+    return vacancies
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from djangoProject.caches import shared_cache
+from djangoProject.db_router import replica_may_be_stale
+
+VERSION_KEY = "vacancy_cache:version"
+HITS_KEY = "vacancy_cache:hits"
+MISSES_KEY = "vacancy_cache:misses"
+
+
+def cache_settings():
+    return {
+        "ENABLED": True,
+        "TIMEOUT": 300,
+        "CACHE_ALIAS": "default",
+        **getattr(settings, "VACANCY_CACHE", {}),
+    }
+
+
+def vacancy_cache():
+    return caches[cache_settings()["CACHE_ALIAS"]]
+
+
+def shared_vacancy_cache():
+    """Кэш ответов для команды vacancy_cache_stats: в локальном кэше процесса команда увидит только себя"""
+    return shared_cache(cache_settings()["CACHE_ALIAS"], 'VACANCY_CACHE["CACHE_ALIAS"]')
+
+
+def get_version():
+    cache = vacancy_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Начальная версия из времени: если ключ версии вытеснили из кэша,
+        # старые ответы с прежней версией не оживут
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def after_commit(func, *args):
+    """
+    Внутри транзакции версия увеличивается еще раз после коммита: параллельный запрос мог успеть
+    прочитать старые строки и положить их в кэш под новой версией. Сразу - чтобы следующие чтения
+    этой же транзакции не попадали в старый кэш.
+    """
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: func(*args, on_commit=False))
+
+
+def bump_version(on_commit=True):
+    """Сбрасывает все закэшированные ответы вакансий: новая версия - новые ключи"""
+    try:
+        vacancy_cache().incr(VERSION_KEY)
+    except ValueError:
+        get_version()
+    if on_commit:
+        after_commit(bump_version)
+
+
+def vacancy_version_key(pk):
+    return f"{VERSION_KEY}:{pk}"
+
+
+def get_vacancy_version(pk):
+    """Версия ответов одной вакансии: лайк меняет только ее, а не весь кэш"""
+    cache = vacancy_cache()
+    key = vacancy_version_key(pk)
+    version = cache.get(key)
+    if version is None:
+        # Ключ живет не дольше ответов, новая версия из времени не совпадет со старыми
+        cache.add(key, int(time.time() * 1000), cache_settings()["TIMEOUT"])
+        version = cache.get(key)
+    return version
+
+
+def bump_vacancy_versions(ids, on_commit=True):
+    cache = vacancy_cache()
+    ids = list(ids)
+    for pk in ids:
+        try:
+            cache.incr(vacancy_version_key(pk))
+        except ValueError:
+            pass  # Версии нет - нет и закэшированных с ней ответов
+    if on_commit:
+        after_commit(bump_vacancy_versions, ids)
+
+
+def _incr(key):
+    cache = vacancy_cache()
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+
+
+def cache_stats(cache=None):
+    cache = cache or vacancy_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+        "version": cache.get(VERSION_KEY),
+    }
+
+
+def normalize_query(params):
+    """?skill=b&text=a%20%20x&skill=a и ?text=a x&skill=a&skill=b дают один и тот же ключ"""
+    normalized = []
+    for key, values in sorted(params.lists()):
+        values = sorted(" ".join(value.split()) for value in values)
+        normalized.append((key, values))
+    return normalized
+
+
+def response_cache_key(prefix, request, view_kwargs):
+    payload = json.dumps([request.path, view_kwargs, normalize_query(request.GET)])
+    digest = hashlib.md5(payload.encode()).hexdigest()
+    version = get_version()
+    if "pk" in view_kwargs:
+        version = f"{version}.{get_vacancy_version(view_kwargs['pk'])}"
+    return f"vacancy_cache:{prefix}:{version}:{digest}"
+
+
+def get_cached_response(prefix, request, view_kwargs):
+    """(ключ, данные ответа или None), попадания и промахи учитываются в статистике"""
+    key = response_cache_key(prefix, request, view_kwargs)
+    data = vacancy_cache().get(key)
+    _incr(HITS_KEY if data is not None else MISSES_KEY)
+    return key, data
+
+
+def set_cached_response(key, data):
+    # Ответ с реплики, которая может отставать от недавней записи, пережил бы ее до конца TIMEOUT
+    if not replica_may_be_stale():
+        vacancy_cache().set(key, data, cache_settings()["TIMEOUT"])
+
+
+class VacancyCacheMixin:
+    """
+    Кэширует ответы list/retrieve по нормализованной строке запроса.
+    Ключ содержит номер версии, который увеличивается при любой записи вакансий
+    (см. vacancies/signals.py), поэтому устаревшие ответы просто перестают читаться.
+    Проверка прав выполняется до list/retrieve, в кэш попадают только ответы 200.
+    """
+    cache_prefix = None
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not cache_settings()["ENABLED"]:
+            return handler(request, *args, **kwargs)
+
+        key, data = get_cached_response(self.cache_prefix or self.__class__.__name__, request, kwargs)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_cached_response(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,94 @@
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from vacancies.cache import get_version, normalize_query
+from vacancies.likes import is_enabled, pending_likes
+from vacancies.models import Vacancy
+
+
+def _etag(*parts):
+    return "-".join(str(part) for part in parts)
+
+
+def _timestamp(value):
+    return int(value.timestamp() * 1_000_000)
+
+
+def detail_validators(request, pk):
+    """(etag, last_modified) вакансии по одной колонке modified, без загрузки объекта"""
+    if not hasattr(request, "_vacancy_validators"):
+        modified = Vacancy.objects.filter(pk=pk).values_list("modified", flat=True).first()
+        # Лайки из буфера меняют ответ, не меняя modified
+        pending = pending_likes([pk]).get(pk, 0)
+        request._vacancy_validators = _detail_validators(pk, modified, pending)
+    return request._vacancy_validators
+
+
+def _detail_validators(pk, modified, pending):
+    if not modified:
+        return None, None
+    # Пока в буфере есть лайки, modified их не отражает: Last-Modified не отдаем,
+    # иначе If-Modified-Since получил бы 304 с устаревшим числом лайков
+    return _etag("vacancy", pk, _timestamp(modified), pending), (None if pending else modified)
+
+
+def list_validators(request):
+    """
+    (etag, None) списка без запроса к БД: версия кэша ответов меняется при любой записи,
+    которая видна в списке (vacancies/signals.py), к ней добавляется нормализованная строка запроса.
+    Last-Modified у списка нет - последнее изменение отфильтрованных вакансий стоило бы агрегата по всей выборке.
+    """
+    if not hasattr(request, "_vacancy_validators"):
+        query = hashlib.md5(json.dumps(normalize_query(request.GET)).encode()).hexdigest()
+        request._vacancy_validators = (_etag("vacancies", get_version(), query), None)
+    return request._vacancy_validators
+
+
+async def adetail_validators(request, pk):
+    """detail_validators() для async views"""
+    modified = await Vacancy.objects.filter(pk=pk).values_list("modified", flat=True).afirst()
+    pending = (await sync_to_async(pending_likes)([pk])).get(pk, 0) if is_enabled() else 0
+    return _detail_validators(pk, modified, pending)
+
+
+async def alist_validators(request):
+    """list_validators() для async views"""
+    return await sync_to_async(list_validators)(request)
+
+
+async def acondition(request, validators, handler):
+    """
+    То же, что condition() для async view: validators - (etag, last_modified),
+    handler - корутина, которая строит ответ, если клиенту не хватает 304/412.
+    """
+    etag, last_modified = validators
+    etag = quote_etag(etag) if etag is not None else None
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = await handler()
+
+    if request.method in ("GET", "HEAD"):
+        if timestamp and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(timestamp)
+        if etag:
+            response.headers.setdefault("ETag", etag)
+    return response
+
+
+# ETag + Last-Modified, на If-None-Match / If-Modified-Since отвечаем 304 без сериализации
+detail_condition = method_decorator(condition(
+    etag_func=lambda request, pk: detail_validators(request, pk)[0],
+    last_modified_func=lambda request, pk: detail_validators(request, pk)[1],
+), name="get")
+
+list_condition = method_decorator(condition(
+    etag_func=lambda request, *args, **kwargs: list_validators(request)[0],
+), name="get")
@@ -0,0 +1,81 @@
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from authentication.models import User
+from vacancies.models import Vacancy, UserVacancyStats
+
+
+def counter_settings():
+    return {
+        # Строк UserVacancyStats: каждая запись меняет одну случайную, и писатели не ждут блокировку одной строки
+        "SHARDS": 8,
+        **getattr(settings, "VACANCY_COUNTERS", {}),
+    }
+
+
+def adjust_vacancy_counts(deltas, using="default"):
+    """
+    Применяет изменения {user_id: +n/-n} к User.vacancy_count и общему счетчику вакансий.
+    Пользователи с одинаковым изменением обновляются одним UPDATE.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if user_id is not None and delta}
+    if not deltas:
+        return
+
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        # Не ниже нуля: счетчик мог разойтись с данными (queryset.update(user=...) минует save),
+        # а его обслуживание не должно ломать удаление вакансии
+        User.objects.using(using).filter(pk__in=user_ids) \
+            .update(vacancy_count=Greatest(F("vacancy_count") + delta, Value(0)))
+
+    adjust_stats(using, vacancies=sum(deltas.values()))
+
+
+def adjust_user_count(delta, using="default"):
+    adjust_stats(using, users=delta)
+
+
+def adjust_stats(using="default", **deltas):
+    """Добавляет deltas к случайной строке UserVacancyStats; итог - сумма строк (UserVacancyStats.current)"""
+    shard = random.randint(1, counter_settings()["SHARDS"])
+    stats = UserVacancyStats.objects.using(using)
+    if stats.filter(pk=shard).update(**{name: F(name) + delta for name, delta in deltas.items()}):
+        return
+
+    if not stats.exists():
+        # Строк нет совсем (таблицу очистили) - считаем заново по данным
+        recount_vacancies(using)
+        return
+    # Строки создают миграция и recount_vacancies, сюда попадаем после увеличения SHARDS.
+    # Остальные строки на месте, значит их сумма верна: недостающая строка начинается с deltas
+    try:
+        with transaction.atomic(using=using):
+            stats.create(pk=shard, **deltas)
+    except IntegrityError:
+        stats.filter(pk=shard).update(**{name: F(name) + delta for name, delta in deltas.items()})
+
+
+def recount_vacancies(using="default"):
+    """Пересчитывает все счетчики по фактическим данным, возвращает UserVacancyStats с итогами"""
+    counts = Vacancy.objects.using(using).filter(user=OuterRef("pk")).order_by() \
+        .values("user").annotate(total=Count("id")).values("total")
+    User.objects.using(using).update(vacancy_count=Coalesce(Subquery(counts), Value(0)))
+
+    stats = UserVacancyStats(pk=1)
+    stats.users = User.objects.using(using).count()
+    stats.vacancies = Vacancy.objects.using(using).filter(user__isnull=False).count()
+    with transaction.atomic(using=using):
+        # Итог - в первой строке, остальные строки создаются нулевыми
+        UserVacancyStats.objects.using(using).all().delete()
+        UserVacancyStats.objects.using(using).bulk_create(
+            [stats] + [UserVacancyStats(pk=shard) for shard in range(2, counter_settings()["SHARDS"] + 1)]
+        )
+    return stats
@@ -0,0 +1,94 @@
+"""
+Потоковая выгрузка вакансий в NDJSON и CSV (/vacancy/export/?format=csv).
+Строки читаются курсором на сервере (iterator(chunk_size)), навыки добавляются одним запросом
+на пачку, поэтому память не растет с размером таблицы, а COUNT и OFFSET не нужны.
+"""
+import csv
+from itertools import islice
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer
+
+from djangoProject.renderers import dumps
+from vacancies.fast_serializers import FastVacancyListSerializer
+
+DEFAULT_CHUNK_SIZE = 2000
+CSV_FIELDS = ["id", "text", "slug", "status", "created", "username", "skills"]
+# Разделитель навыков внутри колонки skills в CSV
+CSV_SKILLS_SEPARATOR = ";"
+
+
+def export_chunk_size():
+    return getattr(settings, "VACANCY_EXPORT", {}).get("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def iter_vacancies(queryset, chunk_size=None):
+    """Словари вакансий в формате списка /vacancy/, пачками по chunk_size строк"""
+    chunk_size = chunk_size or export_chunk_size()
+    serializer = FastVacancyListSerializer()
+    rows = serializer.values(queryset).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from serializer.serialize(chunk)
+
+
+class _Echo:
+    """Буфер для csv.writer, который сразу отдает записанную строку"""
+    def write(self, value):
+        return value
+
+
+def csv_row(item):
+    return [
+        CSV_SKILLS_SEPARATOR.join(item[field]) if field == "skills" else item[field]
+        for field in CSV_FIELDS
+    ]
+
+
+def iter_csv(items):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_FIELDS)
+    for item in items:
+        yield writer.writerow(csv_row(item))
+
+
+def iter_csv_dict(data):
+    """Словарь одной строкой CSV (ответы с ошибками)"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(data.keys())
+    yield writer.writerow(data.values())
+
+
+def iter_ndjson(items):
+    for item in items:
+        yield dumps(item) + b"\n"
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Выбирается по ?format=ndjson или Accept; сами строки пишет view, здесь только ошибки"""
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"" if data is None else dumps(data) + b"\n"
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        data = data if isinstance(data, dict) else {"detail": data}
+        return "".join(iter_csv_dict(data)).encode(self.charset)
+
+
+EXPORT_FORMATS = {
+    NDJSONRenderer.format: (iter_ndjson, "vacancies.ndjson"),
+    CSVRenderer.format: (iter_csv, "vacancies.csv"),
+}
@@ -0,0 +1,120 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+from rest_framework.response import Response
+
+from vacancies.models import Skill
+
+
+def _int(value):
+    return int(value) if value is not None else None
+
+
+def _str(value):
+    return str(value) if value is not None else None
+
+
+def _bool(value):
+    return bool(value) if value is not None else None
+
+
+def _date(value):
+    return value.isoformat() if value is not None else None
+
+
+class ValuesSerializer:
+    """
+    Сериализатор для чтения без объектов моделей и полей DRF: выбирает только нужные колонки
+    через values() и собирает словари по заранее составленному списку (ключ, колонка, преобразование).
+    Результат совпадает с соответствующим ModelSerializer (serializer_class view).
+    """
+    # (ключ в ответе, колонка или выражение для values(), преобразование) - порядок как в ModelSerializer
+    fields = []
+
+    def __init__(self):
+        self.columns = {key: column for key, column, convert in self.fields if column is not None}
+        self.converters = [(key, convert) for key, column, convert in self.fields if column is not None]
+
+    def values(self, queryset):
+        expressions = {key: column for key, column in self.columns.items() if not isinstance(column, str)}
+        names = [column for column in self.columns.values() if isinstance(column, str)]
+        return queryset.prefetch_related(None).select_related(None).values(*names, **expressions)
+
+    def serialize(self, rows):
+        converters = self.converters
+        return [{key: convert(row[key]) for key, convert in converters} for row in rows]
+
+    async def aserialize(self, rows):
+        return self.serialize(rows)
+
+
+class FastSkillSerializer(ValuesSerializer):
+    """Аналог SkillSerializer"""
+    fields = [
+        ("id", "id", _int),
+        ("name", "name", _str),
+        ("is_active", "is_active", _bool),
+    ]
+
+
+class FastVacancyListSerializer(ValuesSerializer):
+    """Аналог VacancyListSerializer, навыки всей страницы добавляются одним запросом"""
+    fields = [
+        ("id", "id", _int),
+        ("text", "text", _str),
+        ("slug", "slug", _str),
+        ("status", "status", _str),
+        ("created", "created", _date),
+        ("username", F("user__username"), _str),
+        ("skills", None, None),
+    ]
+
+    def serialize(self, rows):
+        rows = list(rows)
+        items = super().serialize(rows)
+        return self.attach_skills(items, self.skill_names(items))
+
+    async def aserialize(self, rows):
+        """serialize() для async views: навыки выбираются через async ORM"""
+        items = super().serialize(rows)
+        return self.attach_skills(items, [pair async for pair in self.skill_names(items)])
+
+    @staticmethod
+    def skill_names(items):
+        # Тот же запрос и порядок навыков, что и у prefetch в VacancyListView
+        vacancy_ids = [item["id"] for item in items]
+        return Skill.objects.filter(vacancy__in=vacancy_ids).order_by("id").values_list("vacancy", "name")
+
+    @staticmethod
+    def attach_skills(items, names):
+        skills = defaultdict(list)
+        for vacancy_id, name in names:
+            skills[vacancy_id].append(name)
+
+        for item in items:
+            item["skills"] = skills.get(item["id"], [])
+        return items
+
+
+class FastListMixin:
+    """
+    list() через ValuesSerializer, если он задан в fast_serializer_class и включен FAST_READ_SERIALIZERS.
+    Фильтрация и пагинация остаются прежними, пагинатор получает values() queryset.
+    """
+    fast_serializer_class = None
+
+    def use_fast_serializer(self):
+        return self.fast_serializer_class is not None and getattr(settings, "FAST_READ_SERIALIZERS", False)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_serializer():
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.fast_serializer_class()
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
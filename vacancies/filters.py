@@ -0,0 +1,54 @@
+from django.db.models import Count, Exists, OuterRef
+
+from vacancies.models import Vacancy
+from vacancies.search import search_vacancies
+from vacancies.skills import normalize_skill_name, skills_by_names
+
+SKILL_MODE_ANY = "any"
+SKILL_MODE_ALL = "all"
+SKILL_MODES = [SKILL_MODE_ANY, SKILL_MODE_ALL]
+
+
+def filter_by_skills(queryset, names, mode=SKILL_MODE_ANY):
+    """
+    any - вакансии, у которых есть хотя бы один из навыков (EXISTS),
+    all - вакансии, у которых есть все навыки (подзапрос с GROUP BY).
+    Фильтрация идет подзапросами, поэтому вакансии в выдаче не дублируются.
+    """
+    names = {normalize_skill_name(name) for name in names if name.strip()}
+    if not names:
+        return queryset
+
+    through = Vacancy.skills.through
+    skill_ids = skills_by_names(names).values("id")
+
+    if mode == SKILL_MODE_ALL:
+        vacancy_ids = through.objects.filter(skill_id__in=skill_ids) \
+            .values("vacancy_id") \
+            .annotate(matched=Count("skill_id")) \
+            .filter(matched=len(names)) \
+            .values("vacancy_id")
+        return queryset.filter(pk__in=vacancy_ids)
+
+    return queryset.filter(
+        Exists(through.objects.filter(vacancy_id=OuterRef("pk"), skill_id__in=skill_ids))
+    )
+
+
+def filter_vacancies(queryset, params):
+    """
+    Общие фильтры списка вакансий по параметрам запроса:
+    /vacancy/?text=python&ordering=rank&skill=django&skill=sql&skill_mode=all
+    """
+    vacancy_text = params.get("text", None)
+    if vacancy_text:
+        queryset = search_vacancies(queryset, vacancy_text)
+        if params.get("ordering") == "rank":
+            queryset = queryset.order_by("-rank", "-id")
+
+    skills = params.getlist("skill", [])
+    if skills:
+        mode = params.get("skill_mode", SKILL_MODE_ANY)
+        queryset = filter_by_skills(queryset, skills, mode if mode in SKILL_MODES else SKILL_MODE_ANY)
+
+    return queryset
@@ -0,0 +1,208 @@
+"""
+Импорт вакансий из NDJSON: python manage.py import_vacancies dump.ndjson
+Строка файла - объект в формате выгрузки /vacancy/export/ (slug, text, status, created,
+username, skills, ...). Файл читается построчно, каждая пачка пишется своей транзакцией:
+вакансии через bulk_create (на PostgreSQL - COPY), связи с навыками одной вставкой.
+Пользователи и навыки кэшируются в памяти на весь импорт.
+"""
+import io
+import json
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from authentication.models import User
+from vacancies.cache import bump_version
+from vacancies.counters import adjust_vacancy_counts
+from vacancies.models import Vacancy
+from vacancies.search import update_search_vector
+from vacancies.skills import normalize_skill_name, resolve_skills
+
+IMPORT_FIELDS = ["slug", "text", "status", "created", "likes", "min_experience", "updated_at"]
+REQUIRED_FIELDS = ["slug", "text"]
+
+
+def read_batches(stream, batch_size, offset=0):
+    """
+    Пачки строк бинарного файла начиная с offset: ([(смещение строки, строка), ...], смещение после пачки).
+    С смещения после пачки импорт можно продолжить, если следующая пачка не записалась.
+    """
+    if offset:
+        stream.seek(offset)
+    position = offset
+    batch = []
+    for line in stream:
+        if line.strip():
+            batch.append((position, line))
+        position += len(line)
+        if len(batch) >= batch_size:
+            yield batch, position
+            batch = []
+    if batch:
+        yield batch, position
+
+
+def parse_row(data):
+    """Поля модели из объекта строки, значения приводятся и проверяются полями Vacancy"""
+    if not isinstance(data, dict):
+        raise ValidationError("Expected a JSON object.")
+
+    row = {}
+    for name in IMPORT_FIELDS:
+        if data.get(name) is None:
+            continue
+        field = Vacancy._meta.get_field(name)
+        value = field.to_python(data[name])
+        field.validate(value, None)
+        if field.max_length and len(value) > field.max_length:
+            raise ValidationError(f"{name}: more than {field.max_length} characters.")
+        row[name] = value
+
+    missing = [name for name in REQUIRED_FIELDS if name not in row]
+    if missing:
+        raise ValidationError(f"Missing fields: {', '.join(missing)}.")
+
+    skills = data.get("skills") or []
+    if not isinstance(skills, list) or not all(isinstance(name, str) for name in skills):
+        raise ValidationError("skills: expected a list of names.")
+    row["skills"] = skills
+    row["username"] = data.get("username")
+    return row
+
+
+def supports_copy(conn=connection):
+    return conn.vendor == "postgresql"
+
+
+def _copy_value(value):
+    """Значение в текстовом формате COPY: NULL - \\N, спецсимволы экранируются"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(cursor, table, columns, rows):
+    data = "".join("\t".join(_copy_value(value) for value in row) + "\n" for row in rows)
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    if hasattr(cursor, "copy_expert"):  # psycopg2
+        cursor.copy_expert(sql, io.StringIO(data))
+    else:  # psycopg 3
+        with cursor.copy(sql) as copy:
+            copy.write(data)
+
+
+class VacancyImporter:
+    """
+    prepare() разбирает строки пачки и находит пользователей и навыки,
+    write() пишет подготовленную пачку одной транзакцией и возвращает id вакансий.
+    """
+
+    def __init__(self, use_copy=None):
+        self.use_copy = supports_copy() if use_copy is None else use_copy
+        self.users = {}  # username -> id
+        self.skills = {}  # нормализованное имя -> id
+
+    def prepare(self, lines):
+        """[(смещение, строка)] -> (строки для write(), [(смещение, ошибка)])"""
+        rows = []
+        errors = []
+        for position, line in lines:
+            try:
+                rows.append((position, parse_row(json.loads(line))))
+            except (ValueError, ValidationError) as exc:
+                errors.append((position, "; ".join(exc.messages) if isinstance(exc, ValidationError) else str(exc)))
+
+        self._resolve_users({row["username"] for _, row in rows if row["username"] is not None})
+        prepared = []
+        for position, row in rows:
+            username = row.pop("username")
+            row["user_id"] = self.users.get(username) if username is not None else None
+            if username is not None and row["user_id"] is None:
+                errors.append((position, f"Unknown user {username!r}."))
+            else:
+                prepared.append(row)
+        return prepared, sorted(errors)
+
+    def _resolve_users(self, usernames):
+        missing = [username for username in usernames if username not in self.users]
+        if missing:
+            self.users.update(User.objects.filter(username__in=missing).values_list("username", "id"))
+
+    def _resolve_skills(self, names):
+        missing = [name for name in names if name.strip() and normalize_skill_name(name) not in self.skills]
+        if missing:
+            self.skills.update({key: skill.pk for key, skill in resolve_skills(missing).items()})
+
+    def write(self, rows):
+        if not rows:
+            return []
+        try:
+            with transaction.atomic():
+                self._resolve_skills({name for row in rows for name in row["skills"]})
+                ids = self._copy_vacancies(rows) if self.use_copy else self._create_vacancies(rows)
+
+                links = {
+                    (pk, self.skills[normalize_skill_name(name)])
+                    for pk, row in zip(ids, rows) for name in row["skills"] if name.strip()
+                }
+                self._create_links(sorted(links))
+
+                update_search_vector(Vacancy.objects.filter(pk__in=ids))
+                adjust_vacancy_counts(Counter(row["user_id"] for row in rows))
+        except Exception:
+            # Навыки, созданные в откаченной транзакции, не должны остаться в кэше
+            self.skills.clear()
+            raise
+
+        bump_version()
+        return ids
+
+    def _create_vacancies(self, rows):
+        vacancies = Vacancy.objects.bulk_create([
+            Vacancy(user_id=row["user_id"], **{name: row[name] for name in IMPORT_FIELDS if name in row})
+            for row in rows
+        ])
+        ids = [vacancy.pk for vacancy in vacancies]
+
+        # created - auto_now_add, bulk_create ставит текущую дату; даты из файла пишем UPDATE по каждой дате
+        by_created = defaultdict(list)
+        for pk, vacancy, row in zip(ids, vacancies, rows):
+            if "created" in row and row["created"] != vacancy.created:
+                by_created[row["created"]].append(pk)
+        for created, pks in by_created.items():
+            Vacancy.objects.filter(pk__in=pks).update(created=created)
+        return ids
+
+    def _copy_vacancies(self, rows):
+        table = connection.ops.quote_name(Vacancy._meta.db_table)
+        now = timezone.now()
+        defaults = {"status": Vacancy._meta.get_field("status").default, "likes": 0, "created": date.today()}
+        columns = ["id", "user_id", "modified", "search_vector", *IMPORT_FIELDS]
+
+        with connection.cursor() as cursor:
+            # id резервируются заранее, чтобы сразу записать связи с навыками
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [Vacancy._meta.db_table, len(rows)],
+            )
+            ids = [pk for pk, in cursor.fetchall()]
+            copy_rows(cursor, table, columns, (
+                [pk, row["user_id"], now, None,
+                 *(row.get(name, defaults.get(name)) for name in IMPORT_FIELDS)]
+                for pk, row in zip(ids, rows)
+            ))
+        return ids
+
+    def _create_links(self, links):
+        table = connection.ops.quote_name(Vacancy.skills.through._meta.db_table)
+        with connection.cursor() as cursor:
+            if self.use_copy:
+                copy_rows(cursor, table, ["vacancy_id", "skill_id"], links)
+            elif links:
+                # Пары id не нуждаются в объектах моделей, executemany в разы быстрее bulk_create
+                cursor.executemany(f"INSERT INTO {table} (vacancy_id, skill_id) VALUES (%s, %s)", links)
@@ -0,0 +1,303 @@
+"""
+Отложенная запись лайков: PUT /vacancy/like/ только увеличивает счетчики в быстром
+хранилище (кэш или память процесса), а flush_likes() периодически переносит накопленные
+значения в БД пачкой UPDATE. Горячие строки вакансий не блокируются на каждый клик.
+"""
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Now
+from django.utils import timezone
+
+from djangoProject.caches import atomic_cache
+from vacancies.cache import bump_vacancy_versions
+from vacancies.models import Vacancy
+
+logger = logging.getLogger(__name__)
+
+
+def like_buffer_settings():
+    return {
+        "ENABLED": False,
+        "CACHE_ALIAS": None,
+        "FLUSH_INTERVAL": 5,
+        "FLUSH_BATCH_SIZE": 500,
+        **getattr(settings, "LIKE_BUFFER", {}),
+    }
+
+
+class LocalLikeStore:
+    """Счетчики в памяти процесса, сбрасываются фоновым потоком этого же процесса"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+
+    def add(self, ids):
+        with self._lock:
+            for pk in ids:
+                self._pending[pk] += 1
+
+    def pending(self, ids):
+        with self._lock:
+            return {pk: self._pending.get(pk, 0) for pk in ids}
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = dict(self._pending), defaultdict(int)
+        return pending
+
+    def restore(self, deltas):
+        with self._lock:
+            for pk, delta in deltas.items():
+                self._pending[pk] += delta
+
+
+class CacheLikeStore:
+    """
+    Счетчики в общем кэше (Redis/Memcached), видны всем процессам и команде flush_likes.
+    likes:pending:<id> - накопленный прирост, likes:log:<n> - журнал id с лайками,
+    по журналу flush находит вакансии с ненулевым приростом без перебора всех ключей.
+    """
+    SEQ_KEY = "likes:seq"
+    FLUSHED_KEY = "likes:flushed"
+    GAP_KEY = "likes:gap"
+    LOCK_KEY = "likes:flush_lock"
+    LOCK_TIMEOUT = 60
+
+    def __init__(self, alias, chunk_size=500):
+        # Неатомарный incr (файловый кэш, кэш в БД) терял бы лайки параллельных запросов
+        self.cache = atomic_cache(alias, 'LIKE_BUFFER["CACHE_ALIAS"]')
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def pending_key(pk):
+        return f"likes:pending:{pk}"
+
+    @staticmethod
+    def log_key(n):
+        return f"likes:log:{n}"
+
+    def _incr(self, key, delta=1):
+        if not self.cache.add(key, delta, None):
+            try:
+                return self.cache.incr(key, delta)
+            except ValueError:
+                self.cache.add(key, 0, None)
+                return self.cache.incr(key, delta)
+        return delta
+
+    def add(self, ids):
+        for pk in ids:
+            self._incr(self.pending_key(pk))
+            self.cache.set(self.log_key(self._incr(self.SEQ_KEY)), pk, None)
+
+    def pending(self, ids):
+        values = self.cache.get_many([self.pending_key(pk) for pk in ids])
+        return {pk: values.get(self.pending_key(pk), 0) for pk in ids}
+
+    def drain(self):
+        """Разбирает журнал кусками по chunk_size записей, продлевая блокировку после каждого"""
+        if not self.cache.add(self.LOCK_KEY, 1, self.LOCK_TIMEOUT):
+            return {}  # Уже идет flush в другом процессе
+
+        try:
+            deltas = {}
+            flushed = self.cache.get(self.FLUSHED_KEY, 0)
+            seq = self.cache.get(self.SEQ_KEY, 0)
+            while flushed < seq:
+                last = min(seq, flushed + self.chunk_size)
+                done, complete = self._drain_chunk(flushed, last, deltas)
+                self.cache.set(self.FLUSHED_KEY, done, None)
+                self.cache.touch(self.LOCK_KEY, self.LOCK_TIMEOUT)
+                if not complete:
+                    break
+                flushed = done
+            return deltas
+        finally:
+            self.cache.delete(self.LOCK_KEY)
+
+    def _drain_chunk(self, flushed, last, deltas):
+        """Записи журнала flushed+1..last: прирост в deltas, (до какой записи разобрано, без пропуска ли)"""
+        entries = self.cache.get_many([self.log_key(n) for n in range(flushed + 1, last + 1)])
+
+        # Номер уже выдан, но запись журнала еще не сделана: дальше этого места
+        # не сдвигаемся, разве что пропуск остался с прошлого раза (запись потеряна)
+        done, complete = flushed, True
+        for n in range(flushed + 1, last + 1):
+            if self.log_key(n) not in entries and self.cache.get(self.GAP_KEY) != n:
+                self.cache.set(self.GAP_KEY, n, None)
+                complete = False
+                break
+            done = n
+
+        for pk in set(entries.values()):
+            delta = self.cache.get(self.pending_key(pk), 0)
+            if delta:
+                self.cache.decr(self.pending_key(pk), delta)
+                deltas[pk] = deltas.get(pk, 0) + delta
+
+        self.cache.delete_many([self.log_key(n) for n in range(flushed + 1, done + 1)])
+        return done, complete
+
+    def restore(self, deltas):
+        for pk, delta in deltas.items():
+            self._incr(self.pending_key(pk), delta)
+            self.cache.set(self.log_key(self._incr(self.SEQ_KEY)), pk, None)
+
+
+_local_store = LocalLikeStore()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def get_store():
+    options = like_buffer_settings()
+    alias = options["CACHE_ALIAS"]
+    if alias and alias in settings.CACHES:
+        return CacheLikeStore(alias, options["FLUSH_BATCH_SIZE"])
+    return _local_store
+
+
+def is_enabled():
+    return like_buffer_settings()["ENABLED"]
+
+
+def buffer_likes(ids):
+    get_store().add(ids)
+    start_flusher()
+
+
+def pending_likes(ids):
+    """Еще не записанный в БД прирост лайков {id: delta}"""
+    if not is_enabled() or not ids:
+        return {}
+    return get_store().pending(ids)
+
+
+def supports_update_returning(connection):
+    if connection.vendor == "postgresql":
+        return True
+    return connection.vendor == "sqlite" and connection.Database.sqlite_version_info >= (3, 35)
+
+
+def _increment_returning(ids, using):
+    """UPDATE ... RETURNING id, likes: запись и новые значения за один запрос"""
+    connection = connections[using]
+    opts = Vacancy._meta
+    quote = connection.ops.quote_name
+    modified = opts.get_field("modified").get_db_prep_value(timezone.now(), connection)
+    sql = (
+        f"UPDATE {quote(opts.db_table)} SET {quote('likes')} = {quote('likes')} + 1, {quote('modified')} = %s "
+        f"WHERE {quote('id')} IN ({', '.join(['%s'] * len(ids))}) RETURNING {quote('id')}, {quote('likes')}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [modified, *ids])
+        return dict(cursor.fetchall())
+
+
+def like_vacancies(ids, using="default"):
+    """
+    +1 лайк каждой вакансии из ids, возвращает {id: лайков теперь} только для найденных вакансий.
+    Без буфера - один UPDATE ... RETURNING (или UPDATE + SELECT, если БД его не поддерживает),
+    с буфером - один SELECT для проверки id, прирост пишется в буфер.
+    """
+    ids = sorted(set(ids))
+    if not ids:
+        return {}
+
+    if is_enabled():
+        persisted = dict(Vacancy.objects.using(using).filter(pk__in=ids).values_list("id", "likes"))
+        buffer_likes(list(persisted))
+        pending = pending_likes(list(persisted))
+        updated = {pk: value + pending.get(pk, 0) for pk, value in persisted.items()}
+    elif supports_update_returning(connections[using]):
+        updated = _increment_returning(ids, using)
+    else:
+        Vacancy.objects.using(using).filter(pk__in=ids).update(likes=F("likes") + 1, modified=Now())
+        updated = dict(Vacancy.objects.using(using).filter(pk__in=ids).values_list("id", "likes"))
+
+    bump_vacancy_versions(updated)
+    return updated
+
+
+def flush_likes():
+    """Переносит накопленные лайки в БД, один UPDATE на FLUSH_BATCH_SIZE вакансий"""
+    store = get_store()
+    deltas = store.drain()
+    if not deltas:
+        return 0
+
+    batch_size = like_buffer_settings()["FLUSH_BATCH_SIZE"]
+    items = sorted(deltas.items())
+    done = 0
+    try:
+        for start in range(0, len(items), batch_size):
+            batch = dict(items[start:start + batch_size])
+            Vacancy.objects.filter(pk__in=batch).update(
+                likes=F("likes") + Case(
+                    *[When(pk=pk, then=Value(delta)) for pk, delta in batch.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+                modified=Now(),
+            )
+            done = start + len(batch)
+    except Exception:
+        # Не записанные пачки возвращаются в хранилище до следующего flush
+        store.restore(dict(items[done:]))
+        raise
+
+    bump_vacancy_versions(deltas)
+    return len(deltas)
+
+
+class LikeFlusher(threading.Thread):
+    """
+    Фоновый поток процесса: flush_likes() каждые FLUSH_INTERVAL секунд. С общим кэшем
+    потоки всех процессов конкурируют за likes:flush_lock, сбрасывает один из них.
+    """
+
+    def __init__(self, interval):
+        super().__init__(name="like-flusher", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        from django.db import connection
+
+        while not self.stopped.wait(self.interval):
+            try:
+                flush_likes()
+            except Exception:
+                logger.exception("Failed to flush buffered likes")
+            finally:
+                connection.close()
+
+
+def start_flusher():
+    global _flusher
+    interval = like_buffer_settings()["FLUSH_INTERVAL"]
+    if not interval or (_flusher is not None and _flusher.is_alive()):
+        return
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            if _flusher is None:
+                atexit.register(flush_at_exit)
+            _flusher = LikeFlusher(interval)
+            _flusher.start()
+
+
+def flush_at_exit():
+    """Лайки в памяти процесса пропали бы вместе с ним: последний flush при выходе"""
+    if not isinstance(get_store(), LocalLikeStore):
+        return
+    try:
+        flush_likes()
+    except Exception:
+        logger.exception("Failed to flush buffered likes at exit")
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management import BaseCommand
+
+from vacancies.likes import flush_likes, like_buffer_settings
+
+
+class Command(BaseCommand):
+    help = "Write buffered vacancy likes to the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep flushing every --interval seconds")
+        parser.add_argument("--interval", type=float, default=like_buffer_settings()["FLUSH_INTERVAL"])
+
+    def handle(self, *args, **options):
+        while True:
+            updated = flush_likes()
+            if updated or not options["loop"]:
+                self.stdout.write(f"Flushed likes for {updated} vacancies")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,64 @@
+import sys
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from vacancies.importer import VacancyImporter, read_batches, supports_copy
+
+
+class Command(BaseCommand):
+    help = "Import vacancies from an NDJSON file (one JSON object per line, as in /vacancy/export/)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, '-' for stdin")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per transaction")
+        parser.add_argument("--offset", type=int, default=0, help="Byte offset to resume from")
+        parser.add_argument("--skip-invalid", action="store_true", help="Report invalid rows and go on")
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        if options["path"] == "-" and options["offset"]:
+            raise CommandError("--offset is not supported for stdin")
+
+        importer = VacancyImporter(use_copy=supports_copy() and not options["no_copy"])
+        stream = sys.stdin.buffer if options["path"] == "-" else open(options["path"], "rb")
+        offset = options["offset"]
+        imported = skipped = 0
+        started = time.monotonic()
+
+        try:
+            for lines, end in read_batches(stream, options["batch_size"], offset):
+                rows, errors = importer.prepare(lines)
+                for position, error in errors:
+                    if not options["skip_invalid"]:
+                        raise CommandError(
+                            f"Invalid row at offset {position}: {error} "
+                            f"Rows before offset {offset} are imported, resume with --offset {offset}"
+                        )
+                    self.stderr.write(f"Skipped row at offset {position}: {error}")
+                skipped += len(errors)
+
+                try:
+                    importer.write(rows)
+                except Exception as exc:
+                    raise CommandError(f"Batch at offset {offset} failed: {exc}. Resume with --offset {offset}")
+
+                imported += len(rows)
+                offset = end
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{imported} rows, {imported / self.elapsed(started):.0f} rows/s, offset {offset}")
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        elapsed = self.elapsed(started)
+        self.stdout.write(
+            f"Imported {imported} vacancies ({skipped} skipped) in {elapsed:.1f}s, "
+            f"{imported / elapsed:.0f} rows/s, {'COPY' if importer.use_copy else 'bulk_create'}, offset {offset}"
+        )
+
+    @staticmethod
+    def elapsed(started):
+        return max(time.monotonic() - started, 1e-6)
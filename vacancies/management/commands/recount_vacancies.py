@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+from vacancies.counters import recount_vacancies
+
+
+class Command(BaseCommand):
+    help = "Recompute User.vacancy_count and the per-user vacancy statistics"
+
+    def handle(self, *args, **options):
+        stats = recount_vacancies()
+        self.stdout.write(f"users={stats.users} vacancies={stats.vacancies} avg={stats.avg}")
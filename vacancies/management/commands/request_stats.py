@@ -0,0 +1,28 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import BaseCommand, CommandError
+
+from djangoProject.instrumentation import request_stats, reset_request_stats, shared_stats_cache
+
+
+class Command(BaseCommand):
+    help = "Show p50/p95/p99 latency and average query count per route"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sort", choices=["p50", "p95", "p99", "count"], default="p95")
+        parser.add_argument("--reset", action="store_true", help="Clear the collected samples after printing")
+
+    def handle(self, *args, **options):
+        try:
+            cache = shared_stats_cache()
+        except ImproperlyConfigured as error:
+            raise CommandError(f"Request statistics of other processes are not visible: {error}")
+
+        stats = sorted(request_stats(cache).items(), key=lambda item: item[1][options["sort"]], reverse=True)
+        self.stdout.write(f"{'route':<40} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'queries':>8}")
+        for route, row in stats:
+            self.stdout.write(
+                f"{route:<40} {row['count']:>7} {row['p50']:>7.1f}ms {row['p95']:>7.1f}ms "
+                f"{row['p99']:>7.1f}ms {row['max']:>7.1f}ms {row['avg_queries']:>8.1f}"
+            )
+        if options["reset"]:
+            reset_request_stats(cache)
@@ -0,0 +1,26 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import BaseCommand, CommandError
+
+from vacancies.cache import cache_stats, bump_version, shared_vacancy_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the vacancy response cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--invalidate", action="store_true", help="Bump the cache version")
+
+    def handle(self, *args, **options):
+        try:
+            cache = shared_vacancy_cache()
+        except ImproperlyConfigured as error:
+            raise CommandError(f"Vacancy cache of the server processes is not visible: {error}")
+
+        if options["invalidate"]:
+            bump_version()
+
+        stats = cache_stats(cache)
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_rate={stats['hit_rate']:.2%} version={stats['version']}"
+        )
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:56
+
+import django.core.validators
+from django.db import migrations, models
+import vacancies.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0006_skill_is_active'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacancy',
+            name='likes',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='min_experience',
+            field=models.IntegerField(null=True, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='updated_at',
+            field=models.DateField(null=True, validators=[vacancies.models.check_date_not_past]),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:57
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# GIN индекс есть только в PostgreSQL, поэтому он создается здесь, а не в Meta.indexes модели
+INDEX_NAME = "vacancies_vacancy_search_vector_gin"
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON vacancies_vacancy USING gin (search_vector)"
+    )
+    # Тот же словарь, что и в vacancies/search.py, иначе старые векторы не найдутся поиском
+    schema_editor.execute(
+        "UPDATE vacancies_vacancy SET search_vector = to_tsvector(%s::regconfig, COALESCE(text, ''))",
+        [getattr(settings, "VACANCY_SEARCH_CONFIG", "simple")],
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0007_vacancy_likes_vacancy_min_experience_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacancy',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:58
+
+from django.db import migrations
+
+
+def merge_duplicate_skills(apps, schema_editor):
+    """
+    Навыки, отличающиеся только регистром и пробелами, сливаются в навык с меньшим id, пробелы
+    в его имени схлопываются. Так же имена нормализует приложение (vacancies/skills.py), и уникальный
+    индекс на LOWER(name) из 0010 совпадает с тем, как навыки ищутся.
+    """
+    Skill = apps.get_model("vacancies", "Skill")
+    Through = apps.get_model("vacancies", "Vacancy").skills.through
+    db_alias = schema_editor.connection.alias
+
+    keepers = {}
+    for skill in Skill.objects.using(db_alias).order_by("id"):
+        name = " ".join(skill.name.split())
+        keeper_id = keepers.setdefault(name.lower(), skill.id)
+        if keeper_id == skill.id:
+            if name != skill.name:
+                Skill.objects.using(db_alias).filter(pk=skill.id).update(name=name)
+            continue
+
+        links = Through.objects.using(db_alias)
+        linked = links.filter(skill_id=keeper_id).values("vacancy_id")
+        links.filter(skill_id=skill.id, vacancy_id__in=linked).delete()
+        links.filter(skill_id=skill.id).update(skill_id=keeper_id)
+        skill.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0008_vacancy_search_vector'),
+    ]
+
+    # Отдельная миграция: в PostgreSQL нельзя создавать индекс в транзакции с отложенными проверками FK
+    operations = [
+        migrations.RunPython(merge_duplicate_skills, migrations.RunPython.noop),
+    ]
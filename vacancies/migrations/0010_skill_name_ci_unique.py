@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:58
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0009_merge_duplicate_skills'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='skill',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='vacancies_skill_name_ci_unique'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:08
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_vacancy_counters(apps, schema_editor):
+    User = apps.get_model("authentication", "User")
+    Vacancy = apps.get_model("vacancies", "Vacancy")
+    UserVacancyStats = apps.get_model("vacancies", "UserVacancyStats")
+    db_alias = schema_editor.connection.alias
+    users = User.objects.using(db_alias)
+    vacancies = Vacancy.objects.using(db_alias)
+
+    counts = vacancies.filter(user=OuterRef("pk")).order_by() \
+        .values("user").annotate(total=Count("id")).values("total")
+    users.update(vacancy_count=Coalesce(Subquery(counts), Value(0)))
+    # Итоги в строке pk=1, остальные строки (VACANCY_COUNTERS["SHARDS"]) начинаются с нуля
+    shards = getattr(settings, "VACANCY_COUNTERS", {}).get("SHARDS", 8)
+    UserVacancyStats.objects.using(db_alias).bulk_create(
+        [UserVacancyStats(pk=1, users=users.count(), vacancies=vacancies.filter(user__isnull=False).count())]
+        + [UserVacancyStats(pk=shard) for shard in range(2, shards + 1)]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0012_vacancy_modified'),
+        ('authentication', '0003_user_vacancy_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserVacancyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('users', models.IntegerField(default=0)),
+                ('vacancies', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Статистика вакансий',
+                'verbose_name_plural': 'Статистика вакансий',
+            },
+        ),
+        migrations.RunPython(fill_vacancy_counters, migrations.RunPython.noop),
+    ]
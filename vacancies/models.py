@@ -1,8 +1,10 @@
 from datetime import date
 
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Lower
 
 from authentication.models import User
 
@@ -19,6 +21,10 @@ class Skill(models.Model):
     class Meta:
         verbose_name = "Навык"
         verbose_name_plural = "Навыки"
+        # Имя навыка уникально без учета регистра, индекс используется фильтром ?skill=
+        constraints = [
+            models.UniqueConstraint(Lower("name"), name="vacancies_skill_name_ci_unique"),
+        ]
 
     def __str__(self):
         return self.name
@@ -39,18 +45,89 @@ class Vacancy(models.Model):
     likes = models.IntegerField(default=0)
     min_experience = models.IntegerField(null=True, validators=[MinValueValidator(0)])
     updated_at = models.DateField(null=True, validators=[check_date_not_past])
+    # Время последнего изменения записи, используется для ETag и Last-Modified
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+    # Поисковый вектор по text, пишется в save() вместе с text (только PostgreSQL, индекс GIN в миграции 0008)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     # Русифицируем админку Вакансии
     class Meta:
         verbose_name = "Вакансия"
         verbose_name_plural = "Вакансии"
+        # Индекс для курсорной пагинации по (created, id)
+        indexes = [
+            models.Index(fields=["created", "id"], name="vacancy_created_id_idx"),
+        ]
     # Сортировка в алфавитном порядке
     #     ordering = ["text"]
 
     def __str__(self):
         return self.slug
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем владельца из БД, чтобы при смене user поправить счетчики вакансий
+        instance._loaded_user_id = instance.__dict__.get("user_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        from vacancies.counters import adjust_vacancy_counts
+        from vacancies.search import search_vector_value
+
+        using = kwargs.get("using") or router.db_for_write(Vacancy, instance=self)
+        update_fields = kwargs.get("update_fields")
+        search_vector = search_vector_value(self.text, using)
+        if search_vector is not None and (update_fields is None or "text" in update_fields):
+            self.search_vector = search_vector
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_vector"}
+
+        old_user_id = None if self._state.adding else getattr(self, "_loaded_user_id", self.user_id)
+        if old_user_id == self.user_id:
+            super().save(*args, **kwargs)
+        else:
+            # Владелец появился или сменился: запись и счетчики в одной транзакции
+            with transaction.atomic(using=kwargs.get("using")):
+                super().save(*args, **kwargs)
+                adjust_vacancy_counts({old_user_id: -1, self.user_id: 1}, using=self._state.db)
+        self._loaded_user_id = self.user_id
+        if hasattr(self.__dict__.get("search_vector"), "resolve_expression"):
+            # Вместо выражения - отложенное поле, значение из БД загрузится при обращении
+            del self.__dict__["search_vector"]
+
     @property
     def username(self):
         return self.user.username if self.user else None
 
+
+
+class UserVacancyStats(models.Model):
+    """
+    Счетчики пользователей и их вакансий для /vacancy/by_user/: среднее = vacancies / users
+    без подсчета по всей таблице. Значения разложены по нескольким строкам (VACANCY_COUNTERS["SHARDS"]),
+    итог - их сумма, поэтому отдельная строка может быть и отрицательной.
+    Поддерживается в vacancies/counters.py, пересчитывается командой recount_vacancies.
+    """
+    users = models.IntegerField(default=0)
+    vacancies = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Статистика вакансий"
+        verbose_name_plural = "Статистика вакансий"
+
+    @classmethod
+    def current(cls):
+        """Итоги по всем строкам одним запросом"""
+        totals = cls.objects.aggregate(
+            rows=models.Count("id"), users=models.Sum("users"), vacancies=models.Sum("vacancies")
+        )
+        if not totals["rows"]:
+            # Строк нет (например, таблицу очистили) - считаем заново по данным
+            from vacancies.counters import recount_vacancies
+            return recount_vacancies()
+        return cls(users=totals["users"], vacancies=totals["vacancies"])
+
+    @property
+    def avg(self):
+        return self.vacancies / self.users if self.users else None
@@ -0,0 +1,314 @@
+import hashlib
+import json
+from base64 import b64decode, b64encode
+from datetime import date
+from functools import partial
+from urllib import parse
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class VacancyKeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация по (created, id), от новых вакансий к старым.
+    Вместо COUNT(*) и OFFSET страница выбирается условием
+    created <= c AND (created < c OR id < i) по индексу vacancy_created_id_idx,
+    поэтому тысячная страница стоит столько же, сколько первая.
+    eg.: /vacancy/?pagination=cursor, дальше переходим по ссылкам next/previous
+    Порядок всегда (-created, -id), поэтому ordering=rank с курсором - 400.
+    """
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    invalid_ordering_message = "Ordering by rank is not supported with cursor pagination."
+    page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get("ordering") == "rank":
+            raise ValidationError({"ordering": [self.invalid_ordering_message]})
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            reverse = False
+            queryset = queryset.order_by("-created", "-id")
+        else:
+            created, pk, reverse = self.cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created__gte=created) & (Q(created__gt=created) | Q(id__gt=pk))
+                ).order_by("created", "id")
+            else:
+                queryset = queryset.filter(
+                    Q(created__lte=created) & (Q(created__lt=created) | Q(id__lt=pk))
+                ).order_by("-created", "-id")
+
+        # Берем на одну запись больше, чтобы понять, есть ли следующая страница
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(*self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(*self.get_position(self.page[0]), reverse=True)
+
+    @staticmethod
+    def get_position(item):
+        # Объект модели или словарь из values()
+        if isinstance(item, dict):
+            return item["created"], item["id"]
+        return item.created, item.pk
+
+    def encode_cursor(self, created, pk, reverse):
+        querystring = parse.urlencode({"c": created.isoformat(), "i": pk, "r": int(reverse)})
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"), keep_blank_values=True)
+            created = date.fromisoformat(tokens["c"][0])
+            pk = int(tokens["i"][0])
+            reverse = bool(int(tokens["r"][0]))
+        except (TypeError, ValueError, KeyError, IndexError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return created, pk, reverse
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            "name": self.cursor_query_param,
+            "required": False,
+            "in": "query",
+            "description": "The pagination cursor value.",
+            "schema": {"type": "string"},
+        }]
+
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_STRATEGIES = [COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED]
+# Количество известно заранее из поддерживаемого счетчика (known_count)
+COUNT_COUNTER = "counter"
+
+
+def count_settings():
+    return {
+        "STRATEGY": COUNT_EXACT,
+        "CACHE_TTL": 60,
+        "ESTIMATE_THRESHOLD": 10_000,
+        "VIEWS": {},
+        **getattr(settings, "PAGINATION_COUNT", {}),
+    }
+
+
+def get_count_strategy(view_name, strategy=None):
+    """Стратегия подсчета: атрибут view > PAGINATION_COUNT["VIEWS"][имя view] > PAGINATION_COUNT["STRATEGY"]"""
+    options = count_settings()
+    strategy = strategy or options["VIEWS"].get(view_name) or options["STRATEGY"]
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Unknown pagination count strategy: {strategy}")
+    return strategy
+
+
+def count_cache_key(view_name, params):
+    """Ключ кэша зависит от view и фильтров, но не от номера страницы"""
+    filters = sorted(
+        (key, sorted(values)) for key, values in params.lists() if key not in ("page", "cursor")
+    )
+    digest = hashlib.md5(json.dumps([view_name, filters]).encode()).hexdigest()
+    return f"pagination_count:{digest}"
+
+
+def estimate_count(queryset):
+    """Оценка числа строк планировщиком PostgreSQL (EXPLAIN), None на других БД"""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator с настраиваемым подсчетом общего количества:
+    exact - обычный COUNT(*),
+    cached - COUNT(*) кэшируется на CACHE_TTL секунд по ключу cache_key,
+    estimated - оценка планировщика, если она больше ESTIMATE_THRESHOLD, иначе COUNT(*).
+    Если передан known_count, он используется без запросов (стратегия counter).
+    Использованная стратегия записывается в count_strategy_used.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy=COUNT_EXACT, cache_key=None, known_count=None,
+                 **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+        self.cache_key = cache_key
+        self.known_count = known_count
+        self.count_strategy_used = None
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            self.count_strategy_used = COUNT_COUNTER
+            return self.known_count
+
+        options = count_settings()
+
+        if self.count_strategy == COUNT_CACHED and self.cache_key:
+            count = cache.get(self.cache_key)
+            if count is None:
+                count = super().count
+                cache.set(self.cache_key, count, options["CACHE_TTL"])
+            self.count_strategy_used = COUNT_CACHED
+            return count
+
+        if self.count_strategy == COUNT_ESTIMATED and hasattr(self.object_list, "query"):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= options["ESTIMATE_THRESHOLD"]:
+                self.count_strategy_used = COUNT_ESTIMATED
+                return estimate
+
+        self.count_strategy_used = COUNT_EXACT
+        return super().count
+
+    async def acount(self):
+        """count для async views: те же стратегии, запросы через async ORM и async API кэша"""
+        if "count" not in self.__dict__:
+            self.__dict__["count"] = await self._acount()
+        return self.count
+
+    async def _acount(self):
+        if self.known_count is not None:
+            self.count_strategy_used = COUNT_COUNTER
+            return self.known_count
+
+        options = count_settings()
+
+        if self.count_strategy == COUNT_CACHED and self.cache_key:
+            count = await cache.aget(self.cache_key)
+            if count is None:
+                count = await self.object_list.acount()
+                await cache.aset(self.cache_key, count, options["CACHE_TTL"])
+            self.count_strategy_used = COUNT_CACHED
+            return count
+
+        if self.count_strategy == COUNT_ESTIMATED:
+            estimate = await sync_to_async(estimate_count)(self.object_list)
+            if estimate is not None and estimate >= options["ESTIMATE_THRESHOLD"]:
+                self.count_strategy_used = COUNT_ESTIMATED
+                return estimate
+
+        self.count_strategy_used = COUNT_EXACT
+        return await self.object_list.acount()
+
+
+class CountingPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination c CountingPaginator, стратегия берется из атрибута view count_strategy
+    или из настроек PAGINATION_COUNT. В ответ добавляется поле count_strategy.
+    """
+
+    show_count_strategy = True
+
+    def get_paginator_options(self, request, view_name, count_strategy=None):
+        return {
+            "count_strategy": get_count_strategy(view_name, count_strategy),
+            "cache_key": count_cache_key(view_name, request.GET),
+        }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        view_name = view.__class__.__name__ if view is not None else None
+        self.django_paginator_class = partial(
+            CountingPaginator, **self.get_paginator_options(request, view_name, getattr(view, "count_strategy", None))
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view_name, count_strategy=None):
+        """
+        paginate_queryset() для async views (обычный HttpRequest): COUNT и строки страницы
+        читаются через async ORM, ссылки next/previous строятся как у DRF.
+        """
+        self.request = request
+        paginator = CountingPaginator(
+            queryset, self.page_size, **self.get_paginator_options(request, view_name, count_strategy)
+        )
+        await paginator.acount()
+
+        page_number = request.GET.get(self.page_query_param) or 1
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * paginator.per_page
+        rows = [row async for row in queryset[bottom:bottom + paginator.per_page]]
+        self.page = paginator._get_page(rows, number, paginator)
+        return rows
+
+    def get_paginated_data(self, data):
+        paginated = {"count": self.page.paginator.count}
+        if self.show_count_strategy:
+            paginated["count_strategy"] = self.page.paginator.count_strategy_used
+        paginated.update({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+        return paginated
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_strategy"] = {
+            "type": "string",
+            "enum": COUNT_STRATEGIES,
+        }
+        return response_schema
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, Q, Value, FloatField
+from django.db.models.functions import Cast, Length, Lower, Replace
+
+# Конфигурация словаря PostgreSQL, "simple" не привязана к языку текста вакансии
+SEARCH_CONFIG = getattr(settings, "VACANCY_SEARCH_CONFIG", "simple")
+
+
+def is_fulltext_supported(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def search_vector_value(text, using="default"):
+    """
+    Выражение search_vector для save(): вектор считается в том же INSERT/UPDATE, что и text.
+    None на БД без полнотекстового поиска
+    """
+    if is_fulltext_supported(using):
+        return SearchVector(Value(text), config=SEARCH_CONFIG)
+    return None
+
+
+def update_search_vector(queryset):
+    """Пересчитывает search_vector для вакансий из queryset (на других БД ничего не делает)"""
+    if is_fulltext_supported(queryset.db):
+        queryset.update(search_vector=SearchVector("text", config=SEARCH_CONFIG))
+
+
+def search_vacancies(queryset, text):
+    """
+    Фильтрует вакансии по поисковой строке и добавляет аннотацию rank.
+    На PostgreSQL используется индексированный search_vector,
+    на остальных БД - поиск всех слов через icontains, rank = число вхождений слов в текст.
+    """
+    if is_fulltext_supported(queryset.db):
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+
+    terms = text.split()
+    if not terms:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+    terms_q = Q()
+    rank = Value(0.0, output_field=FloatField())
+    for term in terms:
+        terms_q &= Q(text__icontains=term)
+        # (длина текста - длина текста без слова) / длина слова = число вхождений
+        removed = Length(Replace(Lower("text"), Value(term.lower()), Value("")))
+        rank += Cast(Length("text") - removed, FloatField()) / len(term)
+
+    return queryset.filter(terms_q).annotate(rank=rank)
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from vacancies.likes import pending_likes
 from vacancies.models import Vacancy, Skill
+from vacancies.skills import set_vacancy_skills
 
 
 class NotInStatusValidator:
@@ -16,6 +18,29 @@ class NotInStatusValidator:
             raise serializers.ValidationError("Incorrect status.")
 
 
+class SkillNameField(serializers.CharField):
+    """Имя навыка: только строка (CharField превратил бы 1 в "1") не длиннее Skill.name"""
+
+    def __init__(self, **kwargs):
+        super().__init__(max_length=Skill._meta.get_field("name").max_length, **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        return super().to_internal_value(data)
+
+
+# Имена навыков, переданные в create/update: скрытое от SlugRelatedField поле проверяется в validate()
+SKILL_NAMES = serializers.ListField(child=SkillNameField(allow_blank=True))
+
+
+def validate_skill_names(names):
+    try:
+        return SKILL_NAMES.run_validation(names)
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError({"skills": exc.detail})
+
+
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
@@ -44,7 +69,13 @@ class VacancyDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Vacancy
-        fields = '__all__'
+        exclude = ["search_vector", "modified"]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Лайки из буфера, еще не перенесенные в БД
+        data["likes"] += pending_likes([instance.pk]).get(instance.pk, 0)
+        return data
 
 
 class VacancyCreateSerializer(serializers.ModelSerializer):
@@ -63,19 +94,19 @@ class VacancyCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Vacancy
-        fields = '__all__'
+        exclude = ["search_vector", "modified"]
 
     def is_valid(self, raise_exception=False):
         self._skills = self.initial_data.pop("skills", [])# from data user sent we collect by key skills and put it into _skills
         return super().is_valid(raise_exception=raise_exception)
 
+    def validate(self, attrs):
+        self._skills = validate_skill_names(self._skills)
+        return attrs
+
     def create(self, validated_data):
         vacancy = Vacancy.objects.create(**validated_data)
-
-        for skill in self._skills:
-            skill_obj, v = Skill.objects.get_or_create(name=skill)
-            vacancy.skills.add(skill_obj)
-        vacancy.save()
+        set_vacancy_skills(vacancy, self._skills, created=True)
         return vacancy
 
 
@@ -95,19 +126,50 @@ class VacancyUpdateSerializer(serializers.ModelSerializer):
 
     def is_valid(self,raise_exception=False):
         self._skills = self.initial_data.pop(
-            "skills", [])  # from data user sent we collect by key skills and put it into _skills
+            "skills", None)  # from data user sent we collect by key skills and put it into _skills
         return super().is_valid(raise_exception=raise_exception)
 
+    def validate(self, attrs):
+        if self._skills is not None:
+            self._skills = validate_skill_names(self._skills)
+        return attrs
+
     def save(self):
         vacancy = super().save()
 
-        for skill in self._skills:
-            skill_obj, v = Skill.objects.get_or_create(name=skill)
-            vacancy.skills.add(skill_obj)
-        vacancy.save()
+        # Навыки меняются только если они переданы, в БД пишется только разница
+        if self._skills is not None:
+            set_vacancy_skills(vacancy, self._skills)
         return vacancy
 
 
+class VacancyBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Одна вакансия для /vacancy/bulk_create/. Проверки, которым нужна БД
+    (уникальность slug, существование user), выполняются сразу для всего списка во view.
+    """
+    slug = serializers.CharField(max_length=50)
+    status = serializers.ChoiceField(
+        choices=Vacancy.STATUS, default="draft", validators=[NotInStatusValidator(['closed', 'open'])]
+    )
+    user = serializers.IntegerField(required=False, allow_null=True, source="user_id")
+    skills = serializers.ListField(child=SkillNameField(), required=False, default=list)
+
+    class Meta:
+        model = Vacancy
+        fields = ["slug", "text", "status", "min_experience", "updated_at", "user", "skills"]
+
+
+class VacancyLikeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    likes = serializers.IntegerField()
+
+
+class VacancyLikeResponseSerializer(serializers.Serializer):
+    items = VacancyLikeSerializer(many=True)
+    not_found = serializers.ListField(child=serializers.IntegerField())
+
+
 class VacancyDestroySerializer(serializers.ModelSerializer):
     class Meta:
         model = Vacancy
@@ -0,0 +1,68 @@
+from django.db.models.functions import Now
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from authentication.models import User
+from vacancies.cache import bump_version
+from vacancies.counters import adjust_vacancy_counts, adjust_user_count
+from vacancies.models import Vacancy, Skill
+
+
+# Любая запись вакансий и навыков (views, админка, shell) сбрасывает кэш ответов
+@receiver(post_save, sender=Vacancy)
+@receiver(post_delete, sender=Vacancy)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_vacancy_cache(sender, **kwargs):
+    bump_version()
+
+
+# username владельца входит в списки вакансий (и в ETag списка через версию кэша)
+@receiver(post_save, sender=User)
+def invalidate_username_cache(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw and getattr(instance, "_loaded_username", None) != instance.username:
+        bump_version()
+    instance._loaded_username = instance.username
+
+
+# Навыки входят в ответ вакансии, поэтому их изменение обновляет Vacancy.modified (ETag)
+@receiver(m2m_changed, sender=Vacancy.skills.through)
+def invalidate_vacancy_skills_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # skill.vacancy_set.clear(): после очистки связанные вакансии уже не найти
+        Vacancy.objects.filter(skills=instance).update(modified=Now())
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        Vacancy.objects.filter(pk=instance.pk).update(modified=Now())
+    elif pk_set:
+        Vacancy.objects.filter(pk__in=pk_set).update(modified=Now())
+    bump_version()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(pre_delete, sender=Skill)
+def touch_skill_vacancies(sender, instance, created=False, **kwargs):
+    if not created:
+        Vacancy.objects.filter(skills=instance).update(modified=Now())
+
+
+# Счетчики для /vacancy/by_user/. Удаление идет через сигнал, чтобы учесть и queryset.delete(),
+# создание и смена владельца вакансии обрабатываются в Vacancy.save()
+@receiver(post_delete, sender=Vacancy)
+def decrement_vacancy_count(sender, instance, using, **kwargs):
+    adjust_vacancy_counts({instance.user_id: -1}, using=using)
+
+
+@receiver(post_save, sender=User)
+def increment_user_count(sender, instance, created, using, **kwargs):
+    if created:
+        adjust_user_count(1, using=using)
+
+
+@receiver(post_delete, sender=User)
+def decrement_user_count(sender, instance, using, **kwargs):
+    adjust_user_count(-1, using=using)
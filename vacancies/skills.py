@@ -0,0 +1,67 @@
+from django.db.models.functions import Lower
+
+from vacancies.cache import bump_version
+from vacancies.models import Vacancy, Skill
+
+
+def normalize_skill_name(name):
+    """Навыки сравниваются без учета регистра и лишних пробелов: ' Python ' == 'python'"""
+    return " ".join(name.split()).lower()
+
+
+def skills_by_names(names):
+    """Навыки по нормализованным именам, поиск идет по индексу на LOWER(name)"""
+    return Skill.objects.annotate(name_lower=Lower("name")).filter(name_lower__in=names)
+
+
+def resolve_skills(names):
+    """
+    Возвращает {нормализованное имя: Skill} для всех имен: существующие навыки
+    выбираются одним IN запросом, недостающие создаются одним bulk_create.
+    Если параллельный запрос успел создать тот же навык, конфликт по уникальному
+    индексу игнорируется и навык дочитывается вторым запросом.
+    """
+    wanted = {}
+    for name in names:
+        cleaned = " ".join(name.split())
+        if cleaned:
+            wanted.setdefault(cleaned.lower(), cleaned)
+    if not wanted:
+        return {}
+
+    resolved = {skill.name_lower: skill for skill in skills_by_names(wanted)}
+    missing = [name for key, name in wanted.items() if key not in resolved]
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        created = skills_by_names([name.lower() for name in missing])
+        resolved.update({skill.name_lower: skill for skill in created})
+
+    return resolved
+
+
+def set_vacancy_skills(vacancy, names, created=False):
+    """
+    Приводит навыки вакансии к списку names: удаляются лишние связи (один DELETE)
+    и добавляются недостающие (один INSERT). Для только что созданной вакансии
+    (created=True) текущие связи не запрашиваются.
+    """
+    through = Vacancy.skills.through
+    wanted = {skill.pk for skill in resolve_skills(names).values()}
+    current = set() if created else set(
+        through.objects.filter(vacancy_id=vacancy.pk).values_list("skill_id", flat=True)
+    )
+
+    removed = current - wanted
+    added = wanted - current
+    if removed:
+        through.objects.filter(vacancy_id=vacancy.pk, skill_id__in=removed).delete()
+    if added:
+        through.objects.bulk_create(
+            [through(vacancy_id=vacancy.pk, skill_id=skill_id) for skill_id in added],
+            ignore_conflicts=True,
+        )
+
+    if removed or added:
+        # Связи пишутся напрямую в through таблицу, m2m_changed не отправляется
+        getattr(vacancy, "_prefetched_objects_cache", {}).pop("skills", None)
+        bump_version()
@@ -1,16 +1,19 @@
 from django.urls import path
 from rest_framework import routers
 
-from vacancies import views
+from vacancies import views, async_views
+from vacancies.async_views import route
 
 
 urlpatterns = [
-    path('', views.VacancyListView.as_view()),
-    path('<int:pk>/', views.VacancyDetailView.as_view()),
+    path('', route('vacancy_list', views.VacancyListView.as_view(), async_views.vacancy_list)),
+    path('<int:pk>/', route('vacancy_detail', views.VacancyDetailView.as_view(), async_views.vacancy_detail)),
     path('create/', views.VacancyCreateView.as_view()),
+    path('bulk_create/', views.VacancyBulkCreateView.as_view()),
     path('<int:pk>/update/', views.VacancyUpdateView.as_view()),
     path('<int:pk>/delete/', views.VacancyDeleteView.as_view()),
     path('by_user/', views.user_vacancies),
+    path('export/', views.export_vacancies),
     path('like/', views.VacancyLikeView.as_view()),
 
 ]
@@ -1,18 +1,30 @@
-from django.core.paginator import Paginator
-from django.db.models import Count, Avg, Q, F
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
 from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.generics import ListAPIView, RetrieveAPIView, CreateAPIView, UpdateAPIView, DestroyAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 from authentication.models import User
 from djangoProject import settings
-from vacancies.models import Vacancy, Skill
+from djangoProject.renderers import json_response
+from vacancies import likes
+from vacancies.bulk import create_vacancies
+from vacancies.cache import VacancyCacheMixin
+from vacancies.conditional import list_condition, detail_condition
+from vacancies.export import EXPORT_FORMATS, CSVRenderer, NDJSONRenderer, iter_vacancies
+from vacancies.fast_serializers import FastListMixin, FastSkillSerializer, FastVacancyListSerializer
+from vacancies.filters import filter_vacancies
+from vacancies.models import Vacancy, Skill, UserVacancyStats
+from vacancies.pagination import VacancyKeysetPagination, CountingPageNumberPagination, CountingPaginator
 from vacancies.permissions import VacancyCreatePermission
 from vacancies.serializers import VacancyListSerializer, VacancyDetailSerializer, VacancyCreateSerializer, \
-    VacancyUpdateSerializer, VacancyDestroySerializer, SkillSerializer
+    VacancyUpdateSerializer, VacancyDestroySerializer, SkillSerializer, VacancyBulkItemSerializer, \
+    VacancyLikeSerializer, VacancyLikeResponseSerializer
 
 
 def hello(request):
@@ -31,14 +43,22 @@ def hello(request):
 )
 
 
-class SkillsViewSet(ModelViewSet):
+class SkillsViewSet(FastListMixin, ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
+    fast_serializer_class = FastSkillSerializer
 
 
-class VacancyListView(ListAPIView):
-    queryset = Vacancy.objects.all()
+@list_condition
+class VacancyListView(VacancyCacheMixin, FastListMixin, ListAPIView):
+    # username и skills читаются для каждой строки - грузим их пачкой, а не по запросу на вакансию
+    queryset = Vacancy.objects.select_related("user").prefetch_related(
+        Prefetch("skills", queryset=Skill.objects.order_by("id"))
+    )
     serializer_class = VacancyListSerializer
+    fast_serializer_class = FastVacancyListSerializer
+    pagination_class = CountingPageNumberPagination
+    count_strategy = None  # exact / cached / estimated, по умолчанию из PAGINATION_COUNT
 
 
     @extend_schema(
@@ -46,33 +66,19 @@ class VacancyListView(ListAPIView):
         summary="Vacancy list"
     )
     def get(self, request, *args, **kwargs):
-        vacancy_text = request.GET.get('text', None)  # Search request eg.: /vacancy/?text=new
-        if vacancy_text:
-            self.queryset = self.queryset.filter(
-                text__icontains=vacancy_text
-            )
+        # Search request eg.: /vacancy/?text=new&ordering=rank&skill=java&skill=python&skill_mode=all
+        self.queryset = filter_vacancies(self.queryset, request.GET)
 
-        """ 
-        Множественный поиск пример на вакансиях
-        делаем Q класс и заворачиваем все условия для фильтра в класс Q
-        """
-        skills = request.GET.getlist('skill', None)  # Search request eg.: /vacancy/?skill=java&skill=python
-        skills_q = None
-        for skill in skills:
-            if skills_q is None:
-                skills_q = Q(skills__name__icontains=skill)  # специальный Q класс для сбора фильтраций
-            else:
-                skills_q |= Q(
-                    skills__name__icontains=skill)  # otherwise if we already have something we add another 'Q' class
-
-        if skills_q:
-            self.queryset = self.queryset.filter(skills_q)
+        # Курсорная пагинация без COUNT и OFFSET eg.: /vacancy/?pagination=cursor
+        if request.GET.get('pagination') == 'cursor' or 'cursor' in request.GET:
+            self.pagination_class = VacancyKeysetPagination
 
         return super().get(request, *args, **kwargs)
 
 
-class VacancyDetailView(RetrieveAPIView):
-    queryset = Vacancy.objects.all()
+@detail_condition
+class VacancyDetailView(VacancyCacheMixin, RetrieveAPIView):
+    queryset = Vacancy.objects.prefetch_related("skills")
     serializer_class = VacancyDetailSerializer
     permission_classes = [IsAuthenticated]  # Список с доступами
 
@@ -83,6 +89,67 @@ class VacancyCreateView(CreateAPIView):
     permission_classes = [IsAuthenticated, VacancyCreatePermission]
 
 
+class VacancyBulkCreateView(APIView):
+    """
+    Создание списка вакансий одним запросом eg.: POST /vacancy/bulk_create/ [{...}, {...}]
+    Ошибочные элементы возвращаются в errors с их индексом, остальные создаются.
+    """
+    permission_classes = [IsAuthenticated, VacancyCreatePermission]
+    max_items = 1000
+
+    @extend_schema(
+        request=VacancyBulkItemSerializer(many=True),
+        description="Create vacancies in bulk (Создаем вакансии пачкой)",
+        summary="Bulk create vacancies"
+    )
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return Response({"detail": "Expected a list of vacancies."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > self.max_items:
+            return Response(
+                {"detail": f"No more than {self.max_items} vacancies per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        errors = {}
+        valid = {}
+        for index, item in enumerate(request.data):
+            serializer = VacancyBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                errors[index] = serializer.errors
+
+        # Проверки по БД - одним запросом на весь список
+        slugs = {item["slug"] for item in valid.values()}
+        taken_slugs = set(Vacancy.objects.filter(slug__in=slugs).values_list("slug", flat=True))
+        user_ids = {item["user_id"] for item in valid.values() if item.get("user_id") is not None}
+        known_users = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+
+        items = []
+        for index, item in list(valid.items()):
+            if item["slug"] in taken_slugs:
+                errors[index] = {"slug": ["vacancy with this slug already exists."]}
+            elif item.get("user_id") is not None and item["user_id"] not in known_users:
+                errors[index] = {"user": [f"Invalid pk \"{item['user_id']}\" - object does not exist."]}
+            else:
+                taken_slugs.add(item["slug"])
+                items.append((index, item))
+
+        vacancies = create_vacancies([dict(item) for index, item in items])
+
+        return Response(
+            {
+                "created": [
+                    {"index": index, "id": vacancy.pk, "slug": vacancy.slug}
+                    for (index, item), vacancy in zip(items, vacancies)
+                ],
+                "errors": [{"index": index, "errors": errors[index]} for index in sorted(errors)],
+            },
+            status=status.HTTP_201_CREATED if vacancies or not errors else status.HTTP_400_BAD_REQUEST
+        )
+
+
 class VacancyUpdateView(UpdateAPIView):
     queryset = Vacancy.objects.all()
     serializer_class = VacancyUpdateSerializer
@@ -96,10 +163,14 @@ class VacancyDeleteView(DestroyAPIView):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def user_vacancies(request):
-    """method 'annotate' adds 'vacancies' and Counts it"""
-    user_qs = User.objects.annotate(vacancies=Count('vacancy'))
+    """
+    Количество вакансий берется из User.vacancy_count, общее число пользователей и среднее -
+    из UserVacancyStats, поэтому страница читается по индексу без COUNT и GROUP BY
+    """
+    user_qs = User.objects.only("id", "username", "vacancy_count").order_by("id")
+    stats = UserVacancyStats.current()
     # paginating
-    paginator = Paginator(user_qs, settings.TOTAL_ON_PAGE)
+    paginator = CountingPaginator(user_qs, settings.TOTAL_ON_PAGE, known_count=stats.users)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
@@ -108,30 +179,58 @@ def user_vacancies(request):
         users.append({
             "id": user.id,
             "name": user.username,
-            "vacancies": user.vacancies
+            "vacancies": user.vacancy_count
         })
 
     response = {
         "items": users,
         "total": paginator.count,
+        "count_strategy": paginator.count_strategy_used,
         "num_pages": paginator.num_pages,
         # counting average quantity of vacancies from user
-        "avg": user_qs.aggregate(avg=Avg('vacancies'))['avg']
+        "avg": stats.avg
     }
-    return JsonResponse(response)
+    return json_response(response)
+
+
+@api_view(["GET"])
+@renderer_classes([NDJSONRenderer, CSVRenderer])
+@permission_classes([IsAuthenticated])
+def export_vacancies(request):
+    """
+    Выгрузка всех вакансий одним потоком eg.: /vacancy/export/?format=csv&text=python&skill=django
+    Формат - ?format=ndjson (по умолчанию) или csv, либо заголовок Accept. Фильтры те же, что у VacancyListView.
+    """
+    queryset = filter_vacancies(Vacancy.objects.order_by("id"), request.GET)
+    renderer = request.accepted_renderer
+    stream, filename = EXPORT_FORMATS[renderer.format]
+
+    content_type = f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type
+    response = StreamingHttpResponse(stream(iter_vacancies(queryset)), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 # Запросы лайков по id [1, 2, 3, 4, 5, 6]
 class VacancyLikeView(UpdateAPIView):
     queryset = Vacancy.objects.all()
-    serializer_class = VacancyDetailSerializer
+    serializer_class = VacancyLikeSerializer
     http_method_names = ["put"]
 
-    @extend_schema(deprecated=True)  # помечаем как устаревший метод
+    @extend_schema(
+        deprecated=True,  # помечаем как устаревший метод
+        request={"application/json": {"type": "array", "items": {"type": "integer"}}},
+        responses=VacancyLikeResponseSerializer,
+    )
     def put(self, request, *args, **kwargs):
-        Vacancy.objects.filter(pk__in=request.data).update(
-            likes=F('likes') + 1)  # класс F представляет текущий класс записи
+        ids = request.data
+        if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return json_response({"detail": "Expected a list of vacancy ids."}, status=400)
 
-        return JsonResponse(
-            VacancyDetailSerializer(Vacancy.objects.filter(pk__in=request.data), many=True).data, safe=False
-        )
+        # Новые значения возвращает сам UPDATE (или буфер лайков), без повторной выборки вакансий
+        updated = likes.like_vacancies(ids)
+
+        return json_response({
+            "items": [{"id": pk, "likes": value} for pk, value in sorted(updated.items())],
+            "not_found": sorted(set(ids) - set(updated)),
+        })